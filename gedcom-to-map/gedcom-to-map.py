@@ -31,7 +31,17 @@ class ArgParse(argparse.ArgumentParser):
             "-format", type=str, default="HTML", choices=("HTML", "KML"), help="type of output result for map format"
         )
         self.add_argument("-max_missing", type=int, default=0, help="maximum generation missing (0 = no limit)")
+        self.add_argument(
+            "-max_generations", type=int, default=0, help="maximum generations above the main person (0 = no limit)"
+        )
+        self.add_argument("-max_lines", type=int, default=0, help="maximum number of lines to draw (0 = no limit)")
         self.add_argument("-max_line_weight", type=int, default=20, help="Line maximum weight")
+        self.add_argument(
+            "-precision", type=int, default=0, help="decimal places of the coordinates written (0 = unrounded)"
+        )
+        self.add_argument(
+            "-simplify_zoom", type=int, default=0, help="simplify lines for this map zoom level (0 = no simplifying)"
+        )
         self.add_argument("-everyone", action="store_true", help="Plot everyone in your tree")
         self.add_argument(
             "-log", type=str, default="WARNING", choices=("ERROR", "WARNING", "INFO", "DEBUG"), help="logging level"
@@ -128,6 +138,10 @@ if __name__ == "__main__":
         arg_parse.args.cache_only,
         arg_parse.args.everyone,
     )
+    myGeoOptions.set("MaxGenerations", arg_parse.args.max_generations)
+    myGeoOptions.set("MaxLines", arg_parse.args.max_lines)
+    myGeoOptions.set("CoordinatePrecision", arg_parse.args.precision)
+    myGeoOptions.set("SimplifyZoom", arg_parse.args.simplify_zoom)
 
     if myGeoOptions.ResultType:
         Geoheatmap(myGeoOptions)
@@ -200,6 +200,8 @@ class BackgroundActions:
                 pass
         try:
             self.svc_state.people = None
+            self.svc_state.person_index = None
+            self.svc_state.line_cache = None
         except Exception:
             pass
         self.people = None
@@ -12,6 +12,7 @@ from typing import Optional, Dict, Any
 
 from geo_gedcom.person import Person
 from geo_gedcom.geolocated_gedcom import GeolocatedGedcom
+from models.person_index import PersonIndex
 from services.interfaces import IConfig, IState, IProgressTracker
 from const import GLOBAL_GEO_CACHE_FILENAME, FILE_ALT_PLACE_FILENAME_SUFFIX, FILE_GEOCACHE_FILENAME_SUFFIX
 
@@ -72,6 +73,8 @@ class GedcomLoader:
 
         Side Effects:
             - Sets svc_state.people to parsed Person objects
+            - Sets svc_state.person_index to a PersonIndex of those people
+            - Drops svc_state.line_cache (lines of the previously loaded people)
             - Sets svc_state.lookup to GeolocatedGedcom instance
             - Sets svc_config gpsfile to cache file path
             - Sets svc_config Main to first person if not already set
@@ -100,6 +103,8 @@ class GedcomLoader:
 
         if stage == 0 or stage == 1:
             svc_state.people = None  # Clear reference
+            svc_state.person_index = None
+            svc_state.line_cache = None
             svc_state.newload = True
             if hasattr(svc_state, "UpdateBackgroundEvent") and hasattr(svc_state.UpdateBackgroundEvent, "updategrid"):
                 svc_state.UpdateBackgroundEvent.updategrid = True
@@ -155,6 +160,9 @@ class GedcomLoader:
                 svc_state.people = svc_state.lookup.people
                 people = svc_state.people
                 _log.info("Completed geocoding with %d people", len(people) if people else 0)
+                # Read every person's event locations and years once, for the creators and exporters
+                svc_progress.step("Indexing people")
+                svc_state.person_index = PersonIndex(people)
 
             except Exception as e:
                 _log.exception("Error during GEDCOM geocoding: %s", e)
@@ -90,7 +90,13 @@ class LineageTracer:
             _log.error("Trace:Could not find your starting person: %s", main_id)
             return 0
         svc_state.Referenced.add(main_id)
-        lifeline: CreatorTrace = CreatorTrace(people, svc_progress=svc_progress)
+        lifeline: CreatorTrace = CreatorTrace(
+            people,
+            svc_progress=svc_progress,
+            person_index=getattr(svc_state, "person_index", None),
+            max_generations=svc_config.get("MaxGenerations", 0),
+            max_lines=svc_config.get("MaxLines", 0),
+        )
 
         creator: list = lifeline.create(main_id)
 
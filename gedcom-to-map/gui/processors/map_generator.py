@@ -9,9 +9,13 @@ Extracted from visual_map_actions.py for better separation of concerns.
 import logging
 import os
 from pathlib import Path
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, Iterator, List
 
+from models.budget import TraversalBudget
 from models.creator import Creator, LifetimeCreator, Person
+from models.line import Line
+from models.line_cache import LineCache
+from models.line_store import LineStore
 from render.folium.folium_exporter import foliumExporter
 from render.kml1.kml_exporter import KmlExporter
 from render.kml2 import KML_Life_Lines
@@ -41,6 +45,28 @@ class MapGenerator:
         """
         self.panel: Any = panel
 
+    @staticmethod
+    def _line_cache(svc_state: IState) -> Optional[LineCache]:
+        """Return the state's LineCache (made on first use), or None without a person index to key it by."""
+        person_index = getattr(svc_state, "person_index", None)
+        if person_index is None or not len(person_index):
+            return None
+        if getattr(svc_state, "line_cache", None) is None:
+            svc_state.line_cache = LineCache()
+        return svc_state.line_cache
+
+    def _say_truncated(self, *budgets: TraversalBudget) -> None:
+        """Tell the user when MaxGenerations/MaxLines left part of the tree out of the map."""
+        parts = [budget.summary() for budget in budgets if budget.truncated]
+        if not parts:
+            return
+        bg = self.panel.background_process if hasattr(self.panel, "background_process") else None
+        if bg:
+            try:
+                bg.SayInfoMessage(f"Map truncated by MaxGenerations/MaxLines: {'; '.join(parts)}")
+            except Exception:
+                pass
+
     def doHTML(self, svc_config: IConfig, svc_state: IState, svc_progress: IProgressTracker, fullresult: bool) -> bool:
         """Generate interactive HTML map using Folium library.
 
@@ -50,10 +76,12 @@ class MapGenerator:
 
         Process:
         1. Create LifetimeCreator with people data
-        2. Generate lifetime lines starting from main person
-        3. Optionally add all other people
-        4. Export to HTML using foliumExporter
-        5. Optionally open in browser if fullresult=True
+        2. Stream lifetime lines starting from main person (optionally followed
+           by all other people) straight into foliumExporter, without first
+           collecting them in a list. The lines are kept in svc_state.line_cache,
+           so a rerun for the same people, Main and line options (e.g. after a
+           map style change) only re-runs the exporter
+        3. Optionally open in browser if fullresult=True
 
         Args:
             svc_config: Configuration service
@@ -89,15 +117,23 @@ class MapGenerator:
 
         main_id = svc_config.get("Main")
         max_missing = svc_config.get("MaxMissing", 0)
+        max_generations = svc_config.get("MaxGenerations", 0)
+        max_lines = svc_config.get("MaxLines", 0)
+        collapse_pedigree = svc_config.get("CollapsePedigree", False)
         all_entities = svc_config.get("AllEntities", False)
+        person_index = getattr(svc_state, "person_index", None)
 
         svc_progress.step("Creating HTML map - initializing")
         _log.debug("Creating Lifeline (fullresult:%s)", fullresult)
-        lifeline: LifetimeCreator = LifetimeCreator(people, max_missing, svc_progress=svc_progress)
-        svc_progress.step("Generating lifetime lines")
-        _log.debug("Creating People ")
-        creator: list = lifeline.create(main_id)
-
+        lifeline: LifetimeCreator = LifetimeCreator(
+            people,
+            max_missing,
+            svc_progress=svc_progress,
+            collapse_pedigree=collapse_pedigree,
+            person_index=person_index,
+            max_generations=max_generations,
+            max_lines=max_lines,
+        )
         if main_id not in people:
             _log.error("Could not find your starting person: %s", main_id)
             try:
@@ -109,18 +145,38 @@ class MapGenerator:
             return False
 
         svc_state.main_person = people[main_id]
-        if all_entities:
-            svc_progress.step("Creating life line for everyone")
-            lifeline.createothers(creator)
-            _log.info("Total of %i people & events.", len(creator))
-        svc_state.totalpeople = len(creator)
+        svc_progress.step("Generating lifetime lines")
+        _log.debug("Creating People ")
+        line_cache = self._line_cache(svc_state)
+        cache_key = None
+        if line_cache is not None:
+            cache_key = LineCache.key(
+                "LifetimeCreator",
+                main_id,
+                max_missing,
+                all_entities,
+                person_index.fingerprint(),
+                collapse_pedigree,
+                max_generations=max_generations,
+                max_lines=max_lines,
+            )
+        cached: Optional[LineStore] = line_cache.get(cache_key) if line_cache is not None else None
+        if cached is not None:
+            lines: Iterator[Line] = iter(cached)
+        else:
+            # Lines are made as the exporter consumes them; AllEntities people follow the main tree
+            lines = lifeline.iter_create(main_id, others=all_entities)
+            if line_cache is not None:
+                lines = line_cache.record(cache_key, lines)
 
         svc_progress.step("Initializing map renderer")
         try:
-            foliumExporter(svc_config, svc_state, svc_progress).export(people[main_id], creator, saveresult=True)
+            foliumExporter(svc_config, svc_state, svc_progress).export(people[main_id], lines, saveresult=True)
         except Exception:
             _log.exception("doHTML: folium export failed")
             return False
+        self._say_truncated(lifeline.budget)
+        _log.info("Total of %i people & events.", svc_state.totalpeople)
 
         # Verify file was created
         if fullresult:
@@ -144,11 +200,12 @@ class MapGenerator:
 
         Process:
         1. Check which marker types are enabled (birth/death)
-        2. For each enabled marker type:
-           - Create Creator to generate location data
-           - Export to KML layer via KmlExporter
-        3. Finalize KML file
-        4. Open in configured KML viewer
+        2. Create the lines of every enabled marker type in one Creator traversal
+           (Creator.create_multi), or reuse them from svc_state.line_cache when
+           the people, Main and line options are unchanged
+        3. For each enabled marker type, export its lines to a KML layer via KmlExporter
+        4. Finalize KML file
+        5. Open in configured KML viewer
 
         Args:
             svc_config: Configuration service
@@ -194,14 +251,86 @@ class MapGenerator:
 
         main_id = svc_config.get("Main")
         max_missing = svc_config.get("MaxMissing", 0)
+        max_generations = svc_config.get("MaxGenerations", 0)
+        max_lines = svc_config.get("MaxLines", 0)
+        collapse_pedigree = svc_config.get("CollapsePedigree", False)
         all_entities = svc_config.get("AllEntities", False)
+        workers = svc_config.get("ParallelWorkers", 0)
+        person_index = getattr(svc_state, "person_index", None)
 
         total_people = len(people)
         if all_entities and total_people > 10000:
-            _log.warning(f"AllEntities enabled with {total_people:,} people - this will be VERY slow!")
+            _log.warning(f"AllEntities enabled with {total_people:,} people - the KML output will be very large")
             bg = self.panel.background_process if hasattr(self.panel, "background_process") else None
             if bg:
-                bg.SayInfoMessage(f"Warning: AllEntities mode with {total_people:,} people may take hours!")
+                bg.SayInfoMessage(f"Warning: AllEntities mode with {total_people:,} people makes a large KML file")
+
+        # Birth and death lines come from a single traversal of the ancestor tree, and are
+        # packed into LineStores as they are made rather than kept as Line objects
+        gpstypes = [key for key, _, _ in placeTypes]
+        svc_progress.step(f"Creating {' & '.join(gpstypes)} data", reset_counter=True)
+        _log.info(f"Creating {', '.join(gpstypes)} lifeline data")
+        lifeline: Creator = Creator(
+            people,
+            max_missing,
+            gpstype=gpstypes[0],
+            svc_progress=svc_progress,
+            collapse_pedigree=collapse_pedigree,
+            person_index=person_index,
+            max_generations=max_generations,
+            max_lines=max_lines,
+        )
+        line_cache = self._line_cache(svc_state)
+        cache_key = None
+        if line_cache is not None:
+            cache_key = LineCache.key(
+                "Creator",
+                main_id,
+                max_missing,
+                all_entities,
+                person_index.fingerprint(),
+                collapse_pedigree,
+                gpstypes,
+                max_generations=max_generations,
+                max_lines=max_lines,
+            )
+        cached: Optional[Dict[str, LineStore]] = line_cache.get(cache_key) if line_cache is not None else None
+        if cached is not None:
+            lines_by_type: Dict[str, LineStore] = cached
+        else:
+            lines_by_type = lifeline.create_multi(main_id, gpstypes, factory=LineStore)
+            if svc_progress.should_stop():
+                _log.info("KML generation cancelled by user")
+                return
+            others_budgets: List[TraversalBudget] = []
+
+            if all_entities:
+                svc_progress.step(f"Adding remaining people to {' & '.join(gpstypes)}", reset_counter=True)
+                _log.info(f"Adding all entities - processing {total_people:,} total people")
+                if len(gpstypes) > 1 and workers in (0, 1):
+                    lifeline.createothers_multi(lines_by_type)
+                else:
+                    for key in gpstypes:
+                        others: Creator = Creator(
+                            people,
+                            max_missing,
+                            gpstype=key,
+                            svc_progress=svc_progress,
+                            collapse_pedigree=collapse_pedigree,
+                            person_index=person_index,
+                            max_generations=max_generations,
+                            max_lines=max_lines,
+                        )
+                        others.createothers(lines_by_type[key], workers=workers)
+                        others_budgets.append(others.budget)
+                total_lines = sum(len(lines) for lines in lines_by_type.values())
+                _log.info(f"Total of {total_lines:,} lines after adding all entities.")
+                if svc_progress.should_stop():
+                    _log.info("KML generation cancelled by user")
+                    return
+            if line_cache is not None:
+                line_cache.put(cache_key, lines_by_type)
+            self._say_truncated(lifeline.budget, *others_budgets)
 
         for idx, (key, nametag, placeType) in enumerate(placeTypes):
             # Check for cancellation
@@ -209,23 +338,8 @@ class MapGenerator:
                 _log.info("KML generation cancelled by user")
                 return
 
-            svc_progress.step(f"Creating {placeType} data", reset_counter=True)
-            _log.info(f"Creating {placeType} lifeline data ({idx+1}/{len(placeTypes)})")
-
-            lifeline: Creator = Creator(people, max_missing, gpstype=key, svc_progress=svc_progress)
-            creator: list = lifeline.create(main_id)
-
-            _log.info(f"Created {len(creator)} ancestor lines for {placeType}")
-
-            if all_entities:
-                svc_progress.step(
-                    f"Adding remaining {total_people - len(creator):,} people to {placeType}", reset_counter=True
-                )
-                _log.info(
-                    f"Adding all entities - processing {total_people:,} total people (this will take a long time)"
-                )
-                lifeline.createothers(creator)
-                _log.info(f"Total of {len(creator):,} people after adding all entities.")
+            creator: LineStore = lines_by_type[key]
+            _log.info(f"Created {len(creator)} lines for {placeType} ({idx+1}/{len(placeTypes)})")
 
             if main_id not in people:
                 _log.error("Could not find your starting person: %s", main_id)
@@ -310,7 +424,13 @@ class MapGenerator:
 
         try:
             kml_life_lines: KML_Life_Lines = KML_Life_Lines(
-                gedcom=svc_state.lookup, kml_file=resultFile, connect_parents=True, save=True, svc_progress=svc_progress
+                gedcom=svc_state.lookup,
+                kml_file=resultFile,
+                connect_parents=True,
+                save=True,
+                svc_progress=svc_progress,
+                person_index=getattr(svc_state, "person_index", None),
+                coordinate_precision=svc_config.get("CoordinatePrecision") or 0,
             )
         except Exception:
             _log.exception("doKML2: KML_Life_Lines creation/export failed")
@@ -125,4 +125,12 @@ class ReportGenerator:
 
         # Generate all selected summary reports
         # Pass actions (parent VisualMapActions) for LoadFile capability
-        generate_summary_reports(config, my_gedcom, base_file_name, output_folder, bg, file_loader=self.actions)
+        generate_summary_reports(
+            config,
+            my_gedcom,
+            base_file_name,
+            output_folder,
+            bg,
+            file_loader=self.actions,
+            person_index=getattr(svc_state, "person_index", None),
+        )
@@ -7,14 +7,21 @@ Core classes:
     - Color: RGBA color representation with hex conversion
     - Rainbow: Color gradient generator for visual distinction
     - Line: Geographic line segment with person, locations, and timeline
+    - LineStore, LineView: Compact columnar storage for many Lines, read back as views
+    - LineCache: LRU cache of creator output keyed by Main, options and a people fingerprint
+    - FamilyGraph: Father, mother, children and partner links as integer row arrays
+    - PersonIndex: NumPy columns of each person's event coordinates, years and family links
     - Creator, CreatorTrace, LifetimeCreator: Genealogical visualization generators
       with per-line loop detection supporting pedigree collapse
+    - PedigreeDAG, PedigreeNode: Shared ancestor subtrees built once per traversal
 
 Loop Detection:
     All creator classes use per-line loop detection (via visited set parameter) instead
     of global tracking. This allows the same person to appear in different branches of
     the tree (pedigree collapse), while still preventing infinite loops in individual
-    ancestral lines.
+    ancestral lines. Each ancestor's subtree is built once and shared by every path
+    that reaches it; Creator/LifetimeCreator accept collapse_pedigree=True to emit
+    each person once rather than once per path.
 
 Re-exported from geo_gedcom:
     - Person: Individual genealogical record
@@ -30,9 +37,15 @@ Usage:
     ...     print(f"{line.name}: {line.color.to_hexa()}")
 """
 
+from .budget import TraversalBudget
 from .color import Color
 from .creator import Creator, CreatorTrace, LifetimeCreator
+from .family_graph import FamilyGraph
 from .line import Line
+from .line_cache import LineCache
+from .line_store import LineStore, LineView
+from .pedigree import PedigreeDAG, PedigreeNode
+from .person_index import PersonIndex
 from .rainbow import Rainbow, Tint
 
 # Re-export from geo_gedcom for convenience
@@ -49,8 +62,16 @@ __all__ = [
     "Creator",
     "CreatorTrace",
     "LifetimeCreator",
+    "PedigreeDAG",
+    "PedigreeNode",
+    "FamilyGraph",
+    "TraversalBudget",
     # Geographic representation
     "Line",
+    "LineCache",
+    "LineStore",
+    "LineView",
+    "PersonIndex",
     # Re-exported from geo_gedcom
     "Person",
     "LifeEvent",
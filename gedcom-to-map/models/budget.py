@@ -0,0 +1,124 @@
+"""
+Traversal budgets for the line creators: MaxGenerations and MaxLines.
+
+A first look at a huge tree should come back quickly rather than wait for
+every path to every ancestor.  Two options cap the work up front:
+
+- ``MaxGenerations``: ancestors more than this many generations above the
+  person a walk starts from are not visited (the generation of a line is the
+  length of its F/M path),
+- ``MaxLines``: at most this many lines are made.
+
+MaxLines is applied breadth-fairly.  Before walking, the creator counts how
+many lines each generation of its ancestor DAG would add (``plan()``), and the
+generation limit is lowered to the deepest generation whose lines all fit, so
+every father and mother branch is drawn to the same depth instead of the
+depth-first walk using up the budget on the first branches.  The count is exact
+when every path is drawn and an upper bound with CollapsePedigree.  The line
+count is also enforced as a hard cap (``take()``), which is what limits the
+AllEntities pass.
+
+What was left out is counted and reported once the run ends (``report()``).
+Both options default to 0, meaning no limit.
+"""
+
+__all__ = ["TraversalBudget"]
+
+import logging
+from typing import List, Optional
+
+_log = logging.getLogger(__name__.lower())
+
+
+class TraversalBudget:
+    """MaxGenerations/MaxLines limits of one creator, and what they cut in the current run.
+
+    Attributes:
+        max_generations: Configured generation limit (0 = none).
+        max_lines: Configured line limit (0 = none).
+        generation_limit: Generation limit in force for this run (None = none); MaxLines may lower it.
+        lines: Lines made so far this run.
+        cut_branches: Parent branches not followed because of the generation limit.
+        dropped_people: People the AllEntities pass left out once the line limit was reached.
+    """
+
+    def __init__(self, max_generations: int = 0, max_lines: int = 0) -> None:
+        self.max_generations: int = max(0, max_generations or 0)
+        self.max_lines: int = max(0, max_lines or 0)
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new run."""
+        self.generation_limit: Optional[int] = self.max_generations or None
+        self.lines: int = 0
+        self.cut_branches: int = 0
+        self.dropped_people: int = 0
+        self.lines_full: bool = False
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.max_generations or self.max_lines)
+
+    @property
+    def truncated(self) -> bool:
+        return bool(self.cut_branches or self.dropped_people or self.lines_full)
+
+    def plan(self, counts: List[int]) -> None:
+        """Lower generation_limit so the lines of every allowed generation fit in max_lines.
+
+        counts[g] is the number of lines generation g would add. Generation 0 (the
+        starting person) is always allowed.
+        """
+        if not self.max_lines:
+            return
+        total = 0
+        for generation, count in enumerate(counts):
+            total += count
+            if total > self.max_lines:
+                limit = max(generation - 1, 0)
+                if self.generation_limit is None or limit < self.generation_limit:
+                    _log.info(
+                        f"MaxLines {self.max_lines:,}: drawing generations 0-{limit} "
+                        f"({total - count:,} lines), generation {generation} would add {count:,} more"
+                    )
+                    self.generation_limit = limit
+                return
+
+    def follows(self, path: str) -> bool:
+        """Whether the parents of the person at path are within the generation limit (counts a cut if not)."""
+        if self.generation_limit is None or len(path) < self.generation_limit:
+            return True
+        self.cut_branches += 1
+        return False
+
+    def room(self) -> Optional[int]:
+        """Lines still allowed this run (None = no limit)."""
+        if not self.max_lines:
+            return None
+        return max(self.max_lines - self.lines, 0)
+
+    def take(self) -> bool:
+        """Count one more line; False (and the line is not to be made) once max_lines is reached."""
+        if self.max_lines and self.lines >= self.max_lines:
+            self.lines_full = True
+            return False
+        self.lines += 1
+        return True
+
+    def summary(self) -> str:
+        """Describe what the budget left out in this run."""
+        parts = []
+        if self.cut_branches:
+            parts.append(
+                f"{self.cut_branches:,} ancestor branches beyond generation {self.generation_limit} not followed"
+            )
+        if self.lines_full:
+            parts.append(f"stopped at MaxLines {self.max_lines:,}")
+        if self.dropped_people:
+            parts.append(f"{self.dropped_people:,} more people not added")
+        return "; ".join(parts)
+
+    def report(self, creator: str) -> None:
+        """Log what was truncated, if anything."""
+        if self.truncated:
+            _log.warning(f"{creator}: traversal budget reached - {self.summary()}")
@@ -1,12 +1,18 @@
 __all__ = ["Creator", "CreatorTrace", "LifetimeCreator", "DELTA", "SPACE"]
 
 import logging
-from typing import Dict, Optional
+from functools import partial
+from typing import Dict, Iterator, List, Optional
 
 from geo_gedcom.person import Person
 from geo_gedcom.life_event import LifeEvent
 from .line import Line
 from geo_gedcom.life_event import LatLon
+from .budget import TraversalBudget
+from .parallel import PARALLEL_MIN_PEOPLE, pool_map, resolve_workers
+from .family_graph import NO_ROW
+from .pedigree import PedigreeDAG, PedigreeNode, build_subtree, node_key
+from .person_index import PersonIndex
 from .rainbow import Rainbow
 from services.interfaces import IProgressTracker
 
@@ -16,14 +22,99 @@ _log = logging.getLogger(__name__.lower())
 SPACE = 2.5  # These values drive how colors are selected
 DELTA = 1.5  # These values drive how colors are selected
 
+# LifetimeCreator traversal stack entry kinds
+_LINK, _EDGE, _EMIT = range(3)
+
+
+def _log_pedigree_collapse(
+    people: Dict[str, Person], path_count: Dict[str, int], total_lines: int, cache: Optional[tuple] = None
+) -> None:
+    """Log how many lines were produced for how many unique people, and the worst collapse offenders.
+
+    cache, when given, is the (hits, misses) of a per-person cache used while creating the lines.
+    """
+    unique_people = len(path_count)
+    multiple_paths = {pid: count for pid, count in path_count.items() if count > 1}
+
+    _log.info(f"Pedigree collapse analysis: {total_lines:,} lines created for {unique_people:,} unique people")
+    if cache is not None:
+        hits, misses = cache
+        _log.info(f"Life line cache: {hits:,} hits, {misses:,} misses ({100*hits/max(hits + misses, 1):.1f}% reused)")
+    if multiple_paths:
+        top_collapse = sorted(multiple_paths.items(), key=lambda x: x[1], reverse=True)[:10]
+        _log.info(f"Top 10 people with most paths: {[(people[pid].name, count) for pid, count in top_collapse]}")
+        _log.info(
+            f"Total people reached via multiple paths: {len(multiple_paths):,} ({100*len(multiple_paths)/unique_people:.1f}%)"
+        )
+
+
+def _iter_others(
+    people: Dict[str, Person],
+    present: set,
+    size: int,
+    lines_for,
+    svc_progress: Optional[IProgressTracker],
+    budget: Optional[TraversalBudget] = None,
+) -> Iterator[Line]:
+    """Yield lines_for(xref_id, size, present) for every person not yet in present.
+
+    present is the set of xref_ids already drawn and size the number of Lines so far.
+    Both grow with every person's Lines, so each person is checked in constant time
+    instead of rescanning the Lines already produced. present is updated in place.
+    Once budget has no room for more Lines, the remaining people are counted as dropped.
+    """
+    total_people = len(people)
+    processed = 0
+    added = 0
+
+    _log.info(f"createothers: Processing {total_people:,} people (current list has {size:,} entries)")
+    if svc_progress:
+        svc_progress.target = total_people
+        svc_progress.counter = 0
+
+    for person in people:
+        processed += 1
+
+        # Progress logging every 1000 people
+        if processed % 1000 == 0:
+            percent = 100 * processed // total_people
+            _log.info(
+                f"createothers: Processed {processed:,}/{total_people:,} people "
+                f"({percent}%), added {added:,} so far"
+            )
+            if svc_progress:
+                svc_progress.counter = processed
+                svc_progress.state = f"Adding other people: {processed:,}/{total_people:,}"
+
+        if person not in present:
+            if budget is not None and budget.room() == 0:
+                budget.dropped_people += 1
+                continue
+            _log.debug("Others: + %s (%s) (%d)", people[person].name, person, size)
+            lines = lines_for(person, size, present)
+            if lines and budget is not None:
+                lines = [line for line in lines if budget.take()]
+            if lines:
+                present.update(line.person.xref_id for line in lines)
+                size += len(lines)
+                added += len(lines)
+                yield from lines
+
+    if svc_progress:
+        svc_progress.counter = processed
+    _log.info(
+        f"createothers: Completed. Processed {processed:,} people, added {added:,} new entries. Total list size: {size:,}"
+    )
+
 
 class Creator:
     """
     Creator
     Class for traversing a family tree of Person objects and producing Line objects
     that represent genealogical connections (using person events that have GPS/latlon
-    information). Traversal proceeds recursively along parents (father and mother)
-    and records each visited person to protect against infinite loops. The class
+    information). Traversal proceeds along parents (father and mother) using an
+    explicit stack, so tree depth is not limited by Python's recursion limit, and
+    tracks the people on the current path to protect against infinite loops. The class
     also supports emitting "other" people not reachable from a chosen root by
     extending a provided list in-place.
     Parameters
@@ -38,6 +129,13 @@ class Creator:
     gpstype : str, optional
         Name of the Person attribute to use as the event containing geographic
         information (e.g. "birth", "home", "residence"). Defaults to "birth".
+    collapse_pedigree : bool, optional
+        If True, an ancestor reached through several paths is emitted once (on the
+        first path) instead of once per path. Defaults to False.
+    max_generations, max_lines : int, optional
+        Traversal budget (see models.budget): ancestors more than max_generations
+        above the start are not visited, and at most max_lines Lines are made, cut
+        breadth-fairly by generation. 0 (default) means no limit.
     Attributes
     ----------
     people : Dict[str, Person]
@@ -98,13 +196,18 @@ class Creator:
           - list[Line]: list of generated Line objects for the traversal.
         Raises
           - IndexError: when main_id is not present in self.people.
+    iter_create(main_id, others=False, workers=0)
+        Same Lines as create(main_id), yielded one at a time as they are made so
+        an exporter can consume them without the whole list being held. With
+        others=True the Lines createothers() would add follow.
     createothers(listof)
         Inspect all Person objects in self.people and append Line objects for any
         persons whose xref_id is not already represented in the provided list.
         The method expects listof to be a list-like collection of objects that
         expose a .person attribute with an .xref_id (the code commonly uses
-        previously created Line objects). For each missing person it calls line()
-        and extends listof in-place with any produced Lines.
+        previously created Line objects). For each missing person it traces their
+        ancestors, leaving out those already in listof, and extends listof in-place
+        with any produced Lines.
         Parameters:
           - listof (list): a mutable list (typically of Line objects) to which new
             Lines will be appended. This argument is mutated in-place.
@@ -113,9 +216,11 @@ class Creator:
           - Logs debug information for each "other" person added.
     Behavioral Notes
     ----------------
-    - Loop detection: During a single traversal invocation, self.alltheseids
-      stores visited xref_ids; when a person is revisited a loop is logged and
-      traversal for that branch stops returning an empty list.
+    - Shared subtrees: Each ancestor's subtree is built once per run as a
+      PedigreeNode (see models.pedigree) and re-walked for every path reaching it,
+      so the tree is not re-explored per path. build_dag() exposes the graph.
+    - Loop detection: While a subtree is built, the people on the path being built
+      are tracked; when a person is revisited a loop is logged and that branch is cut.
     - Missing GPS events: When a person lacks the configured gpstype, the traversal
       will either stop (respecting max_missing) or attempt to skip the person and
       continue toward the parents by invoking link() with an incremented miss
@@ -142,6 +247,10 @@ class Creator:
         max_missing: int = 0,
         gpstype: str = "birth",
         svc_progress: Optional[IProgressTracker] = None,
+        collapse_pedigree: bool = False,
+        person_index: Optional[PersonIndex] = None,
+        max_generations: int = 0,
+        max_lines: int = 0,
     ) -> None:
         """Initialize LineCreator for geographic ancestry visualization.
 
@@ -150,56 +259,32 @@ class Creator:
             max_missing: Maximum consecutive missing GPS events before stopping traversal.
             gpstype: Event type to use for GPS coordinates (default: "birth").
             svc_progress: Optional progress tracker for GUI updates.
+            collapse_pedigree: If True, emit each person once instead of once per path.
+            person_index: PersonIndex of people to read events and years from (None = read the events).
+            max_generations: Generations above the start to visit at most (0 = no limit).
+            max_lines: Lines to make at most, cut breadth-fairly by generation (0 = no limit).
         """
         self.people: Dict[str, Person] = people
+        self.person_index: PersonIndex = person_index if person_index is not None else PersonIndex()
         self.rainbow: Rainbow = Rainbow()
         self.max_missing: int = max_missing
         self.gpstype: str = gpstype
         self.svc_progress: Optional[IProgressTracker] = svc_progress
+        self.collapse_pedigree: bool = collapse_pedigree
+        self.budget: TraversalBudget = TraversalBudget(max_generations, max_lines)
         # Instrumentation for pedigree collapse analysis
         self.person_path_count: Dict[str, int] = {}  # Track how many paths reach each person
-        self._line_call_count: int = 0  # Track recursive line() calls for progress reporting
-
-    def line(self, latlon: LatLon, current: Person, branch, prof, miss, path="", visited=None) -> list[Line]:
-        # Track visited IDs in this specific line to detect sequential loops only
-        if visited is None:
-            visited = set()
-
-        if current.xref_id in visited:
-            _log.warning(
-                "Loop detected in ancestry trace: {:2} - {} {} - Path: {}".format(
-                    prof, self.people[current.xref_id].name, current.xref_id, path
-                )
-            )
-            return []
-
-        # Add to visited set for this line
-        visited = visited | {current.xref_id}
-
-        # Track person appearances for pedigree collapse analysis
-        self.person_path_count[current.xref_id] = self.person_path_count.get(current.xref_id, 0) + 1
-
-        # Update progress every 100 recursive calls
-        self._line_call_count += 1
-        if self.svc_progress and self._line_call_count % 100 == 0:
-            self.svc_progress.state = f"Creating ancestry lines: {self._line_call_count:,} paths processed"
-
-        event = current.get_event(self.gpstype) if current else []
-        event_latlon = event.getattr("latlon") if event else None
-        event_year_num = event.getattr("when_year_num") if event else None
-
-        if not event:
-            return (
-                []
-                if self.max_missing != 0 and miss >= self.max_missing
-                else self.link(event_latlon, current, branch, prof, miss + 1, path, visited)
-            )
-        color = (branch + DELTA / 2) / (SPACE ** (prof % 256))
-        _log.debug(
-            "{:8} {:8} {:2} {:.10f} {} {:20}".format(
-                path, branch, prof, color, self.rainbow.get(color).to_hexa(), current.name
-            )
-        )
+        self._line_call_count: int = 0  # Track line visits for progress reporting
+        # Shared ancestor subtrees for the current run, keyed by (xref_id, missing counter)
+        self._nodes: Dict[tuple, PedigreeNode] = {}
+        # Node keys already walked when collapse_pedigree is on (None = walk every path)
+        self._expanded: Optional[set] = set() if collapse_pedigree else None
+        self._multi_nodes: Dict[tuple, PedigreeNode] = {}  # create_multi's shared subtrees
+        self.stopped: bool = False  # The multi traversal was cut short by svc_progress.should_stop()
+        self.dag: Optional[PedigreeDAG] = None
+
+    def _payload(self, current: Person) -> tuple:
+        """Collect the path-independent parts of a person's Line: (midpoints, birth year, death year)."""
         midpoints = None
         residence_events = current.get_events("residence") if current else []
         if residence_events:
@@ -213,27 +298,117 @@ class Creator:
                     midpoints.append(LifeEvent(home.place, home_year_num, home_latlon, home.what))
                     wyear = wyear if wyear else home.date.year_num
 
-        birth_event = current.get_event("birth") if current else None
-        birth_year_num = birth_event.getattr("when_year_num") if birth_event else None
+        birth_year_num = self.person_index.year(current, "birth")
+        death_year_num = self.person_index.year(current, "death")
+        return midpoints, birth_year_num, death_year_num
 
-        death_event = current.get_event("death") if current else None
-        death_year_num = death_event.getattr("when_year_num") if death_event else None
+    def _open(self, current: Person, miss: int) -> tuple:
+        """Decide how build_subtree handles current reached with miss consecutive missing events."""
+        event = self.person_index.event(current, self.gpstype)
+        if not event and self.max_missing != 0 and miss >= self.max_missing:
+            return None, None
 
-        line = Line(
-            f"{path:8}\t{current.name}",
+        key = node_key(current.xref_id, miss, bool(event), self.max_missing)
+        node = self._nodes.get(key)
+        if node is not None:
+            return node, None
+
+        node = PedigreeNode(
+            key,
+            current,
+            bool(event),
+            event.getattr("latlon") if event else None,
+            self._payload(current) if event else None,
+        )
+        return node, 0 if event else miss + 1
+
+    def _memoize(self, node: PedigreeNode) -> None:
+        self._nodes[node.key] = node
+
+    def _build(self, current: Person, miss: int, building=()) -> Optional[PedigreeNode]:
+        """Return the shared node for current's ancestor subtree, building it on first use.
+
+        building holds xref_ids already on the caller's path; meeting one of them
+        again is an ancestry loop and that branch is cut.
+        """
+        return build_subtree(
+            self.people, current, miss, self._open, self._memoize, building, graph=self.person_index.graph
+        )
+
+    def _node_line(self, node: PedigreeNode, latlon: LatLon, branch, prof, path) -> Line:
+        return self._person_line(node.person, node.payload, latlon, node.latlon, branch, prof, path)
+
+    def _person_line(
+        self, person: Person, payload: tuple, latlon: LatLon, to_latlon: LatLon, branch, prof, path, line_color=None
+    ) -> Line:
+        color = (branch + DELTA / 2) / (SPACE ** (prof % 256))
+        if line_color is None:
+            line_color = self.rainbow.get(color)
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "{:8} {:8} {:2} {:.10f} {} {:20}".format(path, branch, prof, color, line_color.to_hexa(), person.name)
+            )
+        midpoints, birth_year_num, death_year_num = payload
+        return Line(
+            f"{path:8}\t{person.name}",
             latlon,
-            event_latlon,
-            self.rainbow.get(color),
+            to_latlon,
+            line_color,
             path,
             branch,
             prof,
-            person=current,
+            person=person,
             whenFrom=birth_year_num,
             whenTo=death_year_num,
             midpoints=midpoints,
         )
 
-        return self.link(event_latlon, current, branch, prof, 0, path, visited) + [line]
+    def _colored_lines(self, rows: list) -> list[Line]:
+        """The Lines of _person_line argument rows, colored with a single Rainbow.get_many() call."""
+        colors = self.rainbow.get_many([(row[4] + DELTA / 2) / (SPACE ** (row[5] % 256)) for row in rows])
+        return [self._person_line(*row, line_color=color) for row, color in zip(rows, colors)]
+
+    def _walk(self, node: PedigreeNode, latlon: LatLon, branch, prof, path, skip=None) -> Iterator[Line]:
+        """Yield the Lines for node's subtree: parents first, then the node's own Line.
+
+        Subtrees of people whose xref_id is in skip (already drawn) are left out.
+        """
+        # Each entry is (node, latlon, branch, prof, path, emit); emit entries yield the
+        # node's own Line once both parents' subtrees (pushed above it) are done.
+        stack = [(node, latlon, branch, prof, path, False)]
+        while stack:
+            node, latlon, branch, prof, path, emit = stack.pop()
+            if emit:
+                yield self._node_line(node, latlon, branch, prof, path)
+                continue
+
+            if self._expanded is not None:
+                if node.key in self._expanded:
+                    continue
+                self._expanded.add(node.key)
+            if skip is not None and node.xref_id in skip:
+                continue
+
+            # Update progress every 100 visits
+            self._line_call_count += 1
+            if self.svc_progress and self._line_call_count % 100 == 0:
+                self.svc_progress.state = f"Creating ancestry lines: {self._line_call_count:,} paths processed"
+
+            if node.has_event:
+                stack.append((node, latlon, branch, prof, path, True))
+            if (node.father is None and node.mother is None) or not self.budget.follows(path):
+                continue
+            if node.mother is not None:
+                stack.append((node.mother, node.latlon, branch * SPACE + DELTA, prof + 1, path + "M", False))
+            if node.father is not None:
+                stack.append((node.father, node.latlon, branch * SPACE, prof + 1, f"{path}F", False))
+
+    def line(self, latlon: LatLon, current: Person, branch, prof, miss, path="", visited=None) -> list[Line]:
+        # visited seeds the loop detection with ids already on the caller's path
+        node = self._build(current, miss, visited or ())
+        if node is None:
+            return []
+        return list(self._walk(node, latlon, branch, prof, path))
 
     def link(self, latlon: LatLon, current: Person, branch=0, prof=0, miss=0, path="", visited=None) -> list[Line]:
         if visited is None:
@@ -248,78 +423,399 @@ class Creator:
             else []
         )
 
-    def create(self, main_id: str):
+    def build_dag(self, main_id: str) -> PedigreeDAG:
+        """Build the shared-subtree DAG of main_id's ancestors without producing any Lines.
+
+        Raises:
+            IndexError: when main_id is not present in self.people.
+        """
         if main_id not in self.people.keys():
             _log.error("Could not find your starting person: %s", main_id)
             raise IndexError(f"Missing starting person {main_id}")
 
-        # Reset instrumentation for this traversal
+        # Reset the shared subtrees and instrumentation for this traversal
+        self._nodes = {}
+        self._expanded = set() if self.collapse_pedigree else None
         self.person_path_count = {}
         self._line_call_count = 0
+        self.budget.reset()
 
-        current = self.people[main_id]
-        event = current.get_event(self.gpstype) if current else None
+        root = self._build(self.people[main_id], 0)
+        self.dag = PedigreeDAG(root, self._nodes)
+        return self.dag
+
+    def create(self, main_id: str):
+        return list(self.iter_create(main_id))
+
+    def iter_create(self, main_id: str, others: bool = False, workers: int = 0) -> Iterator[Line]:
+        """Yield the Lines of create(main_id) one at a time, in the same order.
+
+        The ancestor DAG is built up front (so a missing main_id raises IndexError
+        here), but Lines are only made as they are consumed. With others=True the
+        Lines createothers() would then add follow, so the whole AllEntities result
+        can be streamed to an exporter without holding it in a list.
+
+        Raises:
+            IndexError: when main_id is not present in self.people.
+        """
+        dag = self.build_dag(main_id)
+        self._plan_budget(dag, lambda node: int(node.has_event))
+        return self._iter_create(dag, self.people[main_id], others, workers)
+
+    def _plan_budget(self, dag: PedigreeDAG, weight) -> None:
+        """Fit the generation limit to max_lines, given how many Lines weight(node) says each visit makes."""
+        if self.budget.max_lines:
+            self.budget.plan(dag.generation_counts(weight, self.budget.generation_limit, self.budget.max_lines))
+
+    def _iter_create(self, dag: PedigreeDAG, current: Person, others: bool, workers: int) -> Iterator[Line]:
+        event = self.person_index.event(current, self.gpstype)
         event_latlon = event.getattr("latlon") if event else LatLon(None, None)
-        # Only call line() - it handles current person and recursively processes parents via link()
-        result = self.line(event_latlon, current, 0, 0, 0, "")
+        present = set()
+        count = 0
+        if dag.root is not None:
+            for line in self._walk(dag.root, event_latlon, 0, 0, ""):
+                if not self.budget.take():
+                    break
+                present.add(line.person.xref_id)
+                count += 1
+                yield line
 
         # Log pedigree collapse statistics
-        unique_people = len(self.person_path_count)
-        total_lines = len(result)
-        multiple_paths = {pid: count for pid, count in self.person_path_count.items() if count > 1}
-
-        _log.info(f"Pedigree collapse analysis: {total_lines:,} lines created for {unique_people:,} unique people")
-        if multiple_paths:
-            top_collapse = sorted(multiple_paths.items(), key=lambda x: x[1], reverse=True)[:10]
-            _log.info(
-                f"Top 10 people with most paths: {[(self.people[pid].name, count) for pid, count in top_collapse]}"
-            )
-            _log.info(
-                f"Total people reached via multiple paths: {len(multiple_paths):,} ({100*len(multiple_paths)/unique_people:.1f}%)"
-            )
+        self.person_path_count = dag.path_counts()
+        _log_pedigree_collapse(self.people, self.person_path_count, count)
+        if self.collapse_pedigree:
+            _log.info(f"Pedigree collapsed: {len(dag):,} shared subtrees, each person drawn once")
 
-        return result
+        if others:
+            yield from self._others(present, count, workers)
+        self.budget.report("Creator")
 
-    def createothers(self, listof):
+    def createothers(self, listof, workers: int = 0):
         """Add Line objects for all people not already in listof.
 
-        WARNING: This method iterates through ALL people in the dataset, which can be
-        extremely slow for large datasets (10,000+ people). Consider disabling
-        AllEntities option for large files.
+        Runs in time linear in the number of people plus the Lines added: membership
+        is tracked incrementally rather than recomputed from listof for every person,
+        and ancestors already in listof are not drawn again for each new person.
 
         Args:
             listof: List of Line objects to extend with additional people
+            workers: Worker processes to spread the work over (0 = serial, -1 = one per CPU).
+                The result is identical to the serial one.
+        """
+        present = {creates.person.xref_id for creates in listof}
+        self.budget.lines = len(listof)
+        listof.extend(self._others(present, len(listof), workers))
+        self.budget.report("Creator")
+
+    def _others(self, present: set, size: int, workers: int = 0) -> Iterator[Line]:
+        """Yield createothers' Lines for everyone not in present, after size Lines already made."""
+        roots = [person for person in self.people if person not in present]
+        if resolve_workers(workers) > 1 and len(roots) >= PARALLEL_MIN_PEOPLE and not self.collapse_pedigree:
+            kwargs = {
+                "max_missing": self.max_missing,
+                "gpstype": self.gpstype,
+                "max_generations": self.budget.generation_limit or 0,
+            }
+            planned = pool_map(self, kwargs, "_others_records", roots, workers, set(present))
+
+            def lines_for(person, size, present):
+                root, records = next(planned)
+                while root != person:
+                    root, records = next(planned)
+                # The serial walk leaves out the whole subtree of anyone already drawn
+                drawn = tuple(path for xref_id, _, path in records if xref_id in present)
+                return [self._record_line(record, size) for record in records if not record[2].startswith(drawn)]
+
+        else:
+
+            def lines_for(person, size, present):
+                current = self.people[person]
+                event = self.person_index.event(current, self.gpstype)
+                event_latlon = event.getattr("latlon") if event else LatLon(None, None)
+                node = self._build(current, 0)
+                if node is None:
+                    return []
+                # Ancestors already drawn were drawn along with their own ancestors
+                return list(self._walk(node, event_latlon, size / 10, 5, "", skip=present))
+
+        return _iter_others(self.people, present, size, lines_for, self.svc_progress, self.budget)
+
+    def _others_records(self, roots: List[str], present: set) -> list:
+        """Plan createothers' Lines for roots without building them (process-pool side).
+
+        Returns (root, records) for every root. Each record is (xref_id, from_xref_id, path)
+        for one Line of the serial walk; from_xref_id is whose event the Line starts at
+        (None for no location). The subtrees of people in present are left out; the
+        parent also drops the subtrees of those it has drawn since.
+
+        Without a generation limit everyone drawn brings their ancestors along, so people
+        planned for earlier roots of the chunk are skipped as well, as the serial pass
+        would. With one, someone drawn near the limit leaves ancestors undrawn that a later
+        root may still reach, and the parent may drop planned people, so only present is.
+        """
+        present = set(present)
+        shared = not self.budget.generation_limit
+        planned = []
+        for root in roots:
+            records = []
+            node = self._build(self.people[root], 0) if root not in present else None
+            if node is not None:
+                stack = [(node, root, "", False)]
+                while stack:
+                    node, from_xref, path, emit = stack.pop()
+                    if emit:
+                        records.append((node.xref_id, from_xref, path))
+                        continue
+                    if node.xref_id in present:
+                        continue
+                    if node.has_event:
+                        stack.append((node, from_xref, path, True))
+                    if not self.budget.follows(path):
+                        continue
+                    parent_from = node.xref_id if node.has_event else None
+                    if node.mother is not None:
+                        stack.append((node.mother, parent_from, path + "M", False))
+                    if node.father is not None:
+                        stack.append((node.father, parent_from, f"{path}F", False))
+            if shared:
+                present.update(record[0] for record in records)
+            planned.append((root, records))
+        return planned
+
+    def _record_line(self, record: tuple, size: int) -> Line:
+        """Build the Line for an _others_records record, as the serial walk would have."""
+        xref_id, from_xref, path = record
+        # Replay the walk's branch arithmetic step by step so the floats match exactly
+        branch = size / 10
+        for step in path:
+            branch = branch * SPACE + DELTA if step == "M" else branch * SPACE
+        person = self.people[xref_id]
+        event = self.person_index.event(person, self.gpstype)
+        latlon = None
+        if from_xref is not None:
+            from_event = self.person_index.event(self.people[from_xref], self.gpstype)
+            latlon = from_event.getattr("latlon") if from_event else None
+        return self._person_line(
+            person, self._payload(person), latlon, event.getattr("latlon"), branch, 5 + len(path), path
+        )
+
+    # Several event types in one traversal (e.g. the KML birth and death layers)
+    def _open_multi(self, current: Person, misses: tuple, gpstypes: tuple) -> tuple:
+        """create_multi's counterpart of _open; misses holds one counter per gpstype (None = cut)."""
+        events = [self.person_index.event(current, gpstype) for gpstype in gpstypes]
+        alive = [
+            miss is not None and (bool(event) or self.max_missing == 0 or miss < self.max_missing)
+            for miss, event in zip(misses, events)
+        ]
+        if not any(alive):
+            return None, None
+
+        key = (
+            current.xref_id,
+            tuple(
+                node_key(current.xref_id, miss, bool(event), self.max_missing)[1] if live else None
+                for miss, event, live in zip(misses, events, alive)
+            ),
+        )
+        node = self._multi_nodes.get(key)
+        if node is not None:
+            return node, None
+
+        has_event = tuple(bool(event) and live for event, live in zip(events, alive))
+        node = PedigreeNode(
+            key,
+            current,
+            has_event,
+            tuple(event.getattr("latlon") if has else None for event, has in zip(events, has_event)),
+            self._payload(current) if any(has_event) else None,
+        )
+        parent_misses = tuple(
+            (0 if event else miss + 1) if live else None for miss, event, live in zip(misses, events, alive)
+        )
+        return node, parent_misses
+
+    def _build_multi(self, current: Person, misses: tuple, gpstypes: tuple) -> Optional[PedigreeNode]:
+        def memoize(node: PedigreeNode) -> None:
+            self._multi_nodes[node.key] = node
+
+        def open_node(person: Person, misses: tuple) -> tuple:
+            return self._open_multi(person, misses, gpstypes)
+
+        return build_subtree(self.people, current, misses, open_node, memoize, graph=self.person_index.graph)
+
+    def _walk_multi(
+        self, node: PedigreeNode, latlons: tuple, branches: tuple, prof, path, outs: list, skips=None
+    ) -> None:
+        """_walk for every gpstype at once; latlons, branches, outs and skips hold one entry per gpstype.
+
+        Each out gets the _person_line arguments of its gpstype's Lines (for _colored_lines),
+        in exactly the order its own _walk would produce them.
+        The budget's line limit applies to each out on its own. When svc_progress asks
+        to stop, the walk returns early and sets self.stopped.
+        """
+        room = self.budget.max_lines or None
+        stack = [(node, latlons, branches, prof, path, tuple(miss is not None for miss in node.key[1]), False)]
+        while stack:
+            node, latlons, branches, prof, path, alive, emit = stack.pop()
+            xref_id = node.xref_id
+            if emit:
+                for out, latlon, branch, to_latlon, live, has in zip(
+                    outs, latlons, branches, node.latlon, alive, node.has_event
+                ):
+                    if live and has:
+                        if room is not None and len(out) >= room:
+                            self.budget.lines_full = True
+                            continue
+                        out.append((node.person, node.payload, latlon, to_latlon, branch, prof, path))
+                continue
+
+            misses = node.key[1]
+            alive = tuple(
+                live and misses[g] is not None and not (skips is not None and xref_id in skips[g])
+                for g, live in enumerate(alive)
+            )
+            if self._expanded is not None:
+                alive = tuple(live and (g, xref_id, misses[g]) not in self._expanded for g, live in enumerate(alive))
+                self._expanded.update((g, xref_id, misses[g]) for g, live in enumerate(alive) if live)
+            if not any(alive):
+                continue
+
+            # Update progress every 100 visits
+            self._line_call_count += 1
+            if self.svc_progress and self._line_call_count % 100 == 0:
+                self.svc_progress.state = f"Creating ancestry lines: {self._line_call_count:,} paths processed"
+                if self.svc_progress.should_stop():
+                    self.stopped = True
+                    return
+
+            if any(live and has for live, has in zip(alive, node.has_event)):
+                stack.append((node, latlons, branches, prof, path, alive, True))
+            if (node.father is None and node.mother is None) or not self.budget.follows(path):
+                continue
+            if node.mother is not None:
+                mother_branches = tuple(branch * SPACE + DELTA for branch in branches)
+                stack.append((node.mother, node.latlon, mother_branches, prof + 1, path + "M", alive, False))
+            if node.father is not None:
+                father_branches = tuple(branch * SPACE for branch in branches)
+                stack.append((node.father, node.latlon, father_branches, prof + 1, f"{path}F", alive, False))
+
+    def _start_latlons(self, current: Person, gpstypes: tuple) -> tuple:
+        events = [self.person_index.event(current, gpstype) for gpstype in gpstypes]
+        return tuple(event.getattr("latlon") if event else LatLon(None, None) for event in events)
+
+    def create_multi(self, main_id: str, gpstypes, factory=list) -> Dict[str, list[Line]]:
+        """Create the lines of several gpstypes (e.g. "birth" and "death") in one traversal.
+
+        Equivalent to running create() once per gpstype, but the ancestor tree is built
+        and walked once, and each person's events are read once.
+
+        Args:
+            main_id: xref_id of the starting person.
+            gpstypes: Event types to create lines for.
+            factory: Makes the container for each gpstype's Lines (e.g. LineStore to
+                pack them as they are made); it must support append, extend, len and iteration.
+
+        Returns:
+            Dict mapping each gpstype to its container of Lines.
+
+        Raises:
+            IndexError: when main_id is not present in self.people.
+        """
+        gpstypes = tuple(gpstypes)
+        if main_id not in self.people.keys():
+            _log.error("Could not find your starting person: %s", main_id)
+            raise IndexError(f"Missing starting person {main_id}")
+
+        # Reset the shared subtrees and instrumentation for this traversal
+        self._multi_nodes = {}
+        self._expanded = set() if self.collapse_pedigree else None
+        self._line_call_count = 0
+        self.stopped = False
+        self.budget.reset()
+
+        current = self.people[main_id]
+        rows = [[] for _ in gpstypes]
+        root = self._build_multi(current, tuple(0 for _ in gpstypes), gpstypes)
+        if root is not None:
+            self._plan_budget(PedigreeDAG(root, self._multi_nodes), lambda node: int(any(node.has_event)))
+            self._walk_multi(root, self._start_latlons(current, gpstypes), tuple(0 for _ in gpstypes), 0, "", rows)
+        outs = [factory() for _ in gpstypes]
+        for out, found in zip(outs, rows):
+            out.extend(self._colored_lines(found))
+
+        self.dag = PedigreeDAG(root, self._multi_nodes)
+        self.person_path_count = self.dag.path_counts()
+        _log_pedigree_collapse(self.people, self.person_path_count, sum(len(out) for out in outs))
+        self.budget.report("Creator")
+        return dict(zip(gpstypes, outs))
+
+    def createothers_multi(self, lines: Dict[str, list]) -> None:
+        """createothers() for every list returned by create_multi, in one pass over the people.
+
+        Each list is extended exactly as createothers() would extend it on its own, and
+        stops growing once it holds the budget's max_lines. When svc_progress asks to
+        stop, the pass ends early and sets self.stopped.
         """
+        max_lines = self.budget.max_lines
+        gpstypes = tuple(lines)
+        outs = [lines[gpstype] for gpstype in gpstypes]
+        presents = [{creates.person.xref_id for creates in out} for out in outs]
+        # The Lines are made and colored together once the pass is done
+        rows = [[] for _ in gpstypes]
+        sizes = [len(out) for out in outs]
         total_people = len(self.people)
         processed = 0
         added = 0
+        _log.info(f"createothers: Processing {total_people:,} people for {', '.join(gpstypes)}")
+        if self.svc_progress:
+            self.svc_progress.target = total_people
+            self.svc_progress.counter = 0
 
-        _log.info(f"createothers: Processing {total_people:,} people (current list has {len(listof):,} entries)")
-
+        self.stopped = False
         for person in self.people:
             processed += 1
-
-            # Progress logging every 1000 people
             if processed % 1000 == 0:
-                percent = 100 * processed // total_people
-                _log.info(
-                    f"createothers: Processed {processed:,}/{total_people:,} people "
-                    f"({percent}%), added {added:,} so far"
-                )
-
-            c = [creates.person.xref_id for creates in listof]
-            if person not in c:
-                _log.debug("Others: + %s (%s) (%d)", self.people[person].name, person, len(listof))
-                event = self.people[person].get_event(self.gpstype) if self.people[person] else None
-                event_latlon = event.getattr("latlon") if event else LatLon(None, None)
-                line = self.line(event_latlon, self.people[person], len(listof) / 10, 5, 0, path="")
-                if line:
-                    listof.extend(line)
-                    added += len(line)
-
-        _log.info(
-            f"createothers: Completed. Processed {processed:,} people, added {added:,} new entries. Total list size: {len(listof):,}"
-        )
+                _log.info(f"createothers: Processed {processed:,}/{total_people:,} people, added {added:,} so far")
+                if self.svc_progress:
+                    self.svc_progress.counter = processed
+                    self.svc_progress.state = f"Adding other people: {processed:,}/{total_people:,}"
+                    self.stopped = self.stopped or self.svc_progress.should_stop()
+            if self.stopped:
+                _log.info(f"createothers: Stopped after {processed - 1:,}/{total_people:,} people")
+                break
+
+            misses = tuple(
+                None if person in present or (max_lines and size >= max_lines) else 0
+                for size, present in zip(sizes, presents)
+            )
+            if all(miss is None for miss in misses):
+                if any(person not in present for present in presents):
+                    self.budget.dropped_people += 1
+                continue
+            current = self.people[person]
+            node = self._build_multi(current, misses, gpstypes)
+            if node is None:
+                continue
+            found = [[] for _ in gpstypes]
+            branches = tuple(size / 10 for size in sizes)
+            # Ancestors already in a list were drawn along with their own ancestors
+            self._walk_multi(node, self._start_latlons(current, gpstypes), branches, 5, "", found, skips=presents)
+            for g, (out_rows, present, new) in enumerate(zip(rows, presents, found)):
+                if max_lines and sizes[g] + len(new) > max_lines:
+                    new = new[: max_lines - sizes[g]]
+                    self.budget.lines_full = True
+                out_rows.extend(new)
+                present.update(row[0].xref_id for row in new)
+                sizes[g] += len(new)
+                added += len(new)
+
+        for out, found in zip(outs, rows):
+            out.extend(self._colored_lines(found))
+
+        if self.svc_progress:
+            self.svc_progress.counter = processed
+        _log.info(f"createothers: Completed. Processed {processed:,} people, added {added:,} new entries.")
+        self.budget.report("Creator")
 
 
 class CreatorTrace:
@@ -346,7 +842,8 @@ class CreatorTrace:
     Methods
     -------
     line(current, branch, prof, path="")
-        Build a Line representing `current` and recursively attach Lines for `current`'s parents.
+        Build a Line representing `current` and attach Lines for `current`'s parents (traced
+        iteratively with an explicit stack).
         - Parameters:
             current (Person): the Person to build the Line for.
             branch: branch identifier passed through to Line (used by consumer code).
@@ -375,6 +872,9 @@ class CreatorTrace:
             Concatenation of father branch Lines (if father exists) and mother branch Lines (if mother exists).
         - Notes:
             * For each parent present, calls line(parent_person, branch_value, prof+1, updated_path).
+    iter_create(main_id, others=False)
+        Same Lines as create(main_id) (followed by createothers' Lines when others=True),
+        yielded one at a time.
     create(main_id)
         Start a trace from the person identified by main_id.
         - Parameters:
@@ -390,8 +890,8 @@ class CreatorTrace:
             listof (list): a mutable sequence expected to contain Line-like objects (the implementation
             expects elements with a `.person.xref_id` attribute).
         - Behavior and side-effects:
-            * Iterates over keys of self.people and builds a list `c` of existing xref_ids from `listof`
-              using `creates.person.xref_id`.
+            * Iterates over keys of self.people, tracking the xref_ids already in `listof`
+              (via `creates.person.xref_id`) in a set that grows as Lines are added.
             * For any person id not present in `c`, logs a debug message and extends `listof` with the
               result of self.line(...) for that person. This mutates the supplied list in place.
         - Notes and caveats:
@@ -415,7 +915,13 @@ class CreatorTrace:
     """
 
     def __init__(
-        self, people: Dict[str, Person], max_missing: int = 0, svc_progress: Optional[IProgressTracker] = None
+        self,
+        people: Dict[str, Person],
+        max_missing: int = 0,
+        svc_progress: Optional[IProgressTracker] = None,
+        person_index: Optional[PersonIndex] = None,
+        max_generations: int = 0,
+        max_lines: int = 0,
     ) -> None:
         """Initialize TraceCreator for genealogical trace visualization.
 
@@ -423,15 +929,20 @@ class CreatorTrace:
             people: Dictionary mapping person IDs to Person objects.
             max_missing: Maximum consecutive missing events before stopping traversal.
             svc_progress: Optional progress tracker for GUI status updates.
+            person_index: PersonIndex of people to read years from (None = read the events).
+            max_generations: Generations above the start to trace at most (0 = no limit).
+            max_lines: Lines to make at most, cut breadth-fairly by generation (0 = no limit).
         """
         self.people: Dict[str, Person] = people
+        self.person_index: PersonIndex = person_index if person_index is not None else PersonIndex()
         self.rainbow: Rainbow = Rainbow()
         self.max_missing: int = max_missing
+        self.budget: TraversalBudget = TraversalBudget(max_generations, max_lines)
         # Cache for birth/death years to avoid repeated event lookups
         self._year_cache: Dict[str, tuple] = {}
         self.svc_progress = svc_progress
         self._line_call_count: int = 0
-        self.visited: set = set()  # Track visited IDs for loop detection
+        self.visited: set = set()  # Track visited people (graph rows, else xref_ids) for loop detection
 
     def _get_birth_death_years(self, person: Person) -> tuple:
         """Get cached birth and death years for a person.
@@ -441,24 +952,16 @@ class CreatorTrace:
         """
         person_id = person.xref_id
         if person_id not in self._year_cache:
-            birth_event = person.get_event("birth")
-            birth_year = birth_event.date.year_num if birth_event and birth_event.date else None
-            death_event = person.get_event("death")
-            death_year = death_event.date.year_num if death_event and death_event.date else None
+            birth_year = self.person_index.year(person, "birth")
+            death_year = self.person_index.year(person, "death")
             self._year_cache[person_id] = (birth_year, death_year)
         return self._year_cache[person_id]
 
     def line(self, current: Person, branch, prof, path="",  result=None) -> list[Line]:
-        # Track progress for GUI updates
-        self._line_call_count += 1
-        if self.svc_progress and self._line_call_count % 100 == 0:
-            self.svc_progress.state = f"Tracing ancestry lines: {self._line_call_count:,} paths processed"
-
-        # Track visited IDs in this specific line to detect sequential loops only
         if result is None:
             result = []
 
-        if current.xref_id in self.visited:
+        if self._key(current) in self.visited:
             _log.warning(
                 "Loop detected in ancestry trace: {:2} - {} {} - Path: {}".format(
                     prof, self.people[current.xref_id].name, current.xref_id, path
@@ -466,31 +969,7 @@ class CreatorTrace:
             )
             return result
 
-        # Add to visited set for this line
-        self.visited = self.visited | {current.xref_id}
-
-        _log.debug("{:8} {:8} {:2} {:20}".format(path, branch, prof, current.name))
-
-        # Use cached birth/death years
-        birth_year_num, death_year_num = self._get_birth_death_years(current)
-
-        # Process ancestors first (depth-first traversal)
-        self.link(current, branch, prof, path, result)
-
-        # Then add current person's line (optimize string formatting)
-        line = Line(
-            f"{path:8}\t{current.name}",
-            None,
-            None,
-            None,
-            path,
-            branch,
-            prof,
-            person=current,
-            whenFrom=birth_year_num,
-            whenTo=death_year_num,
-        )
-        result.append(line)
+        result.extend(self._trace([(current, branch, prof, path, False)]))
         return result
 
     def link(self, current: Person, branch=0, prof=0, path="",  result=None):
@@ -498,65 +977,164 @@ class CreatorTrace:
         if result is None:
             result = []
 
-        # Process father (optimize path concatenation)
-        if current.father and current.father not in self.visited:
-            father_path = path + "F"
-            self.line(self.people[current.father], 0, prof + 1, father_path, result)
+        result.extend(self._trace(self._parent_entries(current, self._key(current), prof, path)))
+        return result
 
-        # Process mother
-        if current.mother and current.mother not in self.visited:
-            mother_path = path + "M"
-            self.line(self.people[current.mother], 0, prof + 1, mother_path,  result)
+    def _key(self, person: Person):
+        """Loop-detection key of person: their FamilyGraph row, or their xref_id if they have none."""
+        row = self.person_index.graph.row_of(person)
+        return row if row is not None else person.xref_id
+
+    def _parents(self, current: Person, key) -> tuple:
+        """(father, mother) of current as graph rows (int key) or xref_ids, None where unknown."""
+        if isinstance(key, int):
+            father, mother = self.person_index.graph.parents(key)
+            return (father if father != NO_ROW else None), (mother if mother != NO_ROW else None)
+        return current.father or None, current.mother or None
+
+    def _parent_entries(self, current: Person, key, prof, path) -> list:
+        # Mother first: entries are popped from the end, so the father's branch is traced first
+        father, mother = self._parents(current, key)
+        if (father is None and mother is None) or not self.budget.follows(path):
+            return []
+        entries = []
+        if mother is not None:
+            entries.append((mother, 0, prof + 1, path + "M", None))
+        if father is not None:
+            entries.append((father, 0, prof + 1, path + "F", None))
+        return entries
+
+    def _trace(self, stack: list) -> Iterator[Line]:
+        """Trace every entry on stack depth-first, yielding each person's Line after their ancestors'.
+
+        Entries are (person, branch, prof, path, emit). emit is None for a parent key (graph
+        row or xref_id) that is skipped if already visited by the time it is reached, False
+        for a person to expand and True for a person whose ancestors are done and whose Line is due.
+        """
+        graph = self.person_index.graph
+        while stack:
+            current, branch, prof, path, emit = stack.pop()
+            if emit is None:
+                if current in self.visited:
+                    continue
+                key = current
+                current = graph.person(key) if isinstance(key, int) else self.people[key]
+            elif emit:
+                # Use cached birth/death years
+                birth_year_num, death_year_num = self._get_birth_death_years(current)
+                yield Line(
+                    f"{path:8}\t{current.name}",
+                    None,
+                    None,
+                    None,
+                    path,
+                    branch,
+                    prof,
+                    person=current,
+                    whenFrom=birth_year_num,
+                    whenTo=death_year_num,
+                )
+                continue
+            else:
+                key = self._key(current)
 
-        return result
+            # Track progress for GUI updates
+            self._line_call_count += 1
+            if self.svc_progress and self._line_call_count % 100 == 0:
+                self.svc_progress.state = f"Tracing ancestry lines: {self._line_call_count:,} paths processed"
+
+            self.visited.add(key)
+            _log.debug("{:8} {:8} {:2} {:20}".format(path, branch, prof, current.name))
+
+            # Process ancestors first (depth-first traversal), then the current person's line
+            stack.append((current, branch, prof, path, True))
+            stack.extend(self._parent_entries(current, key, prof, path))
 
     def create(self, main_id: str):
+        return list(self.iter_create(main_id))
+
+    def iter_create(self, main_id: str, others: bool = False) -> Iterator[Line]:
+        """Yield the Lines of create(main_id) one at a time, in the same order.
+
+        With others=True the Lines createothers() would then add follow.
+
+        Raises:
+            IndexError: when main_id is not present in self.people (raised here, not on iteration).
+        """
         self._line_call_count = 0  # Reset counter for each traversal
         if main_id not in self.people.keys():
             _log.error("Could not find your starting person: %s", main_id)
             raise IndexError(f"Missing starting person {main_id}")
 
-        current = self.people[main_id]
-        return self.link(current)
+        self.budget.reset()
+        if self.budget.max_lines:
+            self.budget.plan(self._generation_counts(self.people[main_id]))
+        return self._iter_create(self.people[main_id], others)
+
+    def _generation_counts(self, current: Person) -> List[int]:
+        """New people (one Line each) per generation above current, found breadth-first.
+
+        The trace visits each person once, on the first path reaching them, so this is
+        an estimate of what each generation adds. Counting stops once max_lines is exceeded.
+        """
+        graph = self.person_index.graph
+        counts = [0]  # The starting person has no Line of their own
+        total = 0
+        seen = {self._key(current)}
+        level = [(current, self._key(current))]
+        while level and (self.budget.generation_limit is None or len(counts) <= self.budget.generation_limit):
+            above = []
+            for person, key in level:
+                for parent in self._parents(person, key):
+                    if parent is None or parent in seen:
+                        continue
+                    seen.add(parent)
+                    parent_person = graph.person(parent) if isinstance(parent, int) else self.people.get(parent)
+                    if parent_person is not None:
+                        above.append((parent_person, parent))
+            if not above:
+                break
+            counts.append(len(above))
+            total += len(above)
+            if total > self.budget.max_lines:
+                break
+            level = above
+        return counts
+
+    def _iter_create(self, current: Person, others: bool) -> Iterator[Line]:
+        present = set()
+        count = 0
+        for line in self._trace(self._parent_entries(current, self._key(current), 0, "")):
+            if not self.budget.take():
+                break
+            present.add(line.person.xref_id)
+            count += 1
+            yield line
+        if others:
+            yield from self._others(present, count)
+        self.budget.report("CreatorTrace")
 
     def createothers(self, listof):
         """Add Line objects for all people not already in listof.
 
-        WARNING: This method iterates through ALL people in the dataset, which can be
-        extremely slow for large datasets (10,000+ people). Consider disabling
-        AllEntities option for large files.
+        Runs in time linear in the number of people plus the Lines added: membership
+        is tracked incrementally rather than recomputed from listof for every person.
 
         Args:
             listof: List of Line objects to extend with additional people
         """
-        total_people = len(self.people)
-        processed = 0
-        added = 0
-
-        _log.info(f"createothers: Processing {total_people:,} people (current list has {len(listof):,} entries)")
-
-        for person in self.people:
-            processed += 1
+        present = {creates.person.xref_id for creates in listof}
+        self.budget.lines = len(listof)
+        listof.extend(self._others(present, len(listof)))
+        self.budget.report("CreatorTrace")
 
-            # Progress logging every 1000 people
-            if processed % 1000 == 0:
-                percent = 100 * processed // total_people
-                _log.info(
-                    f"createothers: Processed {processed:,}/{total_people:,} people "
-                    f"({percent}%), added {added:,} so far"
-                )
+    def _others(self, present: set, size: int) -> Iterator[Line]:
+        """Yield createothers' Lines for everyone not in present, after size Lines already made."""
 
-            c = [creates.person.xref_id for creates in listof]
-            if person not in c:
-                _log.debug("Others: + %s (%s) (%d)", self.people[person].name, person, len(listof))
-                lines = self.line(self.people[person], len(listof) / 10, 5, path="")
-                if lines:
-                    listof.extend(lines)
-                    added += len(lines)
+        def lines_for(person, size, present):
+            return self.line(self.people[person], size / 10, 5, path="")
 
-        _log.info(
-            f"createothers: Completed. Processed {processed:,} people, added {added:,} new entries. Total list size: {len(listof):,}"
-        )
+        return _iter_others(self.people, present, size, lines_for, self.svc_progress, self.budget)
 
 
 class LifetimeCreator:
@@ -570,26 +1148,38 @@ class LifetimeCreator:
         rainbow (Rainbow): Color gradient generator for visual distinction
         max_missing (int): Maximum number of missing parents allowed before stopping recursion
         alltheseids (Dict): Cache of processed person IDs to prevent infinite loops
+        lifeline_cache_hits, lifeline_cache_misses (int): Reuse of the per-person life line payloads
+            (years, locations, midpoints) cached for the current run
+        budget (TraversalBudget): MaxGenerations/MaxLines limits and what they cut in the current run
     Methods:
         selfline(current: Person, branch, prof, miss, path="") -> list[Line]:
             Creates a Line object representing a person's lifetime from birth to death location,
             including intermediate home locations as waypoints.
         line(latlon: LatLon, parent: Person, branch, prof, miss, path="", linestyle="", forperson: Person = None) -> list[Line]:
             Generates a Line from a given location to a parent's birth location, with loop
-            detection. Returns empty list if parent already processed or recursion limits reached.
+            detection. Returns empty list if the parent closes a loop or is cut by max_missing.
         link(latlon: LatLon, current: Person, branch=0, prof=0, miss=0, path="") -> list[Line]:
-            Recursively generates lines for a person and their ancestors (both parents) up to
-            maximum recursion depth of 480 generations, splitting branches for each parent.
+            Generates lines for a person and all their ancestors (both parents), splitting
+            branches for each parent. Traversal uses an explicit stack and has no depth limit.
         create(main_id: str) -> list[Line]:
             Entry point to generate complete ancestral lifetime visualization starting from
             a specified person ID. Raises IndexError if person not found.
+        iter_create(main_id: str, others: bool = False) -> Iterator[Line]:
+            Yields create()'s Lines (then createothers' when others=True) one at a time.
         createothers(listof) -> None:
             Extends the provided list with lifetime lines for all people not already included,
             using list length for branch and profundity calculations.
     """
 
     def __init__(
-        self, people: Dict[str, Person], max_missing: int = 0, svc_progress: Optional[IProgressTracker] = None
+        self,
+        people: Dict[str, Person],
+        max_missing: int = 0,
+        svc_progress: Optional[IProgressTracker] = None,
+        collapse_pedigree: bool = False,
+        person_index: Optional[PersonIndex] = None,
+        max_generations: int = 0,
+        max_lines: int = 0,
     ) -> None:
         """Initialize LifeCreator for personal life timeline visualization.
 
@@ -597,37 +1187,53 @@ class LifetimeCreator:
             people: Dictionary mapping person IDs to Person objects.
             max_missing: Maximum consecutive missing events before stopping traversal.
             svc_progress: Optional progress tracker for GUI status updates.
+            collapse_pedigree: If True, emit each person and parent link once instead of once per path.
+            person_index: PersonIndex of people to read events and years from (None = read the events).
+            max_generations: Generations above the start to visit at most (0 = no limit).
+            max_lines: Lines to make at most, cut breadth-fairly by generation (0 = no limit).
         """
         self.people: Dict[str, Person] = people
+        self.person_index: PersonIndex = person_index if person_index is not None else PersonIndex()
         self.rainbow: Rainbow = Rainbow()
         self.max_missing: int = max_missing
         self.svc_progress = svc_progress
+        self.collapse_pedigree: bool = collapse_pedigree
+        self.budget: TraversalBudget = TraversalBudget(max_generations, max_lines)
         self._line_call_count: int = 0
+        self.person_path_count: Dict[str, int] = {}
+        # Shared ancestor subtrees for the current run, keyed by (xref_id, missing counter)
+        self._nodes: Dict[tuple, PedigreeNode] = {}
+        # Life line payloads for the current run, keyed by xref_id, and how often they were reused
+        self._payloads: Dict[str, tuple] = {}
+        self.lifeline_cache_hits: int = 0
+        self.lifeline_cache_misses: int = 0
+        # Node keys, people and (child, parent) links already emitted when collapse_pedigree is on
+        self._expanded: Optional[set] = None
+        self._emitted: Optional[set] = None
+        self.dag: Optional[PedigreeDAG] = None
+
+    def _cached_payload(self, current: Person) -> tuple:
+        """_payload(current), computed once per person per run.
+
+        The payload (years, locations and residence midpoints) does not depend on the
+        path a person is reached by, so every node and life line of that person shares it.
+        """
+        payload = self._payloads.get(current.xref_id)
+        if payload is None:
+            payload = self._payloads[current.xref_id] = self._payload(current)
+            self.lifeline_cache_misses += 1
+        else:
+            self.lifeline_cache_hits += 1
+        return payload
 
-    def selfline(self, current: Person, branch, prof, miss, path: str = "", visited=None) -> list[Line]:
-        # Track visited IDs in this specific line
-        if visited is None:
-            visited = set()
-
-        visited = visited | {current.xref_id}
-        color = (branch + DELTA / 2) / (SPACE ** (prof % 256))
-
-        birth_event = current.get_event("birth") if current else None
-        birth_year_num = birth_event.getattr("when_year_num") if birth_event else None
-        birth_latlon = birth_event.getattr("latlon") if birth_event else None
-
-        death_event = current.get_event("death") if current else None
-        death_year_num = death_event.getattr("when_year_num") if death_event else None
-        death_latlon = death_event.getattr("latlon") if death_event else None
+    def _payload(self, current: Person) -> tuple:
+        """Collect (birth year, birth latlon, death year, death latlon, midpoints) for current."""
+        index = self.person_index
+        birth_year_num = index.year(current, "birth")
+        birth_latlon = index.latlon(current, "birth")
+        death_year_num = index.year(current, "death")
+        death_latlon = index.latlon(current, "death")
 
-        if birth_event and death_event:
-            _log.debug(
-                "{:8} {:8} {:2} {:.10f} {} Self {:20}".format(
-                    path, branch, prof, color, self.rainbow.get(color).to_hexa(), current.name
-                )
-            )
-        else:
-            _log.debug("{:8} {:8} {:2} {:.10f} {} Self {:20}".format(" ", " ", " ", 0, "-SKIP-", current.name))
         midpoints = []
         wyear = None
         residence_events = current.get_events("residence") if current else []
@@ -643,12 +1249,27 @@ class LifetimeCreator:
                         )
                     )
                     wyear = wyear if wyear else residence_events[h].date.year_num
+        return birth_year_num, birth_latlon, death_year_num, death_latlon, midpoints
 
-        line = Line(
+    def _self_line(self, current: Person, payload: tuple, branch, prof, path: str) -> Line:
+        birth_year_num, birth_latlon, death_year_num, death_latlon, midpoints = payload
+        color = (branch + DELTA / 2) / (SPACE ** (prof % 256))
+        line_color = self.rainbow.get(color)
+        if _log.isEnabledFor(logging.DEBUG):
+            if birth_latlon is not None and death_latlon is not None:
+                _log.debug(
+                    "{:8} {:8} {:2} {:.10f} {} Self {:20}".format(
+                        path, branch, prof, color, line_color.to_hexa(), current.name
+                    )
+                )
+            else:
+                _log.debug("{:8} {:8} {:2} {:.10f} {} Self {:20}".format(" ", " ", " ", 0, "-SKIP-", current.name))
+
+        return Line(
             f"{path:8}\t{current.name}",
             birth_latlon,
             death_latlon,
-            self.rainbow.get(color),
+            line_color,
             path,
             branch,
             prof,
@@ -660,7 +1281,133 @@ class LifetimeCreator:
             whenTo=death_year_num,
         )
 
-        return [line]
+    def selfline(self, current: Person, branch, prof, miss, path: str = "", visited=None) -> list[Line]:
+        return [self._self_line(current, self._cached_payload(current), branch, prof, path)]
+
+    def _open(self, current: Person, miss: int) -> tuple:
+        """Decide how build_subtree handles a parent reached with miss consecutive missing births."""
+        has_birth = bool(getattr(current, "birth", None))
+        if not has_birth and self.max_missing != 0 and miss >= self.max_missing:
+            _log.debug("{:8} {:8} {:2} {:.10f} {} Self {:20}".format(" ", " ", " ", 0, "-STOP-", current.name))
+            return None, None
+        key = node_key(current.xref_id, miss, has_birth, self.max_missing)
+        node = self._nodes.get(key)
+        if node is not None:
+            return node, None
+        payload = self._cached_payload(current)
+        return PedigreeNode(key, current, has_birth, payload[1], payload), 0 if has_birth else miss + 1
+
+    def _open_start(self, current: Person, miss: int, parent_miss: int) -> tuple:
+        """Open the starting person of a link() call, which is never cut nor shared."""
+        has_birth = bool(getattr(current, "birth", None))
+        payload = self._cached_payload(current)
+        node = PedigreeNode((current.xref_id, "start", parent_miss), current, has_birth, payload[1], payload)
+        return node, parent_miss
+
+    def _memoize(self, node: PedigreeNode) -> None:
+        if node.key[1] != "start":
+            self._nodes[node.key] = node
+
+    def _build(
+        self, current: Person, miss: int, building=(), parent_miss: Optional[int] = None
+    ) -> Optional[PedigreeNode]:
+        """Return the shared node for current's ancestor subtree, building it on first use.
+
+        parent_miss is given for the starting person of a link() call: that node is never
+        cut and passes parent_miss to its parents unchanged.
+        """
+        open_start = partial(self._open_start, parent_miss=parent_miss) if parent_miss is not None else None
+        return build_subtree(
+            self.people, current, miss, self._open, self._memoize, building, open_start, self.person_index.graph
+        )
+
+    def _walk(self, node: PedigreeNode, latlon: LatLon, branch, prof, path) -> Iterator[Line]:
+        """Yield node's own life line, then the links to and subtrees of its parents (as link() did)."""
+        return self._run([(_LINK, node, latlon, branch, prof, path, None, None)])
+
+    def _walk_edge(
+        self, child: PedigreeNode, parent: PedigreeNode, latlon: LatLon, branch, prof, path, linestyle
+    ) -> Iterator[Line]:
+        """Walk parent's subtree and then yield the line from the child's location to parent's birth."""
+        return self._run([(_EDGE, parent, latlon, branch, prof, path, child, linestyle)])
+
+    def _run(self, stack: list) -> Iterator[Line]:
+        """Drain a stack of (kind, node, latlon, branch, prof, path, child, linestyle) entries.
+
+        _LINK entries emit node's life line and queue both parent edges, _EDGE entries
+        queue the parent's subtree ahead of the edge's own line, and _EMIT entries
+        yield that line once the subtree above it has been emitted.
+        """
+        while stack:
+            kind, node, latlon, branch, prof, path, child, linestyle = stack.pop()
+
+            if kind == _EMIT:
+                if self._emitted is not None:
+                    edge = (child.xref_id, node.xref_id)
+                    if edge in self._emitted:
+                        continue
+                    self._emitted.add(edge)
+                yield self._edge_line(child, node, latlon, branch, prof, path, linestyle)
+
+            elif kind == _EDGE:
+                if node.has_event:
+                    stack.append((_EMIT, node, latlon, branch, prof, path, child, linestyle))
+                    stack.append((_LINK, node, node.latlon, branch, prof, path, None, None))
+                else:
+                    # No birth to draw to: skip over this parent, carrying the child's location onwards
+                    stack.append((_LINK, node, latlon, branch, prof, path, None, None))
+
+            else:
+                if self._expanded is not None:
+                    if node.key in self._expanded:
+                        continue
+                    self._expanded.add(node.key)
+
+                # Track progress for GUI updates
+                self._line_call_count += 1
+                if self.svc_progress and self._line_call_count % 100 == 0:
+                    self.svc_progress.state = f"Creating lifetime lines: {self._line_call_count:,} paths processed"
+
+                if self._emitted is None or node.xref_id not in self._emitted:
+                    if self._emitted is not None:
+                        self._emitted.add(node.xref_id)
+                    yield self._self_line(node.person, node.payload, branch * SPACE, prof + 1, path)
+
+                if (node.father is None and node.mother is None) or not self.budget.follows(path):
+                    continue
+                if node.mother is not None:
+                    stack.append(
+                        (_EDGE, node.mother, latlon, branch * SPACE + DELTA, prof + 1, path + "M", node, "mother")
+                    )
+                if node.father is not None:
+                    stack.append((_EDGE, node.father, latlon, branch * SPACE, prof + 1, path + "F", node, "father"))
+
+    def _edge_line(
+        self, child: PedigreeNode, parent: PedigreeNode, latlon: LatLon, branch, prof, path, linestyle
+    ) -> Line:
+        color = (branch + DELTA / 2) / (SPACE ** (prof % 256))
+        line_color = self.rainbow.get(color)
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "{:8} {:8} {:2} {:.10f} {} {:20} from {:20}".format(
+                    path, branch, prof, color, line_color.to_hexa(), parent.person.name, child.person.name
+                )
+            )
+        parent_birth_year, parent_birth_latlon, parent_death_year = parent.payload[:3]
+        return Line(
+            f"{path:8}\t{parent.person.name}",
+            latlon,
+            parent_birth_latlon,
+            line_color,
+            path,
+            branch,
+            prof,
+            linestyle,
+            child.person,
+            person=parent.person,
+            whenFrom=parent_birth_year,
+            whenTo=parent_death_year,
+        )
 
     # Draw a line from the parents birth to the child birth location
 
@@ -676,148 +1423,97 @@ class LifetimeCreator:
         forperson: Person = None,
         visited=None,
     ) -> list[Line]:
-        # Track visited IDs in this specific line to detect sequential loops only
-        if visited is None:
-            visited = set()
-
-        if parent.xref_id in visited:
-            _log.warning(
-                "Loop detected in ancestry trace: {:2} - {} {} - Path: {}".format(
-                    prof, parent.name, parent.xref_id, path
-                )
-            )
+        building = set(visited) if visited else set()
+        if forperson is not None:
+            building.add(forperson.xref_id)
+        node = self._build(parent, miss, building)
+        if node is None:
             return []
-
-        if getattr(parent, "birth", None):
-            color = (branch + DELTA / 2) / (SPACE**prof)
-            _log.debug(
-                "{:8} {:8} {:2} {:.10f} {} {:20} from {:20}".format(
-                    path, branch, prof, color, self.rainbow.get(color).to_hexa(), parent.name, forperson.name
-                )
-            )
-
-            parent_birth = parent.get_event("birth") if parent else None
-            parent_birth_latlon = parent_birth.getattr("latlon") if parent_birth else None
-            parent_birth_year = parent_birth.getattr("when_year_num") if parent_birth else None
-
-            parent_death = parent.get_event("death") if parent else None
-            parent_death_year = parent_death.getattr("when_year_num") if parent_death else None
-
-            line = Line(
-                f"{path:8}\t{parent.name}",
-                latlon,
-                parent_birth_latlon,
-                self.rainbow.get(color),
-                path,
-                branch,
-                prof,
-                linestyle,
-                forperson,
-                person=parent,
-                whenFrom=parent_birth_year,
-                whenTo=parent_death_year,
-            )
-            return self.link(parent_birth_latlon, parent, branch, prof, 0, path, visited) + [line]
-        else:
-            if self.max_missing != 0 and miss >= self.max_missing:
-                _log.debug("{:8} {:8} {:2} {:.10f} {} Self {:20}".format(" ", " ", " ", 0, "-STOP-", parent.name))
-                return []
-            return self.link(latlon, parent, branch, prof, miss + 1, path, visited)
+        child = PedigreeNode(None, forperson, False) if forperson is not None else node
+        return list(self._walk_edge(child, node, latlon, branch, prof, path, linestyle))
 
     def link(self, latlon: LatLon, current: Person, branch=0, prof=0, miss=0, path="", visited=None) -> list[Line]:
-        # Track progress for GUI updates
-        self._line_call_count += 1
-        if self.svc_progress and self._line_call_count % 100 == 0:
-            self.svc_progress.state = f"Creating lifetime lines: {self._line_call_count:,} paths processed"
+        node = self._build(current, miss, visited or (), parent_miss=miss)
+        if node is None:
+            return []
+        return list(self._walk(node, latlon, branch, prof, path))
 
-        # Maximum recursion depth.  This should never happen
-        if visited is None:
-            visited = set()
+    def create(self, main_id: str):
+        return list(self.iter_create(main_id))
 
-        if prof < 480:
-            return (
-                (self.selfline(current, branch * SPACE, prof + 1, miss, path, visited))
-                + (
-                    self.line(
-                        latlon,
-                        self.people[current.father],
-                        branch * SPACE,
-                        prof + 1,
-                        miss,
-                        path + "F",
-                        "father",
-                        current,
-                        visited,
-                    )
-                    if current.father
-                    else []
-                )
-                + (
-                    self.line(
-                        latlon,
-                        self.people[current.mother],
-                        branch * SPACE + DELTA,
-                        prof + 1,
-                        miss,
-                        path + "M",
-                        "mother",
-                        current,
-                        visited,
-                    )
-                    if current.mother
-                    else []
-                )
-            )
-        else:
-            _log.warning("{:8} {:8} {:2} {} {} {:20}".format(" ", " ", prof, " ", "-TOO DEEP-", current.name))
-            return (self.selfline(current, branch * SPACE, prof + 1, miss, path, visited)) + [] + []
+    def iter_create(self, main_id: str, others: bool = False) -> Iterator[Line]:
+        """Yield the Lines of create(main_id) one at a time, in the same order.
 
-    def create(self, main_id: str):
-        self._line_call_count = 0  # Reset counter for each traversal
+        The ancestor DAG is built up front, but Lines are only made as they are
+        consumed. With others=True the Lines createothers() would then add follow,
+        so the whole AllEntities result can be streamed to an exporter.
+
+        Raises:
+            IndexError: when main_id is not present in self.people (raised here, not on iteration).
+        """
         if main_id not in self.people.keys():
             _log.error("Could not find your starting person: %s", main_id)
             raise IndexError(f"Missing starting person {main_id}")
-        current_person = self.people[main_id]
-        birth_event = current_person.get_event("birth") if current_person else None
-        birth_latlon = birth_event.getattr("latlon") if birth_event else None
 
-        return self.link(birth_latlon, current_person)
+        # Reset the shared subtrees and instrumentation for this traversal
+        self._line_call_count = 0
+        self._nodes = {}
+        self._payloads = {}
+        self.lifeline_cache_hits = self.lifeline_cache_misses = 0
+        self._expanded = set() if self.collapse_pedigree else None
+        self._emitted = set() if self.collapse_pedigree else None
+        self.budget.reset()
+
+        current_person = self.people[main_id]
+        birth_latlon = self.person_index.latlon(current_person, "birth")
+
+        root = self._build(current_person, 0, parent_miss=0)
+        self.dag = PedigreeDAG(root, self._nodes)
+        if self.budget.max_lines:
+            # Every visit makes a life line, plus the line to the parent's birth when there is one
+            counts = self.dag.generation_counts(
+                lambda node: 1 + bool(node.has_event), self.budget.generation_limit, self.budget.max_lines
+            )
+            counts[:1] = [1]  # The starting person only has their life line
+            self.budget.plan(counts)
+        return self._iter_create(self._walk(root, birth_latlon, 0, 0, ""), others)
+
+    def _iter_create(self, lines: Iterator[Line], others: bool) -> Iterator[Line]:
+        present = set()
+        count = 0
+        for line in lines:
+            if not self.budget.take():
+                break
+            present.add(line.person.xref_id)
+            count += 1
+            yield line
+
+        self.person_path_count = self.dag.path_counts()
+        _log_pedigree_collapse(
+            self.people, self.person_path_count, count, (self.lifeline_cache_hits, self.lifeline_cache_misses)
+        )
+        if others:
+            yield from self._others(present, count)
+        self.budget.report("LifetimeCreator")
 
     def createothers(self, listof):
         """Add Line objects for all people not already in listof.
 
-        WARNING: This method iterates through ALL people in the dataset, which can be
-        extremely slow for large datasets (10,000+ people). Consider disabling
-        AllEntities option for large files.
+        Runs in time linear in the number of people plus the Lines added: membership
+        is tracked incrementally rather than recomputed from listof for every person.
 
         Args:
             listof: List of Line objects to extend with additional people
         """
-        total_people = len(self.people)
-        processed = 0
-        added = 0
+        present = {creates.person.xref_id for creates in listof}
+        self.budget.lines = len(listof)
+        listof.extend(self._others(present, len(listof)))
+        self.budget.report("LifetimeCreator")
 
-        _log.info(f"createothers: Processing {total_people:,} people (current list has {len(listof):,} entries)")
+    def _others(self, present: set, size: int) -> Iterator[Line]:
+        """Yield createothers' Lines for everyone not in present, after size Lines already made."""
 
-        for person in self.people:
-            processed += 1
-
-            # Progress logging every 1000 people
-            if processed % 1000 == 0:
-                percent = 100 * processed // total_people
-                _log.info(
-                    f"createothers: Processed {processed:,}/{total_people:,} people "
-                    f"({percent}%), added {added:,} so far"
-                )
+        def lines_for(person, size, present):
+            return self.selfline(self.people[person], size / 10, size / 10, 5, path="")
 
-            c = [creates.person.xref_id for creates in listof]
-            if person not in c:
-                _log.debug("Others: + %s(%s) (%d)", self.people[person].name, person, len(listof))
-                lines = self.selfline(self.people[person], len(listof) / 10, len(listof) / 10, 5, path="")
-                if lines:
-                    listof.extend(lines)
-                    added += len(lines)
-
-        _log.info(
-            f"createothers: Completed. Processed {processed:,} people, added {added:,} new entries. Total list size: {len(listof):,}"
-        )
+        return _iter_others(self.people, present, size, lines_for, self.svc_progress, self.budget)
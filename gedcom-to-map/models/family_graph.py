@@ -0,0 +1,118 @@
+"""
+Integer-indexed family graph.
+
+Every person gets a dense row number (their position in the people dict), and
+the family links are stored as NumPy arrays of rows instead of xref strings on
+each Person:
+
+- ``father`` and ``mother``: one int32 row per person (-1 = unknown, or a
+  parent that is not in people),
+- children and partners in CSR (compressed sparse row) form: the rows of row
+  r's children are ``child_rows[child_offsets[r]:child_offsets[r + 1]]``, in
+  Person.children order, and likewise for ``partner_offsets``/``partner_rows``.
+
+Traversals step from row to row (``parents()``, ``children()``, ``person()``)
+and whole-tree questions such as "who are the ancestors of r" are answered with
+array operations rather than per-person dictionary lookups.
+"""
+
+__all__ = ["FamilyGraph", "NO_ROW"]
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from geo_gedcom.person import Person
+
+NO_ROW = -1  # Row meaning "no person"
+
+
+def _csr(links: List[Iterable[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack per-row lists of rows into (offsets, rows) arrays."""
+    offsets = np.zeros(len(links) + 1, dtype=np.int64)
+    np.cumsum([len(row_links) for row_links in links], out=offsets[1:])
+    rows = np.fromiter((row for row_links in links for row in row_links), dtype=np.int32, count=int(offsets[-1]))
+    return offsets, rows
+
+
+class FamilyGraph:
+    """Father, mother, children and partner links of people as arrays of dense row ids.
+
+    Attributes:
+        ids: xref_id of each row.
+        rows: Row of each xref_id.
+        father, mother: Row of each person's parents (-1 = none).
+        child_offsets, child_rows: Each person's children, in CSR form.
+        partner_offsets, partner_rows: Each person's partners, in CSR form.
+    """
+
+    def __init__(self, people: Optional[Dict[str, Person]] = None) -> None:
+        people = people or {}
+        self.ids: List[str] = list(people)
+        self.rows: Dict[str, int] = {xref_id: row for row, xref_id in enumerate(self.ids)}
+        self._people: List[Person] = list(people.values())
+        rows = self.rows
+
+        def row_of(xref_id) -> int:
+            return rows.get(xref_id, NO_ROW) if xref_id else NO_ROW
+
+        def rows_of(xref_ids) -> List[int]:
+            return [rows[xref_id] for xref_id in xref_ids or () if xref_id in rows]
+
+        self.father = np.array([row_of(getattr(p, "father", None)) for p in self._people], dtype=np.int32)
+        self.mother = np.array([row_of(getattr(p, "mother", None)) for p in self._people], dtype=np.int32)
+        self.child_offsets, self.child_rows = _csr([rows_of(getattr(p, "children", None)) for p in self._people])
+        self.partner_offsets, self.partner_rows = _csr([rows_of(getattr(p, "partners", None)) for p in self._people])
+        # Step-by-step traversals read single entries; memoryviews give plain ints without NumPy scalar overhead
+        self._fathers = memoryview(self.father)
+        self._mothers = memoryview(self.mother)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, xref_id: object) -> bool:
+        return xref_id in self.rows
+
+    def person(self, row: int) -> Person:
+        return self._people[row]
+
+    def row_of(self, person: Optional[Person]) -> Optional[int]:
+        """Row of person, or None when this graph was not built from that Person object."""
+        if person is None or not self.rows:
+            return None
+        row = self.rows.get(person.xref_id)
+        if row is None or self._people[row] is not person:
+            return None
+        return row
+
+    def parents(self, row: int) -> Tuple[int, int]:
+        """(father row, mother row) of row, -1 where unknown."""
+        return self._fathers[row], self._mothers[row]
+
+    def children(self, row: int) -> np.ndarray:
+        return self.child_rows[self.child_offsets[row] : self.child_offsets[row + 1]]
+
+    def partners(self, row: int) -> np.ndarray:
+        return self.partner_rows[self.partner_offsets[row] : self.partner_offsets[row + 1]]
+
+    def ancestors(self, row: int) -> np.ndarray:
+        """Boolean mask of every ancestor of row (row itself included), found a generation at a time."""
+        mask = np.zeros(len(self), dtype=bool)
+        frontier = np.array([row], dtype=np.int32)
+        while frontier.size:
+            mask[frontier] = True
+            parents = np.concatenate((self.father[frontier], self.mother[frontier]))
+            parents = parents[parents != NO_ROW]
+            frontier = np.unique(parents[~mask[parents]])
+        return mask
+
+    def parent_links(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Every child-parent link as (child rows, parent rows, is_father), fathers before mothers per child."""
+        count = len(self)
+        child = np.repeat(np.arange(count, dtype=np.int32), 2)
+        parent = np.empty(2 * count, dtype=np.int32)
+        parent[0::2] = self.father
+        parent[1::2] = self.mother
+        is_father = np.tile(np.array([True, False]), count)
+        known = parent != NO_ROW
+        return child[known], parent[known], is_father[known]
@@ -0,0 +1,114 @@
+"""
+In-memory LRU cache of line creator output.
+
+Changing only how a map is drawn (markers, heat map, ant paths, map style, ...)
+re-runs the whole HTML/KML generation, and used to rebuild every line from the
+tree even though the people and the starting person had not changed.  A
+LineCache keeps the last few creator results, keyed by everything the lines
+depend on:
+
+- the starting person (Main), MaxMissing, AllEntities and CollapsePedigree,
+- the traversal budget (MaxGenerations and MaxLines, see ``budget.py``),
+- the creator type and the event types it drew,
+- the fingerprint of the loaded people (``PersonIndex.fingerprint()``),
+
+so a repeat run with the same key only re-runs the exporter.  Results are held
+as LineStores (see ``line_store.py``), which keeps the cached lines compact.
+
+The cache is bounded by a number of entries and evicts the least recently used
+one; it is dropped whenever a GEDCOM is (re)loaded.
+"""
+
+__all__ = ["LineCache", "LINE_CACHE_SIZE"]
+
+import logging
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Iterator, Optional
+
+from .line import Line
+from .line_store import LineStore
+
+_log = logging.getLogger(__name__.lower())
+
+LINE_CACHE_SIZE = 4  # Creator results kept by default
+
+
+class LineCache:
+    """Least recently used cache of creator results.
+
+    Attributes:
+        maxsize: Number of results kept; the least recently used one is evicted beyond it.
+        hits, misses: Lookups that did and did not find a result.
+    """
+
+    def __init__(self, maxsize: int = LINE_CACHE_SIZE) -> None:
+        if maxsize < 1:
+            raise ValueError("LineCache maxsize must be at least 1")
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    @staticmethod
+    def key(
+        creator: str,
+        main_id: str,
+        max_missing: int,
+        all_entities: bool,
+        fingerprint: str,
+        collapse_pedigree: bool = False,
+        gpstypes: Iterable[str] = (),
+        max_generations: int = 0,
+        max_lines: int = 0,
+    ) -> tuple:
+        """Build the cache key of one creator run."""
+        return (
+            creator,
+            main_id,
+            max_missing,
+            bool(all_entities),
+            bool(collapse_pedigree),
+            tuple(gpstypes),
+            max_generations or 0,
+            max_lines or 0,
+            fingerprint,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the result stored under key (marking it most recently used), or None."""
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        _log.info("Line cache hit for %s (%d hits, %d misses)", key[:2], self.hits, self.misses)
+        return result
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """Store result under key, evicting the least recently used results beyond maxsize."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            _log.debug("Line cache evicted %s", evicted[:2])
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def record(self, key: Hashable, lines: Iterable[Line]) -> Iterator[Line]:
+        """Yield lines unchanged, and store them (as a LineStore) under key once all were read.
+
+        A stream that is abandoned part way through (an export error or cancel) is not stored.
+        """
+        store = LineStore()
+        for line in lines:
+            store.append(line)
+            yield line
+        self.put(key, store)
@@ -0,0 +1,294 @@
+"""
+Columnar (struct-of-arrays) storage for Line objects.
+
+A Line is a full Python object with a dozen attributes, and AllEntities renders
+make one per path through the tree, so millions of them add up quickly.  A
+LineStore packs the same data into typed arrays, one entry per line:
+
+- from/to locations, colors, people and parents as indexes into shared tables
+  (each distinct LatLon or Person object is kept once, and each distinct color),
+- birth/death years, branch and prof as plain numbers,
+- style as an index into a small string table (tag and linetype, which are
+  rarely set, only for the lines that have them),
+- paths as one byte string with an offset array (up to 4 GB of path text),
+- midpoints in CSR form: each distinct midpoint list is stored once as a slice
+  of a flat event list (an offset array), and lines refer to it by index.
+
+The display name is not stored when it is the usual ``f"{path:8}\\t{person.name}"``.
+
+Indexing or iterating a LineStore gives LineView objects: tiny handles that
+expose the Line attributes (name, fromlocation, color, midpoints, ...) read from
+the columns, so existing exporters work on a LineStore unchanged.
+"""
+
+__all__ = ["LineStore", "LineView"]
+
+from array import array
+from collections.abc import Sequence
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from .color import Color
+from .line import Line
+from geo_gedcom.person import Person
+from geo_gedcom.life_event import LifeEvent
+from geo_gedcom.lat_lon import LatLon
+
+_NONE = -1  # Table index meaning "no object"
+_BLANK = -2  # Parent index of a Line whose parentofperson is "" rather than None
+_NO_YEAR = -(2**31)  # Year column value meaning None
+
+
+def _default_name(path: str, person: Optional[Person]) -> Optional[str]:
+    return f"{path:8}\t{person.name}" if person is not None else None
+
+
+class _Table:
+    """Objects stored once each (index -1 stands for None).
+
+    Objects are matched by identity unless a key function is given; the table keeps
+    a reference to every object, so an id cannot be reused while it is listed.
+    """
+
+    __slots__ = ("items", "_index", "_key")
+
+    def __init__(self, key: Callable[[object], Hashable] = id) -> None:
+        self.items: list = []
+        self._index: Dict[Hashable, int] = {}
+        self._key = key
+
+    def add(self, item) -> int:
+        if item is None:
+            return _NONE
+        key = self._key(item)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.items)
+            self.items.append(item)
+        return index
+
+    def get(self, index: int):
+        return self.items[index] if index != _NONE else None
+
+
+class _Strings:
+    """Interned strings (line styles)."""
+
+    __slots__ = ("items", "_index")
+
+    def __init__(self) -> None:
+        self.items: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, text: str) -> int:
+        index = self._index.get(text)
+        if index is None:
+            index = self._index[text] = len(self.items)
+            self.items.append(text)
+        return index
+
+
+class LineView:
+    """Read/write view of one row of a LineStore with the attributes of a Line."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "LineStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    @property
+    def name(self) -> str:
+        store = self._store
+        name = store._names.get(self._row)
+        return name if name is not None else _default_name(self.path, self.person)
+
+    @property
+    def fromlocation(self) -> Optional[LatLon]:
+        return self._store._latlons.get(self._store._from[self._row])
+
+    @property
+    def tolocation(self) -> Optional[LatLon]:
+        return self._store._latlons.get(self._store._to[self._row])
+
+    @property
+    def color(self) -> Optional[Color]:
+        return self._store._colors.get(self._store._color[self._row])
+
+    @property
+    def path(self) -> str:
+        offsets = self._store._path_offsets
+        return self._store._paths[offsets[self._row] : offsets[self._row + 1]].decode()
+
+    @property
+    def branch(self) -> float:
+        return self._store._branch[self._row]
+
+    @property
+    def prof(self) -> int:
+        prof = self._store._prof[self._row]
+        return int(prof) if prof.is_integer() else prof
+
+    @property
+    def style(self) -> str:
+        return self._store._styles.items[self._store._style[self._row]]
+
+    @property
+    def parentofperson(self) -> Optional[Person]:
+        parent = self._store._parent[self._row]
+        return "" if parent == _BLANK else self._store._people.get(parent)
+
+    @property
+    def midpoints(self) -> Optional[List[LifeEvent]]:
+        store = self._store
+        group = store._mids[self._row]
+        if group == _NONE:
+            return None
+        return store._mid_events[store._mid_offsets[group] : store._mid_offsets[group + 1]]
+
+    @property
+    def person(self) -> Optional[Person]:
+        return self._store._people.get(self._store._person[self._row])
+
+    @property
+    def whenFrom(self) -> Optional[int]:
+        year = self._store._when_from[self._row]
+        return None if year == _NO_YEAR else year
+
+    @property
+    def whenTo(self) -> Optional[int]:
+        year = self._store._when_to[self._row]
+        return None if year == _NO_YEAR else year
+
+    @property
+    def tag(self) -> str:
+        return self._store._tags.get(self._row, ("", ""))[0]
+
+    @property
+    def linetype(self) -> str:
+        return self._store._tags.get(self._row, ("", ""))[1]
+
+    def updateWhen(self, newwhen):
+        whenFrom = self.whenFrom
+        if newwhen and (not whenFrom or newwhen < whenFrom):
+            self._store._when_from[self._row] = newwhen
+
+    def updateWhenTo(self, newwhen):
+        whenTo = self.whenTo
+        if newwhen and (not whenTo or newwhen > whenTo):
+            self._store._when_to[self._row] = newwhen
+
+    def __repr__(self):
+        return f"( {self.fromlocation}, {self.tolocation} )"
+
+
+class LineStore(Sequence):
+    """Compact list of lines: append Line objects, read back LineView objects.
+
+    Supports len(), indexing (including slices, which return lists of views),
+    iteration, append() and extend(), so it can stand in for the list of Lines
+    the creators fill and the exporters read.
+    """
+
+    def __init__(self, lines: Iterable[Line] = ()) -> None:
+        self._from = array("i")
+        self._to = array("i")
+        self._color = array("i")
+        self._person = array("i")
+        self._parent = array("i")
+        self._mids = array("i")
+        self._when_from = array("i")
+        self._when_to = array("i")
+        self._branch = array("d")
+        self._prof = array("d")  # Usually whole numbers, but createothers may pass fractions
+        self._style = array("B")
+        self._path_offsets = array("I", [0])
+        self._paths = bytearray()
+        # Rarely set, so only kept for the rows that have them
+        self._names: Dict[int, str] = {}  # Names that differ from the usual path + person name
+        self._tags: Dict[int, tuple] = {}  # (tag, linetype) when either is not empty
+
+        self._latlons = _Table()
+        # Colors are shared by value, whether or not the Lines share Color instances
+        self._colors = _Table(key=lambda color: (color.r, color.g, color.b, color.a))
+        self._people = _Table()
+        self._styles = _Strings()
+        # Midpoints in CSR form: group g is _mid_events[_mid_offsets[g]:_mid_offsets[g + 1]]
+        self._mid_offsets = array("q", [0])
+        self._mid_events: List[LifeEvent] = []
+        self._mid_groups: Dict[tuple, int] = {}
+
+        self.extend(lines)
+
+    def _mid_group(self, midpoints: Optional[List[LifeEvent]]) -> int:
+        if midpoints is None:
+            return _NONE
+        key = tuple(id(event) for event in midpoints)
+        group = self._mid_groups.get(key)
+        if group is None:
+            group = self._mid_groups[key] = len(self._mid_offsets) - 1
+            self._mid_events.extend(midpoints)
+            self._mid_offsets.append(len(self._mid_events))
+        return group
+
+    def append(self, line: Line) -> None:
+        """Pack line into the store (the Line object itself is not kept)."""
+        row = len(self._prof)
+        path = line.path or ""
+        person = line.person
+        parent = line.parentofperson
+        self._from.append(self._latlons.add(line.fromlocation))
+        self._to.append(self._latlons.add(line.tolocation))
+        self._color.append(self._colors.add(line.color))
+        self._person.append(self._people.add(person))
+        # "" is also used for "no parent", and is given back as it was
+        self._parent.append(_BLANK if isinstance(parent, str) else self._people.add(parent))
+        self._mids.append(self._mid_group(line.midpoints))
+        self._when_from.append(_NO_YEAR if line.whenFrom is None else line.whenFrom)
+        self._when_to.append(_NO_YEAR if line.whenTo is None else line.whenTo)
+        self._branch.append(line.branch)
+        self._prof.append(line.prof)
+        self._style.append(self._styles.add(line.style))
+        if line.tag or line.linetype:
+            self._tags[row] = (line.tag, line.linetype)
+        self._paths += path.encode()
+        self._path_offsets.append(len(self._paths))
+        if line.name != _default_name(path, person):
+            self._names[row] = line.name
+
+    def extend(self, lines: Iterable[Line]) -> None:
+        for line in lines:
+            self.append(line)
+
+    def __len__(self) -> int:
+        return len(self._prof)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [LineView(self, row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LineStore index out of range")
+        return LineView(self, index)
+
+    def __iter__(self) -> Iterator[LineView]:
+        for row in range(len(self)):
+            yield LineView(self, row)
+
+    def nbytes(self) -> int:
+        """Bytes held by the per-line columns (shared tables not included)."""
+        columns = (
+            self._from,
+            self._to,
+            self._color,
+            self._person,
+            self._parent,
+            self._mids,
+            self._when_from,
+            self._when_to,
+            self._branch,
+            self._prof,
+            self._style,
+            self._path_offsets,
+        )
+        return sum(column.itemsize * len(column) for column in columns) + len(self._paths)
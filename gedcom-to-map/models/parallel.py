@@ -0,0 +1,74 @@
+"""
+Process-pool support for Creator's AllEntities pass (createothers).
+
+The people that createothers adds are split into chunks and handed to worker
+processes, which do the per-person work (building ancestor subtrees, reading
+events) and send back small, picklable results.  The parent consumes the
+results in the original people order and builds the Line objects itself, so
+Lines keep referring to the parent's own Person objects and the merged list is
+identical to the serial one.
+
+Workers get the people dictionary through the pool initializer: with the
+"fork" start method it is inherited for free, otherwise it is pickled once per
+worker rather than once per task.
+"""
+
+__all__ = ["PARALLEL_MIN_PEOPLE", "pool_map", "resolve_workers"]
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Sequence
+
+_log = logging.getLogger(__name__.lower())
+
+# Below this many people to add, starting worker processes costs more than it saves
+PARALLEL_MIN_PEOPLE = 2000
+# Chunks per worker: more chunks balance the load better, fewer share more work within a chunk
+CHUNKS_PER_WORKER = 4
+
+_worker_creator = None
+_worker_method = None
+_worker_args: tuple = ()
+
+
+def _init_worker(creator_cls: type, people: Dict[str, Any], kwargs: Dict[str, Any], method: str, args: tuple) -> None:
+    global _worker_creator, _worker_method, _worker_args
+    _worker_creator = creator_cls(people, **kwargs)
+    _worker_method = method
+    _worker_args = args
+
+
+def _run_chunk(chunk: List[str]) -> list:
+    return getattr(_worker_creator, _worker_method)(chunk, *_worker_args)
+
+
+def resolve_workers(workers: int) -> int:
+    """Return the process count for a workers setting (negative means one per CPU)."""
+    if workers < 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def pool_map(
+    creator: Any, kwargs: Dict[str, Any], method: str, items: Sequence[str], workers: int, *args: Any
+) -> Iterator:
+    """Run creator.<method>(chunk, *args) over chunks of items in a process pool.
+
+    Each worker builds its own ``type(creator)(creator.people, **kwargs)``. The
+    method must return one result per item of its chunk; the results are yielded
+    in the order of items.
+    """
+    workers = resolve_workers(workers)
+    nchunks = max(1, min(len(items), workers * CHUNKS_PER_WORKER))
+    size = -(-len(items) // nchunks)
+    chunks = [list(items[i : i + size]) for i in range(0, len(items), size)]
+    _log.info(f"Processing {len(items):,} people in {len(chunks)} chunks on {workers} worker processes")
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(type(creator), creator.people, kwargs, method, args),
+    ) as pool:
+        for results in pool.map(_run_chunk, chunks):
+            yield from results
@@ -0,0 +1,280 @@
+"""
+Shared-subtree (DAG) representation of an ancestor tree.
+
+A family tree with pedigree collapse reaches the same ancestor through many
+paths.  Rather than re-expanding that ancestor's whole subtree for every path,
+the creators build each ancestor's subtree once as a PedigreeNode and link it
+from every child that reaches it.  The resulting PedigreeDAG can then be walked
+either along every path (one Line per path, the historical output) or visiting
+each node once (one Line per person).
+
+Both building and walking use explicit stacks rather than Python recursion, so
+arbitrarily deep (or badly linked) trees never hit the interpreter's recursion
+limit.  Given a FamilyGraph, building follows its parent rows instead of looking
+each parent's xref_id up in the people dict.
+"""
+
+__all__ = ["PedigreeNode", "PedigreeDAG", "node_key", "build_subtree"]
+
+import logging
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from geo_gedcom.person import Person
+from .family_graph import NO_ROW, FamilyGraph
+
+_log = logging.getLogger(__name__.lower())
+
+
+def node_key(xref_id: str, miss: int, has_event: bool, max_missing: int) -> Tuple[str, int]:
+    """Return the memo key for a person reached with ``miss`` consecutive missing events.
+
+    The subtree above a person only depends on the missing-event counter when
+    the person lacks the event and a missing limit is in force; every other case
+    shares a single node per person.
+    """
+    if has_event or max_missing == 0:
+        return (xref_id, 0)
+    return (xref_id, miss)
+
+
+class PedigreeNode:
+    """One person's ancestor subtree, computed once and shared by every path that reaches it.
+
+    Attributes:
+        key: Memo key (xref_id, missing-event counter).
+        person: The Person this node represents.
+        has_event: Whether the person has the event the creator draws lines to.
+        latlon: Location of that event (None when missing or not geocoded).
+        payload: Creator-specific, path-independent line data (years, midpoints, ...).
+        father: Node for the father's subtree, or None when absent/cut off.
+        mother: Node for the mother's subtree, or None when absent/cut off.
+    """
+
+    __slots__ = ("key", "person", "has_event", "latlon", "payload", "father", "mother")
+
+    def __init__(self, key: Hashable, person: Person, has_event: bool, latlon=None, payload=None) -> None:
+        self.key = key
+        self.person: Person = person
+        self.has_event: bool = has_event
+        self.latlon = latlon
+        self.payload = payload
+        self.father: Optional["PedigreeNode"] = None
+        self.mother: Optional["PedigreeNode"] = None
+
+    @property
+    def xref_id(self) -> str:
+        return self.person.xref_id
+
+    def parents(self) -> Iterator["PedigreeNode"]:
+        if self.father is not None:
+            yield self.father
+        if self.mother is not None:
+            yield self.mother
+
+    def __repr__(self) -> str:
+        return f"PedigreeNode({self.key!r}, event={self.has_event})"
+
+
+class PedigreeDAG:
+    """Directed acyclic graph of shared ancestor subtrees rooted at one person.
+
+    Attributes:
+        root: Node of the starting person (None if the start was cut off).
+        nodes: Every node built for this DAG keyed by memo key. When the memo is
+            shared with other roots (see Creator.createothers) it may also hold
+            nodes that are not reachable from ``root``.
+    """
+
+    def __init__(self, root: Optional[PedigreeNode], nodes: Dict[Hashable, PedigreeNode]) -> None:
+        self.root: Optional[PedigreeNode] = root
+        self.nodes: Dict[Hashable, PedigreeNode] = nodes
+
+    def reachable(self) -> List[PedigreeNode]:
+        """Return the nodes reachable from the root, each before any of its ancestors."""
+        if self.root is None:
+            return []
+        # Reverse post-order of a DFS along parent edges is a topological order
+        order: List[PedigreeNode] = []
+        seen = {self.root.key}
+        stack = [(self.root, self.root.parents())]
+        while stack:
+            node, parents = stack[-1]
+            for parent in parents:
+                if parent.key not in seen:
+                    seen.add(parent.key)
+                    stack.append((parent, parent.parents()))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+        order.reverse()
+        return order
+
+    def path_counts(self) -> Dict[str, int]:
+        """Count how many distinct paths from the root reach each person.
+
+        This is the pedigree-collapse measure previously gathered by walking every
+        path; here it is computed in one pass over the shared nodes.
+        """
+        order = self.reachable()
+        if not order:
+            return {}
+        paths: Dict[Hashable, int] = {order[0].key: 1}
+        counts: Dict[str, int] = {}
+        for node in order:
+            count = paths.get(node.key, 0)
+            counts[node.xref_id] = counts.get(node.xref_id, 0) + count
+            for parent in node.parents():
+                paths[parent.key] = paths.get(parent.key, 0) + count
+        return counts
+
+    def generation_counts(
+        self,
+        weight: Callable[[PedigreeNode], int],
+        max_generation: Optional[int] = None,
+        stop_after: Optional[int] = None,
+    ) -> List[int]:
+        """Sum weight(node) over every path from the root, per generation (path length).
+
+        Generations are walked one at a time, carrying the number of paths that reach
+        each node, so the cost grows with the nodes per generation rather than with the
+        paths. Counting stops after max_generation, or once the running total exceeds
+        stop_after.
+        """
+        if self.root is None:
+            return []
+        counts: List[int] = []
+        total = 0
+        level: Dict[Hashable, Tuple[PedigreeNode, int]] = {self.root.key: (self.root, 1)}
+        while level and (max_generation is None or len(counts) <= max_generation):
+            count = sum(weight(node) * paths for node, paths in level.values())
+            counts.append(count)
+            total += count
+            if stop_after is not None and total > stop_after:
+                break
+            above: Dict[Hashable, Tuple[PedigreeNode, int]] = {}
+            for node, paths in level.values():
+                for parent in node.parents():
+                    seen = above.get(parent.key)
+                    above[parent.key] = (parent, paths + (seen[1] if seen else 0))
+            level = above
+        return counts
+
+    def unique_people(self) -> int:
+        return len({node.xref_id for node in self.reachable()})
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+class _BuildFrame:
+    """A node whose parents are still being built; up points at the child's frame."""
+
+    __slots__ = ("node", "parent_miss", "up", "pending", "slot")
+
+    def __init__(
+        self, node: PedigreeNode, parent_miss: int, up: Optional["_BuildFrame"], graph: Optional[FamilyGraph], row
+    ) -> None:
+        self.node = node
+        self.parent_miss = parent_miss
+        self.up = up
+        # Parents still to build, as graph rows when row is known and xref_ids otherwise.
+        # Popped from the end, so the father is built first
+        if row is None:
+            person = node.person
+            parents = (("mother", person.mother), ("father", person.father))
+            self.pending = [(slot, xref) for slot, xref in parents if xref]
+        else:
+            father, mother = graph.parents(row)
+            parents = (("mother", mother), ("father", father))
+            self.pending = [(slot, parent) for slot, parent in parents if parent != NO_ROW]
+        self.slot: Optional[str] = None
+
+    def path(self) -> str:
+        """Reconstruct the F/M path to this frame by following the parent-pointer chain."""
+        steps = []
+        frame = self
+        while frame.up is not None:
+            steps.append("F" if frame.up.slot == "father" else "M")
+            frame = frame.up
+        return "".join(reversed(steps))
+
+
+OpenNode = Callable[[Person, int], Tuple[Optional[PedigreeNode], Optional[int]]]
+
+
+def build_subtree(
+    people: Dict[str, Person],
+    start: Person,
+    miss: int,
+    open_node: OpenNode,
+    close_node: Callable[[PedigreeNode], None],
+    on_path: Iterable[str] = (),
+    open_start: Optional[OpenNode] = None,
+    graph: Optional[FamilyGraph] = None,
+) -> Optional[PedigreeNode]:
+    """Build the subtree of shared nodes above start without recursion.
+
+    open_node(person, miss) decides what happens to each person reached:
+    ``(None, None)`` cuts the branch, ``(node, None)`` reuses an already built
+    node, and ``(node, parent_miss)`` starts a new node whose parents are then
+    built with parent_miss. close_node(node) is called once a new node's parents
+    are complete (typically to memoize it). open_start, when given, replaces
+    open_node for the starting person.
+
+    A person met again while still on the path being built is an ancestry loop:
+    a warning is logged and that branch is cut. on_path seeds that check.
+
+    With a graph built from people, parents are found through its rows; a parent
+    that is not in people is then left out instead of raising KeyError.
+
+    Returns:
+        The node for start, or None if it was cut.
+    """
+    on_path = set(on_path)
+    top: Optional[_BuildFrame] = None
+    person: Optional[Person] = start
+    person_miss = miss
+    person_row = graph.row_of(start) if graph is not None else None
+    opener = open_start or open_node
+
+    while True:
+        if person is not None:
+            node = None
+            if person.xref_id in on_path:
+                _log.warning(
+                    "Loop detected in ancestry trace: {} {} - Path: {}".format(
+                        person.name, person.xref_id, top.path() + top.slot[0].upper() if top else ""
+                    )
+                )
+            else:
+                node, parent_miss = opener(person, person_miss)
+                if node is not None and parent_miss is not None:
+                    top = _BuildFrame(node, parent_miss, top, graph, person_row)
+                    on_path.add(person.xref_id)
+                    node = None
+                    person = None
+                    opener = open_node
+                    continue
+            opener = open_node
+            person = None
+            if top is None:
+                return node
+            setattr(top.node, top.slot, node)
+
+        if top.pending:
+            top.slot, parent = top.pending.pop()
+            if isinstance(parent, int):
+                person, person_row = graph.person(parent), parent
+            else:
+                person, person_row = people[parent], None
+            person_miss = top.parent_miss
+            continue
+
+        frame = top
+        top = frame.up
+        on_path.discard(frame.node.xref_id)
+        close_node(frame.node)
+        if top is None:
+            return frame.node
+        setattr(top.node, top.slot, frame.node)
@@ -0,0 +1,199 @@
+"""
+Per-person table of event coordinates, years and family links.
+
+The creators, exporters and summaries all need the same few facts about a
+person - where and when they were born and died, their best known location and
+who their parents and children are - and used to dig them out of the event
+objects with get_event()/getattr() every time, often several times per person
+per line.  A PersonIndex reads them once, after the GEDCOM has been parsed and
+geocoded, into NumPy columns with one row per person (in people order):
+
+- ``lats[kind]``, ``lons[kind]`` (float64, NaN when there is no valid location)
+  and ``years[kind]`` (int32, NO_YEAR when unknown) for kind in "birth", "death"
+  and "best" (bestLatLon(), and the birth year falling back to the death year),
+- ``graph``, the FamilyGraph of the same rows (father, mother, children and
+  partners as row arrays); ``father``, ``mother``, ``child_offsets`` and
+  ``child_rows`` are its arrays.
+
+The event and LatLon objects themselves are kept too, so ``event()``, ``latlon()``
+and ``year()`` give callers exactly what the old lookups returned.  Those
+accessors take a Person and fall back to reading its events when the person is
+not in the index, so an empty ``PersonIndex()`` behaves like no index at all.
+"""
+
+__all__ = ["PersonIndex", "EVENT_KINDS", "NO_YEAR"]
+
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from geo_gedcom.person import Person
+from geo_gedcom.life_event import LifeEvent
+from geo_gedcom.lat_lon import LatLon
+from .family_graph import FamilyGraph
+
+_log = logging.getLogger(__name__.lower())
+
+EVENT_KINDS = ("birth", "death")  # Event types held in the index
+NO_YEAR = int(np.iinfo(np.int32).min)  # Year column value meaning None
+
+
+def _event_year(event: Optional[LifeEvent]) -> Optional[int]:
+    return event.date.year_num if event and event.date else None
+
+
+def _valid(latlon: Optional[LatLon]) -> bool:
+    return bool(latlon) and latlon.is_valid()
+
+
+class PersonIndex:
+    """Columns of per-person coordinates, years and family links, built once per load.
+
+    Attributes:
+        ids: xref_id of each row.
+        rows: Row of each xref_id.
+        lats, lons, years: NumPy columns keyed by "birth", "death" and "best".
+        graph: FamilyGraph of the people, with the same rows.
+        father, mother: Row of each person's parents (-1 = none).
+        child_offsets, child_rows: Each person's children, in CSR form.
+    """
+
+    def __init__(self, people: Optional[Dict[str, Person]] = None) -> None:
+        people = people or {}
+        self.graph: FamilyGraph = FamilyGraph(people)
+        self.ids: List[str] = self.graph.ids
+        self.rows: Dict[str, int] = self.graph.rows
+        self.father = self.graph.father
+        self.mother = self.graph.mother
+        self.child_offsets = self.graph.child_offsets
+        self.child_rows = self.graph.child_rows
+        count = len(self.ids)
+        kinds = (*EVENT_KINDS, "best")
+
+        self._events: Dict[str, list] = {kind: [None] * count for kind in EVENT_KINDS}
+        self._latlons: Dict[str, list] = {kind: [None] * count for kind in kinds}
+        self.lats: Dict[str, np.ndarray] = {kind: np.full(count, np.nan) for kind in kinds}
+        self.lons: Dict[str, np.ndarray] = {kind: np.full(count, np.nan) for kind in kinds}
+        self.years: Dict[str, np.ndarray] = {kind: np.full(count, NO_YEAR, dtype=np.int32) for kind in kinds}
+
+        for row, person in enumerate(people.values()):
+            if person is None:
+                continue
+            for kind in EVENT_KINDS:
+                event = person.get_event(kind)
+                if event:
+                    self._events[kind][row] = event
+                    self._set(kind, row, event.getattr("latlon"), _event_year(event))
+            best_year = self.year_at("birth", row)
+            if best_year is None:
+                best_year = self.year_at("death", row)
+            self._set("best", row, person.bestLatLon(), best_year)
+
+        self._people = people
+        self._fingerprint: Optional[str] = None
+
+        if count:
+            _log.info(f"PersonIndex: {count:,} people, {int(np.isfinite(self.lats['best']).sum()):,} with a location")
+
+    def _set(self, kind: str, row: int, latlon: Optional[LatLon], year: Optional[int]) -> None:
+        self._latlons[kind][row] = latlon
+        if _valid(latlon):
+            self.lats[kind][row] = latlon.lat
+            self.lons[kind][row] = latlon.lon
+        if year is not None:
+            self.years[kind][row] = year
+
+    def fingerprint(self) -> str:
+        """Digest of the indexed ids, family rows, coordinates and years, and of the people's
+        names and residences (computed once).
+
+        Two indexes with the same fingerprint describe the same people as far as the line
+        creators are concerned (the Lines hold names and residence midpoints), so it can key
+        caches of their output.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update("\0".join(self.ids).encode("utf-8", "surrogatepass"))
+            for column in (self.graph.father, self.graph.mother, self.graph.child_offsets, self.graph.child_rows):
+                digest.update(column.tobytes())
+            for columns in (self.lats, self.lons, self.years):
+                for kind in sorted(columns):
+                    digest.update(columns[kind].tobytes())
+            digest.update(self._text_digest())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def _text_digest(self) -> bytes:
+        """Digest of each person's name and residences (place, year, location and type)."""
+        parts = []
+        for person in self._people.values():
+            if person is None:
+                parts.append("")
+                continue
+            parts.append(str(getattr(person, "name", "")))
+            for home in person.get_events("residence") if hasattr(person, "get_events") else []:
+                if not home:
+                    continue
+                latlon = home.getattr("latlon")
+                lat, lon = (latlon.lat, latlon.lon) if latlon else (None, None)
+                parts.append(f"{home.place}\x1f{home.getattr('when_year_num')}\x1f{lat}\x1f{lon}\x1f{home.what}")
+        return hashlib.blake2b("\0".join(parts).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def latlon_at(self, kind: str, row: int) -> Optional[LatLon]:
+        """The LatLon object in row's kind column."""
+        return self._latlons[kind][row]
+
+    def year_at(self, kind: str, row: int) -> Optional[int]:
+        """The year in row's kind column, or None."""
+        year = int(self.years[kind][row])
+        return None if year == NO_YEAR else year
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, xref_id: object) -> bool:
+        return xref_id in self.rows
+
+    def row_of(self, person: Optional[Person]) -> Optional[int]:
+        """Row of person, or None when this index was not built from that Person object."""
+        return self.graph.row_of(person)
+
+    def event(self, person: Optional[Person], kind: str) -> Optional[LifeEvent]:
+        """person.get_event(kind), read from the index when it holds that event type."""
+        row = self.row_of(person)
+        if row is None or kind not in self._events:
+            return person.get_event(kind) if person else None
+        return self._events[kind][row]
+
+    def latlon(self, person: Optional[Person], kind: str) -> Optional[LatLon]:
+        """The LatLon object of person's kind event ("best" for bestLatLon()), or None."""
+        row = self.row_of(person)
+        if row is not None and kind in self._latlons:
+            return self._latlons[kind][row]
+        if kind == "best":
+            return person.bestLatLon() if person else None
+        event = self.event(person, kind)
+        return event.getattr("latlon") if event else None
+
+    def year(self, person: Optional[Person], kind: str) -> Optional[int]:
+        """The year of person's kind event, or None."""
+        row = self.row_of(person)
+        if row is not None and kind in self.years:
+            return self.year_at(kind, row)
+        if kind == "best":
+            year = self.year(person, "birth")
+            return year if year is not None else self.year(person, "death")
+        return _event_year(self.event(person, kind))
+
+    def has_location(self, person: Optional[Person], kind: str) -> bool:
+        """Whether person's kind location exists and is valid."""
+        row = self.row_of(person)
+        if row is not None and kind in self.lats:
+            return not np.isnan(self.lats[kind][row])
+        return _valid(self.latlon(person, kind))
+
+    def children(self, xref_id: str) -> List[str]:
+        """xref_ids of the children of xref_id that are in the index, in Person.children order."""
+        return [self.ids[child] for child in self.graph.children(self.rows[xref_id])]
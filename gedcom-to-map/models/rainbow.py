@@ -1,4 +1,8 @@
 __all__ = ["Tint", "Rainbow"]
+from typing import Dict, List, Tuple
+
+import numpy as np
+
 from .color import Color
 import logging
 
@@ -39,7 +43,12 @@ class Tint:
 
 
 class Rainbow:
-    """Generates colors in rainbow spectrum order for visual distinction."""
+    """Generates colors in rainbow spectrum order for visual distinction.
+
+    Colors are shared: every coefficient that maps to the same RGB value gets the
+    same Color instance from the rainbow's palette, so Lines do not each carry
+    their own. get_many() colors a whole array of coefficients at once with NumPy.
+    """
 
     def __init__(self) -> None:
         """Initialize Rainbow with predefined color spectrum and tints."""
@@ -57,6 +66,12 @@ class Rainbow:
         ]
         if len(self.steps) == 0:
             raise AssertionError("Rainbow did not initialize")
+        # Start and end RGB of every step, as float arrays for get_many()
+        rgb = np.array([(c.r, c.g, c.b) for c in self.steps], dtype=np.float64)
+        self._step_from: np.ndarray = rgb[:-1]
+        self._step_to: np.ndarray = rgb[1:]
+        # Shared Color instances by (r, g, b); at most a few thousand distinct colors exist
+        self._palette: Dict[Tuple[int, int, int], Color] = {}
 
     @staticmethod
     def merge_color(color_a: Color, color_b: Color, coef: float):
@@ -66,6 +81,12 @@ class Rainbow:
             int(color_a.b * (1 - coef) + color_b.b * coef),
         )
 
+    def _shared(self, rgb: Tuple[int, int, int]) -> Color:
+        color = self._palette.get(rgb)
+        if color is None:
+            color = self._palette[rgb] = Color(*rgb)
+        return color
+
     def get(self, v: float) -> Color:
         if v >= 1 or v < 0:
             # TODO Need to improve this hack
@@ -78,5 +99,33 @@ class Rainbow:
         # Alternate approach
         # pos = v % (1 / len_steps) * len_steps
         pos = (v * len_steps) - step
-        _log.debug(f"coef:{v}  step:{step}   pos:{pos}")
-        return self.merge_color(self.steps[step], self.steps[step + 1], pos)
+        _log.debug("coef:%s  step:%s   pos:%s", v, step, pos)
+        color_a, color_b = self.steps[step], self.steps[step + 1]
+        return self._shared(
+            (
+                int(color_a.r * (1 - pos) + color_b.r * pos),
+                int(color_a.g * (1 - pos) + color_b.g * pos),
+                int(color_a.b * (1 - pos) + color_b.b * pos),
+            )
+        )
+
+    def rgb(self, values) -> np.ndarray:
+        """(r, g, b) rows for an array of coefficients, exactly as get() computes them one at a time."""
+        v = np.asarray(values, dtype=np.float64)
+        out_of_range = (v >= 1) | (v < 0)
+        if out_of_range.any():
+            _log.info("Rainbow coef out of range for %d values", int(out_of_range.sum()))
+            v = np.where(out_of_range, np.mod(v, 1.0), v)
+        len_steps = len(self.steps) - 1
+        scaled = v * len_steps
+        step = scaled.astype(np.int64)
+        pos = (scaled - step)[:, None]
+        return (self._step_from[step] * (1 - pos) + self._step_to[step] * pos).astype(np.int64)
+
+    def get_many(self, values) -> List[Color]:
+        """get() for every coefficient in values, computed in one pass; equal colors are the same instance."""
+        rgb = self.rgb(np.ravel(values))
+        packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+        keys, inverse = np.unique(packed, return_inverse=True)
+        colors = [self._shared((key >> 16, (key >> 8) & 0xFF, key & 0xFF)) for key in keys.tolist()]
+        return [colors[i] for i in inverse.tolist()]
@@ -0,0 +1,64 @@
+from models import Creator, CreatorTrace, LifetimeCreator, Person
+from models.budget import TraversalBudget
+
+
+def _binary_tree(generations):
+    # I1 is the root; person In has father I(2n) and mother I(2n+1)
+    count = 2 ** (generations + 1) - 1
+    people = {f"I{n}": Person(f"I{n}") for n in range(1, count + 1)}
+    for n in range(1, 2**generations):
+        people[f"I{n}"].father = f"I{2 * n}"
+        people[f"I{n}"].mother = f"I{2 * n + 1}"
+    return people
+
+
+def test_budget_plan_keeps_whole_generations():
+    budget = TraversalBudget(max_lines=10)
+    budget.plan([1, 2, 4, 8, 16])
+    assert budget.generation_limit == 2
+    budget = TraversalBudget(max_generations=1, max_lines=100)
+    budget.plan([1, 2, 4])
+    assert budget.generation_limit == 1
+    assert [budget.take() for _ in range(3)] == [True] * 3 and budget.room() == 97
+
+
+def test_generation_counts_follow_every_path():
+    people = {xref: Person(xref) for xref in ("I1", "I2", "I3", "I4")}
+    people["I1"].father, people["I1"].mother = "I2", "I3"
+    people["I2"].father = people["I3"].father = "I4"
+    dag = Creator(people).build_dag("I1")
+    assert dag.generation_counts(lambda node: 1) == [1, 2, 2]
+    assert dag.generation_counts(lambda node: 1, max_generation=1) == [1, 2]
+    assert dag.generation_counts(lambda node: 1, stop_after=2) == [1, 2]
+
+
+def test_max_generations_cuts_every_branch_at_the_same_depth():
+    creator = LifetimeCreator(_binary_tree(4), max_generations=2)
+    lines = creator.create("I1")
+    assert max(len(line.path) for line in lines) == 2
+    assert {line.path for line in lines if len(line.path) == 2} == {"FF", "FM", "MF", "MM"}
+    assert creator.budget.cut_branches == 4 and creator.budget.truncated
+
+
+def test_max_lines_is_breadth_fair():
+    lines = LifetimeCreator(_binary_tree(4), max_lines=10).create("I1")
+    # Generations 0-2 make 1 + 2 + 4 life lines; generation 3 would add 8 more
+    assert len(lines) == 7
+    assert {line.person.xref_id for line in lines} == {f"I{n}" for n in range(1, 8)}
+
+    trace = CreatorTrace(_binary_tree(4), max_lines=5)
+    assert sorted(line.path for line in trace.create("I1")) == ["F", "M"]
+    assert "beyond generation 1" in trace.budget.summary()
+
+
+def test_max_lines_caps_createothers():
+    people = _binary_tree(2)
+    people.update({f"X{n}": Person(f"X{n}") for n in range(5)})
+    creator = LifetimeCreator(people, max_lines=9)
+    lines = list(creator.iter_create("I1", others=True))
+    assert len(lines) == 9
+    assert creator.budget.dropped_people == 3
+    assert "3 more people not added" in creator.budget.summary()
+
+    unlimited = LifetimeCreator(people).create("I1")
+    assert len(unlimited) == 7 and not LifetimeCreator(people).budget.limited
@@ -1,5 +1,5 @@
 import pytest
-from models import Creator, Person, LatLon, Line, Color
+from models import Creator, CreatorTrace, LifetimeCreator, Person, LatLon, Line, Color
 
 
 def test_creator_init():
@@ -23,7 +23,163 @@ def test_creator_line_method():
         pytest.skip(f"Creator.line raised {e}, possibly due to missing setup.")
 
 
+def _collapsed_people():
+    # I1's parents are half-siblings sharing father I4, so I4 is reached twice
+    people = {xref: Person(xref) for xref in ("I1", "I2", "I3", "I4")}
+    people["I1"].father = "I2"
+    people["I1"].mother = "I3"
+    people["I2"].father = "I4"
+    people["I3"].father = "I4"
+    return people
+
+
 def test_creator_has_gpstype():
     people = {}
     creator = Creator(people)
     assert hasattr(creator, "gpstype")
+
+
+class DummyEvent:
+    def __init__(self, year, latlon):
+        self.date = type("Date", (), {"year_num": year})()
+        self.latlon = latlon
+
+    def getattr(self, attr):
+        if attr == "when_year_num":
+            return self.date.year_num
+        return self.latlon if attr == "latlon" else None
+
+
+class DummyPerson:
+    def __init__(self, xref_id, birth, death, father=None, mother=None, children=()):
+        self.xref_id = xref_id
+        self.name = xref_id
+        self.events = {"birth": birth, "death": death}
+        self.father = father
+        self.mother = mother
+        self.children = list(children)
+
+    def get_event(self, kind):
+        return self.events.get(kind)
+
+    def get_events(self, kind):
+        return [self.events[kind]] if self.events.get(kind) else []
+
+    def bestLatLon(self):
+        return self.events["birth"].latlon
+
+
+def _family():
+    def person(xref_id, lat, **family):
+        return DummyPerson(
+            xref_id, DummyEvent(1900, LatLon(lat, 0.5)), DummyEvent(1960, LatLon(lat + 1, 1.5)), **family
+        )
+
+    return {
+        "I1": person("I1", 50.0, father="I2", mother="I3"),
+        "I2": person("I2", 51.0, children=["I1"]),
+        "I3": person("I3", 52.0, children=["I1"]),
+        "I4": person("I4", 53.0),
+    }
+
+
+def _summary(lines):
+    return [
+        (line.person.xref_id, line.path, line.fromlocation.lat, line.tolocation and line.tolocation.lat)
+        for line in lines
+    ]
+
+
+def test_creator_create_multi_returns_lines_per_gpstype():
+    people = _family()
+    result = Creator(people).create_multi("I1", ["birth", "death"])
+    assert set(result) == {"birth", "death"}
+    for gpstype in ("birth", "death"):
+        expected = Creator(people, gpstype=gpstype).create("I1")
+        assert len(result[gpstype]) == 3
+        assert _summary(result[gpstype]) == _summary(expected)
+        # Colored with Rainbow.get_many(), as get() colors each of create()'s Lines
+        assert [line.color.to_hexa() for line in result[gpstype]] == [line.color.to_hexa() for line in expected]
+    # Each parent's line runs from the child's event to the parent's event of that type
+    assert _summary(result["birth"]) == [("I2", "F", 50.0, 51.0), ("I3", "M", 50.0, 52.0), ("I1", "", 50.0, 50.0)]
+    assert _summary(result["death"]) == [("I2", "F", 51.0, 52.0), ("I3", "M", 51.0, 53.0), ("I1", "", 51.0, 51.0)]
+
+    # The unrelated I4 is added to both types, as createothers() adds it to each on its own
+    Creator(people).createothers_multi(result)
+    for gpstype in ("birth", "death"):
+        expected = Creator(people, gpstype=gpstype).create("I1")
+        Creator(people, gpstype=gpstype).createothers(expected)
+        assert len(result[gpstype]) == 4 and result[gpstype][-1].person.xref_id == "I4"
+        assert _summary(result[gpstype]) == _summary(expected)
+    with pytest.raises(IndexError):
+        Creator(people).create_multi("missing", ["birth"])
+
+
+class DummyProgress:
+    def __init__(self):
+        self.state = ""
+        self.counter = 0
+        self.target = 0
+        self.stop = False
+
+    def should_stop(self):
+        return self.stop
+
+
+def test_createothers_adds_missing_people_once():
+    people = _collapsed_people()
+    people["I5"] = Person("I5")
+    progress = DummyProgress()
+    creator = CreatorTrace(people, svc_progress=progress)
+    lines = creator.create("I2")
+    creator.createothers(lines)
+    xrefs = [line.person.xref_id for line in lines]
+    assert sorted(xrefs) == ["I1", "I2", "I3", "I4", "I5"]
+    assert progress.target == progress.counter == len(people)
+
+
+def test_iter_create_streams_create_and_createothers():
+    people = _collapsed_people()
+    people["I5"] = Person("I5")
+
+    def key(line):
+        return line.name, line.path, line.branch, line.prof, line.person.xref_id
+
+    for creator_cls in (Creator, CreatorTrace, LifetimeCreator):
+        expected = creator_cls(people).create("I1")
+        assert [key(line) for line in creator_cls(people).iter_create("I1")] == [key(line) for line in expected]
+
+        creator = creator_cls(people)
+        expected = creator.create("I1")
+        creator.createothers(expected)
+        stream = creator_cls(people).iter_create("I1", others=True)
+        assert not isinstance(stream, list)
+        assert [key(line) for line in stream] == [key(line) for line in expected]
+
+    # A missing starting person is reported when the stream is requested, not when it is read
+    with pytest.raises(IndexError):
+        LifetimeCreator(people).iter_create("missing")
+
+
+def test_creator_multi_traversal_stops_when_asked():
+    def person(xref_id, **family):
+        return DummyPerson(xref_id, DummyEvent(1900, LatLon(50.0, 0.5)), DummyEvent(1960, LatLon(51.0, 1.5)), **family)
+
+    # A 500 generation line of fathers, then 2,000 people outside it
+    people = {f"I{n}": person(f"I{n}", father=f"I{n + 1}" if n < 499 else None) for n in range(500)}
+    people.update({f"X{n}": person(f"X{n}") for n in range(2000)})
+    progress = DummyProgress()
+    creator = Creator(people, svc_progress=progress)
+    assert len(creator.create_multi("I0", ["birth", "death"])["birth"]) == 500 and not creator.stopped
+
+    progress.stop = True
+    result = creator.create_multi("I0", ["birth", "death"])
+    assert creator.stopped
+    assert all(len(lines) < 500 for lines in result.values())
+
+    progress.stop = False
+    result = creator.create_multi("I0", ["birth", "death"])
+    progress.stop = True
+    creator.createothers_multi(result)
+    assert creator.stopped
+    assert all(500 < len(lines) <= 1500 for lines in result.values())
@@ -0,0 +1,70 @@
+import numpy as np
+
+from models import Creator, CreatorTrace, FamilyGraph, Person, PersonIndex
+from models.family_graph import NO_ROW
+
+
+class DummyPerson:
+    def __init__(self, xref_id, father=None, mother=None, children=(), partners=()):
+        self.xref_id = xref_id
+        self.name = xref_id
+        self.father = father
+        self.mother = mother
+        self.children = list(children)
+        self.partners = list(partners)
+
+
+def _people():
+    # I1's parents I2/I3 share mother I5; I4 is a father missing from people
+    return {
+        "I1": DummyPerson("I1", "I2", "I3"),
+        "I2": DummyPerson("I2", "I4", "I5", children=["I1"], partners=["I3"]),
+        "I3": DummyPerson("I3", None, "I5", children=["I1"], partners=["I2", "I9"]),
+        "I5": DummyPerson("I5", children=["I2", "I3"]),
+        "I6": DummyPerson("I6"),
+    }
+
+
+def test_family_graph_rows_and_csr():
+    people = _people()
+    graph = FamilyGraph(people)
+    assert graph.ids == ["I1", "I2", "I3", "I5", "I6"] and len(graph) == 5 and "I5" in graph
+    np.testing.assert_array_equal(graph.father, [1, NO_ROW, NO_ROW, NO_ROW, NO_ROW])
+    np.testing.assert_array_equal(graph.mother, [2, 3, 3, NO_ROW, NO_ROW])
+    np.testing.assert_array_equal(graph.child_offsets, [0, 0, 1, 2, 4, 4])
+    assert graph.children(3).tolist() == [1, 2]
+    assert graph.partners(2).tolist() == [1]
+    assert graph.parents(0) == (1, 2)
+    assert graph.person(3) is people["I5"]
+    assert graph.row_of(people["I3"]) == 2
+    assert graph.row_of(DummyPerson("I3")) is None
+
+
+def test_family_graph_whole_tree_queries():
+    graph = FamilyGraph(_people())
+    assert np.flatnonzero(graph.ancestors(0)).tolist() == [0, 1, 2, 3]
+    assert np.flatnonzero(graph.ancestors(4)).tolist() == [4]
+    child, parent, is_father = graph.parent_links()
+    assert list(zip(child.tolist(), parent.tolist(), is_father.tolist())) == [
+        (0, 1, True),
+        (0, 2, False),
+        (1, 3, False),
+        (2, 3, False),
+    ]
+
+
+def test_creators_walk_graph_rows_like_xrefs():
+    # I1's parents are half-siblings sharing father I4
+    people = {xref: Person(xref) for xref in ("I1", "I2", "I3", "I4")}
+    people["I1"].father, people["I1"].mother = "I2", "I3"
+    people["I2"].father = people["I3"].father = "I4"
+    index = PersonIndex(people)
+
+    def shape(node):
+        return node and (node.xref_id, shape(node.father), shape(node.mother))
+
+    assert shape(Creator(people, person_index=index).build_dag("I1").root) == shape(
+        Creator(people).build_dag("I1").root
+    )
+    traced = [(line.person.xref_id, line.path) for line in CreatorTrace(people, person_index=index).create("I1")]
+    assert traced == [(line.person.xref_id, line.path) for line in CreatorTrace(people).create("I1")]
@@ -0,0 +1,17 @@
+from models import LifetimeCreator, Person
+
+
+def test_lifetime_creator_caches_life_line_payload_per_person(caplog):
+    # I4 is both I1's mother and I2's father, so with max_missing it gets two nodes
+    people = {xref: Person(xref) for xref in ("I1", "I2", "I4")}
+    people["I1"].father = "I2"
+    people["I1"].mother = "I4"
+    people["I2"].father = "I4"
+    creator = LifetimeCreator(people, max_missing=3)
+    with caplog.at_level("INFO", logger="models.creator"):
+        lines = creator.create("I1")
+    assert len({key for key in creator.dag.nodes if key[0] == "I4"}) == 2
+    assert (creator.lifeline_cache_hits, creator.lifeline_cache_misses) == (1, 3)
+    assert "Life line cache: 1 hits, 3 misses" in caplog.text
+    life_lines = [line for line in lines if line.style == "Life" and line.person.xref_id == "I4"]
+    assert len(life_lines) == 2 and life_lines[0].midpoints is life_lines[1].midpoints
@@ -0,0 +1,54 @@
+import pytest
+
+from models import Color, LatLon, Line, LineCache, LineStore, Person, PersonIndex
+
+
+def _lines(count=3):
+    person = Person("I1")
+    return [
+        Line(f"line {i}", LatLon(i, i), LatLon(i + 1, i), Color(), "F" * i, i, i, person=person) for i in range(count)
+    ]
+
+
+def test_line_cache_evicts_least_recently_used():
+    cache = LineCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and len(cache) == 2
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        LineCache(maxsize=0)
+
+
+def test_line_cache_records_fully_read_streams_only():
+    cache = LineCache()
+    lines = _lines()
+    stream = cache.record("key", iter(lines))
+    next(stream)
+    assert "key" not in cache
+    assert len(list(stream)) == 2
+    stored = cache.get("key")
+    assert isinstance(stored, LineStore)
+    assert [(view.name, view.path) for view in stored] == [(line.name, line.path) for line in lines]
+
+
+def test_line_cache_key_includes_people_fingerprint():
+    people = {"I1": Person("I1"), "I2": Person("I2")}
+    people["I1"].father = "I2"
+    fingerprint = PersonIndex(people).fingerprint()
+    assert fingerprint == PersonIndex(dict(people)).fingerprint()
+    people["I1"].father = None
+    assert PersonIndex(people).fingerprint() != fingerprint
+    people["I1"].father = "I2"
+    people["I2"].name = "Renamed"
+    assert PersonIndex(people).fingerprint() != fingerprint
+
+    key = LineCache.key("LifetimeCreator", "I1", 0, False, fingerprint)
+    assert key == LineCache.key("LifetimeCreator", "I1", 0, False, fingerprint)
+    assert key != LineCache.key("LifetimeCreator", "I1", 1, False, fingerprint)
+    assert key != LineCache.key("Creator", "I1", 0, False, fingerprint, gpstypes=["birth"])
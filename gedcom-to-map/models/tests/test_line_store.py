@@ -0,0 +1,116 @@
+import gc
+import tracemalloc
+
+import pytest
+from models import Color, LatLon, LifeEvent, Line, LineStore, LineView, Person
+
+ATTRIBUTES = (
+    "name",
+    "fromlocation",
+    "tolocation",
+    "color",
+    "path",
+    "branch",
+    "prof",
+    "style",
+    "parentofperson",
+    "midpoints",
+    "person",
+    "whenFrom",
+    "whenTo",
+    "tag",
+    "linetype",
+)
+
+
+def _lines():
+    father = Person("I2")
+    child = Person("I1")
+    here = LatLon(51.5, -0.1)
+    there = LatLon(52.0, 0.1)
+    homes = [LifeEvent("Home", 1900, there, "home")]
+    return [
+        Line(f"{'':8}\t{child.name}", here, there, Color(255, 0, 0), "", 0, 0, "Life", None, homes, child, 1880, 1950),
+        Line(f"{'F':8}\t{father.name}", there, None, Color(255, 0, 0), "F", 2.5, 1, "father", child, None, father),
+        Line(
+            "custom name", None, here, None, "FM", 7.75, 2.5, person=father, tag="t", linetype="life", midpoints=homes
+        ),
+    ]
+
+
+def test_line_store_round_trips_line_attributes():
+    lines = _lines()
+    store = LineStore(lines)
+    assert len(store) == 3
+    for line, view in zip(lines, store):
+        assert isinstance(view, LineView)
+        for attribute in ATTRIBUTES:
+            assert getattr(view, attribute) == getattr(line, attribute), attribute
+    assert store[-1].name == "custom name"
+    assert [view.path for view in store[1:]] == ["F", "FM"]
+    with pytest.raises(IndexError):
+        store[3]
+
+
+def test_line_store_shares_colors_and_midpoints():
+    lines = _lines()
+    store = LineStore(lines)
+    assert store[0].color is store[1].color
+    assert store[0].midpoints[0] is store[2].midpoints[0]
+    assert len(store._mid_events) == 1
+
+
+def test_line_view_parent_matches_line_without_a_parent():
+    person = Person("I1")
+    lines = [
+        Line("a", None, None, None, "", 0, 0, person=person),
+        Line("b", None, None, None, "", 0, 0, parentofperson="", person=person),
+    ]
+    store = LineStore(lines)
+    assert [view.parentofperson for view in store] == [line.parentofperson for line in lines] == [None, ""]
+
+
+def test_line_view_update_when_writes_to_store():
+    store = LineStore(_lines())
+    view = store[1]
+    view.updateWhen(1850)
+    view.updateWhenTo(1920)
+    assert (store[1].whenFrom, store[1].whenTo) == (1850, 1920)
+    view.updateWhen(1860)
+    assert store[1].whenFrom == 1850
+
+
+def test_line_store_is_at_least_five_times_smaller():
+    # Pedigree collapse: the same few people reached along many paths
+    people = [Person(f"I{i}") for i in range(20)]
+    places = [LatLon(float(i), float(i)) for i in range(20)]
+
+    def make_lines():
+        for i in range(5000):
+            path = "".join("FM"[(i >> bit) & 1] for bit in range(12))
+            person = people[i % 20]
+            color = Color(i % 256, 0, 0)
+            yield Line(
+                f"{path:8}\t{person.name}",
+                places[i % 20],
+                places[(i + 1) % 20],
+                color,
+                path,
+                i * 2.5,
+                12,
+                person=person,
+            )
+
+    def traced(build):
+        gc.collect()
+        tracemalloc.start()
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return result, size
+
+    lines, list_size = traced(lambda: list(make_lines()))
+    store, store_size = traced(lambda: LineStore(make_lines()))
+    assert len(store) == len(lines)
+    assert list_size >= 5 * store_size
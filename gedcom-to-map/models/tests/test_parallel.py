@@ -0,0 +1,7 @@
+from models.parallel import resolve_workers
+
+
+def test_resolve_workers():
+    assert resolve_workers(0) == 0
+    assert resolve_workers(3) == 3
+    assert resolve_workers(-1) >= 1
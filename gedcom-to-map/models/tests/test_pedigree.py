@@ -0,0 +1,49 @@
+from models import Creator, CreatorTrace, LifetimeCreator, PedigreeDAG, Person
+from models.pedigree import node_key
+
+
+def _collapsed_people():
+    # I1's parents are half-siblings sharing father I4, so I4 is reached twice
+    people = {xref: Person(xref) for xref in ("I1", "I2", "I3", "I4")}
+    people["I1"].father = "I2"
+    people["I1"].mother = "I3"
+    people["I2"].father = "I4"
+    people["I3"].father = "I4"
+    return people
+
+
+def test_node_key_shares_nodes_unless_missing_limit_applies():
+    assert node_key("I1", 3, True, 2) == ("I1", 0)
+    assert node_key("I1", 3, False, 0) == ("I1", 0)
+    assert node_key("I1", 1, False, 2) == ("I1", 1)
+
+
+def test_build_dag_shares_collapsed_ancestor():
+    people = _collapsed_people()
+    dag = Creator(people).build_dag("I1")
+    assert isinstance(dag, PedigreeDAG)
+    assert len(dag) == 4
+    assert dag.unique_people() == 4
+    assert dag.root.father.father is dag.root.mother.father
+    assert dag.path_counts() == {"I1": 1, "I2": 1, "I3": 1, "I4": 2}
+
+
+def test_lifetime_creator_collapse_emits_each_person_once():
+    people = _collapsed_people()
+    every_path = LifetimeCreator(people).create("I1")
+    collapsed = LifetimeCreator(people, collapse_pedigree=True).create("I1")
+    assert len(every_path) == 5
+    assert len(collapsed) == 4
+    assert sorted(line.person.xref_id for line in collapsed) == ["I1", "I2", "I3", "I4"]
+
+
+def test_deep_chain_does_not_hit_recursion_limit():
+    depth = 5000
+    people = {f"I{i}": Person(f"I{i}") for i in range(depth)}
+    for i in range(depth - 1):
+        people[f"I{i}"].father = f"I{i + 1}"
+
+    dag = Creator(people).build_dag("I0")
+    assert dag.unique_people() == depth
+    assert len(LifetimeCreator(people).create("I0")) >= depth
+    assert len(CreatorTrace(people).create("I0")) == depth - 1
@@ -0,0 +1,83 @@
+import numpy as np
+
+from models import LatLon, PersonIndex
+from models.person_index import NO_YEAR
+
+
+class DummyEvent:
+    def __init__(self, year, latlon):
+        self.date = type("Date", (), {"year_num": year})()
+        self.latlon = latlon
+
+    def getattr(self, attr):
+        return self.latlon if attr == "latlon" else None
+
+
+class DummyPerson:
+    def __init__(self, xref_id, birth=None, death=None, father=None, mother=None, children=()):
+        self.xref_id = xref_id
+        self.name = xref_id
+        self.events = {"birth": birth, "death": death}
+        self.father = father
+        self.mother = mother
+        self.children = list(children)
+
+    def get_event(self, kind):
+        return self.events.get(kind)
+
+    def bestLatLon(self):
+        for event in self.events.values():
+            if event and event.latlon:
+                return event.latlon
+        return LatLon(None, None)
+
+
+def _people():
+    home = LatLon(51.5, -0.1)
+    return {
+        "I1": DummyPerson("I1", DummyEvent(1900, home), DummyEvent(1970, LatLon(52.0, 1.0)), "I2", "I3"),
+        "I2": DummyPerson("I2", death=DummyEvent(1950, LatLon(48.0, 2.0)), children=["I1", "I9"]),
+        "I3": DummyPerson("I3", DummyEvent(None, None), children=["I1"]),
+    }
+
+
+def test_person_index_columns():
+    people = _people()
+    index = PersonIndex(people)
+    assert index.ids == ["I1", "I2", "I3"] and len(index) == 3 and "I2" in index
+    np.testing.assert_array_equal(index.lats["birth"], [51.5, np.nan, np.nan])
+    np.testing.assert_array_equal(index.lons["death"], [1.0, 2.0, np.nan])
+    np.testing.assert_array_equal(index.years["birth"], [1900, NO_YEAR, NO_YEAR])
+    # Best: bestLatLon(), and the birth year falling back to the death year
+    np.testing.assert_array_equal(index.lats["best"], [51.5, 48.0, np.nan])
+    np.testing.assert_array_equal(index.years["best"], [1900, 1950, NO_YEAR])
+    np.testing.assert_array_equal(index.father, [1, -1, -1])
+    np.testing.assert_array_equal(index.mother, [2, -1, -1])
+    assert index.children("I2") == ["I1"]
+    assert index.children("I1") == []
+
+
+def test_person_index_accessors_match_events():
+    people = _people()
+    index = PersonIndex(people)
+    for person in people.values():
+        for kind in ("birth", "death"):
+            event = person.get_event(kind)
+            assert index.event(person, kind) is event
+            assert index.latlon(person, kind) is (event.getattr("latlon") if event else None)
+            assert index.year(person, kind) == (event.date.year_num if event else None)
+    assert index.latlon(people["I2"], "best") is people["I2"].bestLatLon()
+    assert index.has_location(people["I1"], "birth")
+    assert not index.has_location(people["I3"], "birth")
+
+
+def test_empty_person_index_reads_events():
+    people = _people()
+    index = PersonIndex()
+    stranger = DummyPerson("I1", DummyEvent(1800, LatLon(1.0, 2.0)))
+    assert index.year(people["I1"], "birth") == 1900
+    assert index.latlon(people["I2"], "death") is people["I2"].get_event("death").latlon
+    assert index.year(people["I2"], "best") == 1950
+    assert index.event(None, "birth") is None
+    # A Person the index was not built from is read directly, even if its xref_id is indexed
+    assert PersonIndex(people).year(stranger, "birth") == 1800
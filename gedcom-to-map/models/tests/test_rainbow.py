@@ -29,3 +29,19 @@ def test_rainbow_merge_color():
     assert isinstance(merged, Color)
     # Should be a blend (not equal to either endpoint)
     assert merged != c1 and merged != c2
+
+
+def test_rainbow_get_shares_color_instances():
+    rb = Rainbow()
+    assert rb.get(0.5) is rb.get(0.5)
+    assert rb.get(0.5) == rb.merge_color(rb.steps[4], rb.steps[5], 0.5)
+
+
+def test_rainbow_get_many_matches_get():
+    rb = Rainbow()
+    values = [0.0, 0.1234, 0.5, 0.999, 1.0, 1.75, -0.25, 3.3e-7, 2.5 / 2.5**12]
+    colors = rb.get_many(values)
+    reference = Rainbow()
+    assert [(c.r, c.g, c.b) for c in colors] == [(c.r, c.g, c.b) for c in map(reference.get, values)]
+    assert colors[0] is rb.get(0.0) and colors[4] is colors[0]
+    assert rb.get_many([]) == []
@@ -1,8 +1,14 @@
 """Folium subpackage: Interactive HTML map generation using Folium library.
 
 Provides utilities for generating interactive HTML maps with genealogical overlays:
+    - DensityOverlay: Static heatmap rendered to images during export
+    - GeoJsonLayers: Markers and lines as one GeoJSON layer per feature group
+    - LazyGeoJsonLayers: GeoJSON layers loaded from sidecar files when shown
+    - IconRegistry: Marker icons created once and shared by the markers
     - Legend: Map legend generation
+    - IntervalHeatMapWithTime: Timeline heatmap built in the browser from year intervals
     - MyMarkClusters: Clustered marker management
+    - ZoomClusterLayer: Markers clustered per zoom level during export
     - foliumExporter: Main HTML map exporter
     - NameProcessor: Place name formatting and standardization
 
@@ -12,14 +18,25 @@ Usage:
     >>> map_obj.save('output.html')
 """
 
+from .density_overlay import DensityOverlay
+from .geojson_layers import GeoJsonLayers, LazyGeoJsonLayers
+from .icon_registry import IconRegistry
+from .interval_heatmap import IntervalHeatMapWithTime
 from .legend import Legend
 from .mark_clusters import MyMarkClusters
+from .zoom_clusters import ZoomClusterLayer
 from .folium_exporter import foliumExporter
 from .name_processor import NameProcessor
 
 __all__ = [
+    "DensityOverlay",
+    "GeoJsonLayers",
+    "LazyGeoJsonLayers",
+    "IconRegistry",
+    "IntervalHeatMapWithTime",
     "Legend",
     "MyMarkClusters",
+    "ZoomClusterLayer",
     "foliumExporter",
     "NameProcessor",
 ]
@@ -16,12 +16,3 @@ MidPointMarker = {
     "Arrival": ("ship", "darkgreen", True),
     "Other": ("shoe-prints", "lightgray", True),
 }
-
-icon_create_function = """\
-function(cluster) {
-    return L.divIcon({
-    html: '<b>' + cluster.getChildCount() + '</b>',
-    className: 'marker-cluster marker-cluster-large',
-    iconSize: new L.Point(20, 20)
-    });
-}"""
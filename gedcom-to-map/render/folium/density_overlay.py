@@ -0,0 +1,209 @@
+"""
+Static heatmap rendered to images during export.
+
+folium's HeatMap hands every point to Leaflet.heat, which redraws its kernel
+over all of them on every pan and zoom, and that gets slow on very large trees.
+DensityOverlay works the density out once in Python instead: the points are
+projected to Web Mercator and counted per pixel of a grid with a NumPy
+histogram, the counts are blurred with a Gaussian kernel of ``radius`` pixels,
+and the result is coloured like Leaflet.heat's default gradient and written
+into the page as a PNG in a folium ImageOverlay.  The counts are shown on a log
+scale, so a place with a few people still shows beside a home town with
+hundreds.
+
+The image is drawn for one zoom level, the deepest at which the points fit in
+``max_size`` pixels.  Further out the blur shrinks with the image, so with
+``bands`` above 1 the overlay is a small pyramid: each band is drawn two zoom
+levels further out than the one before it, at a quarter of its pixels, and a
+short script shows the band made for the current zoom level.
+"""
+
+__all__ = ["DensityOverlay", "GRADIENT", "density_bands"]
+
+import math
+
+import folium
+import numpy as np
+from branca.element import MacroElement, Template
+from folium.raster_layers import ImageOverlay
+
+from .zoom_clusters import TILE_SIZE, mercator, mercator_latitude
+
+GRADIENT = {0.4: (0, 0, 255), 0.6: (0, 255, 255), 0.7: (0, 255, 0), 0.8: (255, 255, 0), 1.0: (255, 0, 0)}
+BAND_ZOOMS = 2  # Zoom levels between the bands of a pyramid
+MAX_ZOOM = 18  # Deepest zoom level an image is drawn for
+
+
+def _blur(grid: np.ndarray, sigma: float) -> np.ndarray:
+    """Gaussian blur of a 2D grid, one axis at a time, with a kernel that peaks at 1."""
+    reach = int(math.ceil(3 * sigma))
+    if reach < 1:
+        return grid
+    kernel = np.exp(-0.5 * (np.arange(-reach, reach + 1) / sigma) ** 2)
+    for axis in (0, 1):
+        size = grid.shape[axis]
+        padded = np.pad(grid, [(reach, reach) if a == axis else (0, 0) for a in (0, 1)])
+        blurred = np.zeros_like(grid)
+        for shift, weight in enumerate(kernel):
+            blurred += weight * (padded[shift : shift + size] if axis == 0 else padded[:, shift : shift + size])
+        grid = blurred
+    return grid
+
+
+def _colorize(density: np.ndarray, gradient: dict, opacity: float) -> np.ndarray:
+    """RGBA pixels of a density grid, scaled to [0, 1], in the colours of the gradient."""
+    stops = sorted(gradient)
+    colors = np.array([gradient[stop] for stop in stops], dtype=float)
+    rgba = np.empty((*density.shape, 4), dtype=np.uint8)
+    for channel in range(3):
+        rgba[..., channel] = np.interp(density, stops, colors[:, channel]).round()
+    # Below the first stop the colour fades out rather than changing
+    rgba[..., 3] = (np.clip(density / stops[0], 0.0, 1.0) * opacity * 255).round()
+    return rgba
+
+
+def density_bands(
+    points: list,
+    radius: int = 15,
+    max_size: int = 1024,
+    bands: int = 1,
+    opacity: float = 0.8,
+    gradient: dict = GRADIENT,
+) -> list[dict]:
+    """
+    Render the density of weighted points to images, one per zoom band.
+    Args:
+        points (list): [lat, lon, weight] of each point, as made by MyMarkClusters.heat().
+        radius (int): Pixels across the Gaussian blur (its standard deviation is half of this).
+        max_size (int): Most pixels across an image, before the blur margin.
+        bands (int): Images drawn, each two zoom levels further out than the one before it.
+        opacity (float): Opacity of the densest pixels.
+        gradient (dict): RGB colour of each density stop in (0, 1].
+    Returns:
+        list: For each band, deepest first, a dict of "image" (RGBA pixels, top row north),
+        "bounds" ([[south, west], [north, east]]), "zoom" (the zoom level it is drawn for),
+        and "min_zoom" and "max_zoom", the zoom levels it is shown at (None where open ended).
+    """
+    if not points:
+        return []
+    lats, lons, weights = (np.array(column, dtype=float) for column in zip(*points))
+    x, y = mercator(lats, lons)
+    extent = max(float(x.max() - x.min()), float(y.max() - y.min()))
+    fit = int(math.floor(math.log2(max_size / (TILE_SIZE * extent)))) if extent > 0 else MAX_ZOOM
+    fit = min(max(fit, 0), MAX_ZOOM)
+    sigma = radius / 2
+    margin = int(math.ceil(3 * sigma))
+
+    images = []
+    for band in range(bands):
+        zoom = fit - band * BAND_ZOOMS
+        if zoom < 0:
+            break
+        cell = 1.0 / (TILE_SIZE * 2**zoom)
+        x0, y0 = x.min() - margin * cell, y.min() - margin * cell
+        columns = int((x.max() - x.min()) / cell) + 2 * margin + 1
+        rows = int((y.max() - y.min()) / cell) + 2 * margin + 1
+        ix = np.minimum(((x - x0) / cell).astype(np.int64), columns - 1)
+        iy = np.minimum(((y - y0) / cell).astype(np.int64), rows - 1)
+        grid = np.bincount(iy * columns + ix, weights=weights, minlength=rows * columns).reshape(rows, columns)
+        grid = _blur(grid, sigma)
+        peak = grid.max()
+        density = np.log1p(np.maximum(grid, 0.0)) / np.log1p(peak) if peak > 0 else grid
+        north, south = mercator_latitude(np.array([y0, y0 + rows * cell]))
+        west, east = (x0 - 0.5) * 360.0, (x0 + columns * cell - 0.5) * 360.0
+        images.append(
+            {
+                "image": _colorize(density, gradient, opacity),
+                "bounds": [[float(south), float(west)], [float(north), float(east)]],
+                "zoom": zoom,
+                "min_zoom": zoom - BAND_ZOOMS + 1,
+                "max_zoom": zoom,
+            }
+        )
+    images[0]["max_zoom"] = None
+    images[-1]["min_zoom"] = None
+    return images
+
+
+class _ZoomBands(MacroElement):
+    """Shows the band of a DensityOverlay made for the current zoom level."""
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            (function(group, bands, map) {
+                function update() {
+                    var zoom = map.getZoom();
+                    bands.forEach(function(band) {
+                        if ((band.min === null || zoom >= band.min) && (band.max === null || zoom < band.max + 1)) {
+                            group.addLayer(band.layer);
+                        } else {
+                            group.removeLayer(band.layer);
+                        }
+                    });
+                }
+                map.on("zoomend", update);
+                update();
+            })({{ this._parent.get_name() }}, [
+                {%- for band in this.bands %}
+                {layer: {{ band.layer.get_name() }}, min: {{ band.min_zoom|tojson }}, max: {{ band.max_zoom|tojson }}},
+                {%- endfor %}
+            ], {{ this._parent._parent.get_name() }});
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, bands: list) -> None:
+        super().__init__()
+        self._name = "ZoomBands"
+        self.bands = bands
+
+
+class DensityOverlay(folium.FeatureGroup):
+    """
+    Heatmap drawn as images made during export, to be added to the map.
+
+    Args:
+        points (list): [lat, lon, weight] of each point, as made by MyMarkClusters.heat().
+        name (str): Name of the layer in the LayerControl.
+        radius (int): Pixels across the Gaussian blur.
+        max_size (int): Most pixels across an image, before the blur margin.
+        bands (int): Images in the zoom pyramid (1 draws a single image).
+        opacity (float): Opacity of the densest pixels.
+        gradient (dict): RGB colour of each density stop in (0, 1].
+        overlay (bool): The layer is an overlay in the LayerControl.
+        control (bool): The layer is in the LayerControl.
+        show (bool): The layer is shown when the map opens.
+    """
+
+    def __init__(
+        self,
+        points: list,
+        name: str | None = None,
+        radius: int = 15,
+        max_size: int = 1024,
+        bands: int = 1,
+        opacity: float = 0.8,
+        gradient: dict = GRADIENT,
+        overlay: bool = True,
+        control: bool = True,
+        show: bool = True,
+    ) -> None:
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self.points = points
+        self.bands = []
+        for band in density_bands(points, radius, max_size, bands, opacity, gradient):
+            band["layer"] = ImageOverlay(band.pop("image"), band["bounds"], pixelated=False, control=False)
+            self.add_child(band["layer"])
+            self.bands.append(band)
+        if len(self.bands) > 1:
+            self.add_child(_ZoomBands(self.bands))
+
+    def _get_self_bounds(self):
+        """
+        Bounds of the points, in the form [[lat_min, lon_min], [lat_max, lon_max]].
+        """
+        if not self.points:
+            return [[None, None], [None, None]]
+        lats, lons = [p[0] for p in self.points], [p[1] for p in self.points]
+        return [[min(lats), min(lons)], [max(lats), max(lons)]]
@@ -9,24 +9,31 @@ import logging
 import math
 import os.path
 from pathlib import Path
+from typing import Iterable
 
-import random
 
 import folium
 import xyzservices.providers as xyz
-from folium.plugins import AntPath, FloatImage, GroupedLayerControl, HeatMapWithTime, MiniMap, Search, MarkerCluster
+from folium.plugins import AntPath, FloatImage, GroupedLayerControl, HeatMapWithTime, MiniMap, Search
 from services.interfaces import IConfig, IState, IProgressTracker
 from models.line import Line
 from geo_gedcom.lat_lon import LatLon
+from render.geometry import jitter, round_point, simplify_line, zoom_tolerance
 from render.referenced import Referenced
 from models.creator import DELTA
+from models.person_index import PersonIndex
+from .density_overlay import DensityOverlay
+from .geojson_layers import GeoJsonLayers, LazyGeoJsonLayers
+from .icon_registry import IconRegistry
+from .interval_heatmap import IntervalHeatMapWithTime
 from .legend import Legend
-from .mark_clusters import MyMarkClusters
+from .mark_clusters import HEAT_PRECISION, MyMarkClusters
+from .zoom_clusters import ZoomClusterLayer
 from .name_processor import NameProcessor
 
 # Import constants and utilities
-from .constants import lgd_txt, MidPointMarker, icon_create_function
-from .marker_utils import Drift, add_point_marker
+from .constants import lgd_txt, MidPointMarker
+from .marker_utils import add_point_marker
 from .polyline_utils import add_polyline
 from .heatmap_utils import normalize_heat_data
 
@@ -51,15 +58,22 @@ class foliumExporter:
     Attributes:
         file_name (str): Output HTML file path.
         max_line_weight (int): Maximum line weight for polylines.
+        coordinate_precision (int): Decimal places of the coordinates written (0 = unrounded).
+        simplify_zoom (int): Zoom level the polylines are simplified for (0 = not simplified).
         svc_config (IConfig): Configuration service.
         svc_state (IState): Runtime state service.
         svc_progress (IProgressTracker): Progress tracking service.
         fglastname (dict): Feature groups by last name.
         saveresult (bool): Whether to save the result.
         fm (folium.Map): The Folium map instance.
-        locations (list): List of marker locations.
-        popups (list): List of popup contents.
+        locations (list): Marker locations clustered per zoom level (ClusterMarkers).
+        popups (list): Popup HTML of the clustered markers.
         soundexLast (bool): Whether to use Soundex for grouping.
+        icons (IconRegistry | None): The shared marker icons of the map being exported.
+        geojson (GeoJsonLayers | None): Collects markers and lines as GeoJSON features (UseGeoJson), written to
+            sidecar files loaded on demand with LazyLayers, else None. With SharedPopups their popups
+            reference its people table.
+        person_index (PersonIndex): Events, locations and years of the people (svc_state.person_index).
     """
 
     def __init__(self, svc_config: IConfig, svc_state: IState, svc_progress: IProgressTracker):
@@ -76,12 +90,27 @@ class foliumExporter:
         self.svc_progress = svc_progress
         self.file_name = os.path.join(svc_config.get("resultpath"), svc_config.get("ResultFile"))
         self.max_line_weight = svc_config.get("MaxLineWeight")
+        self.coordinate_precision: int = svc_config.get("CoordinatePrecision") or 0
+        self.simplify_zoom: int = svc_config.get("SimplifyZoom") or 0
         self.fglastname: dict[str, FeatureGroupInfo] = dict()
         self.saveresult = False
         self.fm = None
         self.locations = []
         self.popups = []
         self.soundexLast = svc_config.get("GroupBy") == 2
+        self.person_index: PersonIndex = self._state_person_index()
+        self.icons: IconRegistry | None = None
+        self.geojson: GeoJsonLayers | None = None
+        shared_popups = bool(svc_config.get("SharedPopups"))
+        if svc_config.get("LazyLayers"):
+            self.geojson = LazyGeoJsonLayers(self.file_name, shared_popups)
+        elif svc_config.get("UseGeoJson"):
+            self.geojson = GeoJsonLayers(shared_popups)
+
+    def _state_person_index(self) -> PersonIndex:
+        """The loaded PersonIndex, or an empty one (which reads the events) if there is none."""
+        index = getattr(self.svc_state, "person_index", None)
+        return index if index is not None else PersonIndex()
 
     def _create_marker_options(self, line) -> dict:
         """Generate marker and line options based on line style"""
@@ -132,13 +161,50 @@ class foliumExporter:
             fancy_name = f"{fancy_name}<br>{birth_info} {death_info}"
 
         popup = f"<div style='min-width: 150px'>{fancy_name}</div>"
-        if line.person.photo:
-            # Replace backslashes with forward slashes to avoid JavaScript escape issues
-            # Forward slashes work in HTML on all platforms (Windows, Mac, Linux)
-            photo_path = line.person.photo.replace("\\", "/")
+        photo_path = self._photo_path(line.person)
+        if photo_path:
             popup += f"<img src='{photo_path}' width='150'>"
         return popup
 
+    def _photo_path(self, person) -> str | None:
+        """The person's photo as a URL, or None if there is none"""
+        if not person.photo:
+            return None
+        # Replace backslashes with forward slashes to avoid JavaScript escape issues
+        # Forward slashes work in HTML on all platforms (Windows, Mac, Linux)
+        return person.photo.replace("\\", "/")
+
+    def _create_popup_reference(self, line, birth_info: str = "", death_info: str = "") -> dict:
+        """
+        Generate the popup of a line as a reference to the people table of the GeoJSON layers (SharedPopups),
+        adding the people it names to the table.
+        """
+        person = line.person
+        years = f"{birth_info} {death_info}" if birth_info or death_info else ""
+        self.geojson.add_person(person.xref_id, self._pureName(line.name), years, self._photo_path(person))
+        reference = {"pid": person.xref_id, "rel": line.style}
+        if line.style != "Life" and line.parentofperson:
+            parent = line.parentofperson
+            if parent.xref_id not in self.geojson.people:
+                # Only the name is shown, until the parent's own line fills in the rest
+                self.geojson.add_person(parent.xref_id, parent.name, "", None)
+            reference["of"] = parent.xref_id
+        return reference
+
+    def _marked_popup(self, popup: str | dict, mark: str) -> str | dict:
+        """The popup of a birth or death marker: the line's popup followed by the mark"""
+        if isinstance(popup, dict):
+            return {**popup, "mark": mark}
+        return popup + "\n" + mark
+
+    def _life_info(self, person) -> tuple[str, str]:
+        """The birth and death text of a popup"""
+        birth_year_num = self.person_index.year(person, "birth")
+        death_year_num = self.person_index.year(person, "death")
+        birth_info = f"{birth_year_num} (Born)" if birth_year_num else ""
+        death_info = f"{death_year_num} (Died)" if death_year_num else ""
+        return birth_info, death_info
+
     def Done(self):
         """Finalize and save the map."""
         if self.saveresult:
@@ -175,18 +241,20 @@ class foliumExporter:
         """Process timeline data for a single line and return min/max years"""
         minyear = maxyear = None
 
+        index = self.person_index
+        person = line.person
+
         # Add birth location if available
-        birth_event = line.person.get_event("birth") if line.person else None
-        birth_latlon = birth_event.getattr("latlon") if birth_event else None
-        birth_year_num = birth_event.getattr("when_year_num") if birth_event else None
+        birth_event = index.event(person, "birth")
+        birth_latlon = index.latlon(person, "birth")
+        birth_year_num = index.year(person, "birth")
 
         if birth_event and birth_latlon and birth_year_num:
             mycluster.mark(birth_latlon, birth_year_num)
             minyear = birth_year_num
 
         # Add death year if available
-        death_event = line.person.get_event("death") if line.person else None
-        death_year_num = death_event.getattr("when_year_num") if death_event else None
+        death_year_num = index.year(person, "death")
         if death_year_num:
             maxyear = death_year_num
         else:
@@ -202,77 +270,64 @@ class foliumExporter:
         return minyear, maxyear
 
     def _build_yearly_positions(self, line: Line, minyear: int, maxyear: int, mycluster: MyMarkClusters) -> None:
-        """Build position data for each year in the timeline"""
+        """Mark the position held in each year of the timeline, a span at a time"""
         if not (minyear and maxyear):
             return
 
-        birth_event = line.person.get_event("birth") if line.person else None
-        birth_latlon = birth_event.getattr("latlon") if birth_event else None
-        activepos = birth_latlon
+        # The position changes to a midpoint's location in its year (the last one listed for that year)
+        changes = {}
+        for mids in line.midpoints:
+            mids_year = mids.year if hasattr(mids, "year") else None
+            if isinstance(mids_year, (int, float)) and minyear <= mids_year < maxyear and mids_year == int(mids_year):
+                changes[int(mids_year)] = mids.latlon
 
-        for year in range(minyear, maxyear):
-            # Update active position if we have a midpoint for this year
-            for mids in line.midpoints:
-                mids_year = mids.year if hasattr(mids, "year") else None
-                if mids_year == year:
-                    activepos = mids.latlon
+        activepos = self.person_index.latlon(line.person, "birth")
+        first = minyear
+        for year in sorted(changes):
             if activepos and activepos.lat and activepos.lon:
-                mycluster.mark(activepos, year)
+                mycluster.mark_years(activepos, first, year)
+            activepos, first = changes[year], year
+        if activepos and activepos.lat and activepos.lon:
+            mycluster.mark_years(activepos, first, maxyear)
 
     # Heatmap normalization utility now in heatmap_utils.py
     def _normalize_heat_data(self, heat_data: list) -> None:
         normalize_heat_data(heat_data)
 
-    def _create_timeline_heatmap(self, lines: list[Line], mycluster: MyMarkClusters, fm: folium.Map) -> None:
-        """Create a timeline-based heatmap visualization"""
-        _log.info("Building timeline heatmap clusters")
+    def _mark_timeline_line(self, line: Line, mycluster: MyMarkClusters) -> None:
+        """Mark the yearly positions of a life line for the timeline heatmap"""
+        if not (getattr(line, "style", None) == "Life"):
+            return
 
-        # Process life events for each line
-        for line in lines:
-            if self.svc_progress.step():
-                break
-
-            if not (getattr(line, "style", None) == "Life"):
-                continue
-
-            person = line.person
-            self.svc_state.Referenced.add(person.xref_id, "heat")
-            minyear, maxyear = self._process_timeline_data(line, mycluster)
-            self._build_yearly_positions(line, minyear, maxyear, mycluster)
-
-            # Add death location if available
-            death_event = person.get_event("death") if person else None
-            death_latlon = death_event.getattr("latlon") if death_event else None
-            death_year_num = death_event.getattr("when_year_num") if death_event else None
-            if death_latlon:
-                mycluster.mark(death_latlon, death_year_num)
-
-        # Extract unique years from markers
-        years = sorted(
-            set(
-                year
-                for marker in mycluster.pmarker
-                if isinstance(mycluster.pmarker[marker][3], (int, float))
-                for year in [mycluster.pmarker[marker][3]]
-            )
-        )
+        person = line.person
+        self.svc_state.Referenced.add(person.xref_id, "heat")
+        minyear, maxyear = self._process_timeline_data(line, mycluster)
+        self._build_yearly_positions(line, minyear, maxyear, mycluster)
+
+        # Add death location if available
+        death_latlon = self.person_index.latlon(person, "death")
+        death_year_num = self.person_index.year(person, "death")
+        if death_latlon:
+            mycluster.mark(death_latlon, death_year_num)
+
+    def _mark_static_line(self, line: Line, mycluster: MyMarkClusters) -> None:
+        """Mark every location of a line for the static heatmap"""
+        mycluster.mark(line.fromlocation)
+        mycluster.mark(line.tolocation)
+        if line.midpoints:
+            for mids in line.midpoints:
+                event_latlon = mids.getattr("latlon") if mids else None
+                mycluster.mark(event_latlon, None)
+
+    def _create_timeline_heatmap(self, mycluster: MyMarkClusters, fm: folium.Map) -> None:
+        """Create a timeline-based heatmap visualization from the marked clusters
 
-        # Build heat data array
-        heat_data = [
-            [
-                [mycluster.pmarker[markname][0], mycluster.pmarker[markname][1], mycluster.pmarker[markname][2]]
-                for markname in mycluster.pmarker
-                if years[year_idx] == mycluster.pmarker[markname][3]
-            ]
-            for year_idx in range(len(years))
-        ]
-
-        self._normalize_heat_data(heat_data)
-
-        # Create and add heatmap
-        hm = folium.plugins.HeatMapWithTime(
-            heat_data,
-            index=years,
+        With HeatMapTimeIntervals the page holds each stay at a location once, as a year
+        interval, and the time steps are built in the browser (IntervalHeatMapWithTime);
+        otherwise every time step's points are written out.
+        """
+        _log.info("Building timeline heatmap clusters")
+        options = dict(
             name="Heatmap",
             max_opacity=0.9,
             min_speed=1,
@@ -280,24 +335,38 @@ class foliumExporter:
             max_speed=25,
             gradient={"0": "Navy", "0.25": "Blue", "0.5": "Green", "0.75": "Yellow", "1": "Red"},
         )
+
+        if self.svc_config.get("HeatMapTimeIntervals"):
+            years, intervals = mycluster.timeline_intervals()
+            _log.info("Timeline heatmap: %d intervals over %d time steps", len(intervals["loc"]), len(years))
+            hm = IntervalHeatMapWithTime(intervals, index=years, step=mycluster.step, **options)
+        else:
+            years, heat_data = mycluster.timeline()
+            self._normalize_heat_data(heat_data)
+            hm = folium.plugins.HeatMapWithTime(heat_data, index=years, **options)
         fm.add_child(hm)
 
-    def _create_static_heatmap(self, lines: list[Line], mycluster: MyMarkClusters, fm: folium.Map) -> None:
-        """Create a static heatmap visualization"""
-        # Mark all locations
-        for line in lines:
-            self.svc_progress.step()
-            mycluster.mark(line.fromlocation)
-            mycluster.mark(line.tolocation)
-            if line.midpoints:
-                for mids in line.midpoints:
-                    event_latlon = mids.getattr("latlon") if mids else None
-                    mycluster.mark(event_latlon, None)
+    def _create_static_heatmap(self, mycluster: MyMarkClusters, fm: folium.Map) -> None:
+        """Create a static heatmap visualization from the marked clusters
 
-        # Create feature group and heat data
-        fg = folium.FeatureGroup(name=lgd_txt.format(txt="Heatmap", col="black"), show=self.svc_config.get("HeatMap"))
+        With HeatMapRaster the density is rendered to images here (DensityOverlay), in a
+        pyramid of HeatMapRasterBands zoom bands, rather than by Leaflet.heat on every pan and zoom.
+        """
+        name = lgd_txt.format(txt="Heatmap", col="black")
+        heat_data = mycluster.heat()
+        if self.svc_config.get("HeatMapRaster"):
+            overlay = DensityOverlay(
+                heat_data,
+                name=name,
+                bands=self.svc_config.get("HeatMapRasterBands", 1),
+                show=self.svc_config.get("HeatMap"),
+            )
+            _log.info("Raster heatmap: %d points in %d images", len(heat_data), len(overlay.bands))
+            fm.add_child(overlay)
+            return
 
-        heat_data = [[marker[0], marker[1], marker[2]] for markname, marker in mycluster.pmarker.items()]
+        # Create feature group and heat data
+        fg = folium.FeatureGroup(name=name, show=self.svc_config.get("HeatMap"))
 
         # Add heatmap to feature group
         hm = folium.plugins.HeatMap(heat_data, max_opacity=0.8, name="Heatmap")
@@ -305,40 +374,87 @@ class foliumExporter:
         fm.add_child(fg)
 
     # In the export method, replace the heatmap section with:
-    def export(self, main: LatLon, lines: list[Line], saveresult=True):
+    def export(self, main: LatLon, lines: Iterable[Line], saveresult=True):
         """
         Export genealogical data to an interactive Folium map.
         Partitioned for clarity and maintainability.
+
+        lines is read once, so it may be a list or a stream such as
+        LifetimeCreator.iter_create(). Heatmap positions are gathered as the lines
+        arrive; when grouping by last name the lines are drawn as they arrive too,
+        otherwise only the styled lines are kept until they can be drawn in order.
         """
         people = self.svc_state.people
         if not people:
             _log.warning("No people to plot on map.")
             return
+        self.person_index = self._state_person_index()
 
         main_person = self.svc_state.mainPerson if self.svc_state.mainPerson else None
         main_person_latlon = getattr(main_person, "latlon", None) if main_person else None
 
-        if not self.fm:
-            self._init_map(main_person_latlon, lines, saveresult)
+        self.svc_state.totalpeople = 0
+        referencing = not self.fm
+        if referencing:
+            self._init_map(main_person_latlon, saveresult)
             if not saveresult:
+                for line in lines:
+                    self.svc_state.totalpeople += 1
+                    self._reference_line(line)
                 return
 
         SortByLast = self.svc_config.get("GroupBy") == 1 or self.svc_config.get("GroupBy") == 2
         SortByPerson = self.svc_config.get("GroupBy") == 3
         fm = self.fm
         self.saveresult = saveresult
+        self.icons = IconRegistry(fm)
 
         self.svc_progress.step("Preparing")
         self.fglastname: dict[str, FeatureGroupInfo] = dict()
 
         flr = folium.FeatureGroup(name=lgd_txt.format(txt="Relations", col="green"), show=False)
         flp = folium.FeatureGroup(name=lgd_txt.format(txt="People", col="Black"), show=False)
-        mycluster = MyMarkClusters(fm, self.svc_config.get("HeatMapTimeStep"))
+        mycluster = MyMarkClusters(
+            fm, self.svc_config.get("HeatMapTimeStep"), self.svc_config.get("HeatMapPrecision", HEAT_PRECISION)
+        )
 
-        self._add_heatmap(lines, mycluster, fm)
+        # Single pass over the lines: last-name groups are only added to the map at the
+        # end, so with SortByLast the lines can be drawn before the heatmap is complete
+        timeline = self.svc_config.get("MapTimeLine")
+        if timeline:
+            _log.info("Marking timeline heatmap positions")
+        if SortByLast:
+            self.svc_progress.step("Building lines")
+        heat_on = True
+        to_draw = []
+        for line in lines:
+            self.svc_state.totalpeople += 1
+            if referencing:
+                self._reference_line(line)
+            if heat_on:
+                if timeline:
+                    # The timeline heatmap stops where the user cancels
+                    heat_on = not self.svc_progress.step()
+                    if heat_on:
+                        self._mark_timeline_line(line, mycluster)
+                else:
+                    self.svc_progress.step()
+                    self._mark_static_line(line, mycluster)
+            if hasattr(line, "style"):
+                if SortByLast:
+                    self._log_line(line)
+                    self.svc_progress.step()
+                    self._draw_single_line(line, SortByLast, SortByPerson, fm)
+                else:
+                    to_draw.append(line)
+
+        self._add_heatmap(mycluster, fm)
         self._add_fontawesome_hack(fm)
-        self._draw_lines(lines, SortByLast, SortByPerson, fm)
+        if not SortByLast:
+            self._draw_lines(to_draw, SortByLast, SortByPerson, fm)
         self._add_feature_groups_to_map(fm, show_all=self.svc_config.get("ShowAllPeople"))
+        if self.geojson is not None:
+            _log.info("GeoJSON layers: %d features", self.geojson.flush())
         self._add_marker_cluster(fm)
         self._add_main_star(main, fm)
         self._add_legend(fm)
@@ -347,7 +463,7 @@ class foliumExporter:
         self.Done()
         return
 
-    def _init_map(self, main_person_latlon, lines, saveresult):
+    def _init_map(self, main_person_latlon, saveresult):
         # Get map style from config
         map_style = self.svc_config.get("MapStyle", "CartoDB.Voyager")
         _log.debug("Initializing map with style: %s", map_style)
@@ -360,10 +476,8 @@ class foliumExporter:
             tile = xyz.CartoDB
 
         main_person = self.svc_state.mainPerson if self.svc_state.mainPerson else None
-        birth_event = main_person.get_event("birth") if main_person else None
-        death_event = main_person.get_event("death") if main_person else None
-        birth_latlon = birth_event.getattr("latlon") if birth_event else None
-        death_latlon = death_event.getattr("latlon") if death_event else None
+        birth_latlon = self.person_index.latlon(main_person, "birth")
+        death_latlon = self.person_index.latlon(main_person, "death")
 
         if death_latlon or birth_latlon:
             self.fm = folium.Map(location=[0, 0], zoom_start=4, tiles=tile)
@@ -372,19 +486,21 @@ class foliumExporter:
         if self.svc_config.get("mapMini"):
             folium.plugins.MiniMap(toggle_display=True).add_to(self.fm)
 
-        random.seed()
         self.svc_state.Referenced = Referenced()
         _log.debug("Building Referenced - quick only: %s", not saveresult)
-        for line in lines:
-            if getattr(line, "style", None) == "Life":
-                self.svc_state.Referenced.add(line.person.xref_id, "quick")
-        self.svc_state.lastlines = {line.person.xref_id: line for line in lines}
+        self.svc_state.lastlines = {}
 
-    def _add_heatmap(self, lines, mycluster, fm):
+    def _reference_line(self, line: Line) -> None:
+        """Record a line in Referenced and lastlines as it passes through export."""
+        if getattr(line, "style", None) == "Life":
+            self.svc_state.Referenced.add(line.person.xref_id, "quick")
+        self.svc_state.lastlines[line.person.xref_id] = line
+
+    def _add_heatmap(self, mycluster, fm):
         if self.svc_config.get("MapTimeLine"):
-            self._create_timeline_heatmap(lines, mycluster, fm)
+            self._create_timeline_heatmap(mycluster, fm)
         else:
-            self._create_static_heatmap(lines, mycluster, fm)
+            self._create_static_heatmap(mycluster, fm)
 
     def _add_fontawesome_hack(self, fm):
         # My to use the jquery hack to MAGIC HACK fix the Folium code to use Font Awesome!
@@ -394,21 +510,22 @@ class foliumExporter:
         )
 
     def _draw_lines(self, lines, SortByLast, SortByPerson, fm):
-        i = 0
         self.svc_progress.step("Building lines")
         lines_sorted = lines if SortByLast else sorted(lines, key=lambda x: x.prof * ((x.branch / DELTA) + 1) + x.prof)
         styled_lines = [line for line in lines_sorted if hasattr(line, "style")]
         for line in styled_lines:
-            _log.debug(
-                f"{line.prof * ((line.branch / DELTA) + 1) + line.prof:8f} {line.path:8} "
-                f"{line.branch:.8f} {line.prof:2} "
-                f"{line.parentofperson.name if line.parentofperson else '':20} from {line.name:20}"
-            )
+            self._log_line(line)
         for line in styled_lines:
             self.svc_progress.step()
-            i += 1
             self._draw_single_line(line, SortByLast, SortByPerson, fm)
 
+    def _log_line(self, line: Line) -> None:
+        _log.debug(
+            f"{line.prof * ((line.branch / DELTA) + 1) + line.prof:8f} {line.path:8} "
+            f"{line.branch:.8f} {line.prof:2} "
+            f"{line.parentofperson.name if line.parentofperson else '':20} from {line.name:20}"
+        )
+
     def _draw_single_line(self, line: Line, SortByLast: bool, SortByPerson: bool, fm: folium.Map) -> None:
         """
         Draw a single genealogical line on the Folium map, including markers and polylines.
@@ -421,19 +538,20 @@ class foliumExporter:
         marker_options = self._create_marker_options(line)
         label_name = line.name[:25] + "..." if len(line.name) > 25 else line.name
         group_name = lgd_txt.format(txt=label_name, col=marker_options["line_color"])
-        person = line.person
-        birth_event = person.get_event("birth") if person else None
-        death_event = person.get_event("death") if person else None
-        birth_year_num = birth_event.getattr("when_year_num") if birth_event else None
-        death_year_num = death_event.getattr("when_year_num") if death_event else None
-        birth_info = f"{birth_year_num} (Born)" if birth_year_num else ""
-        death_info = f"{death_year_num} (Died)" if death_year_num else ""
-        popup_content = self._create_popup_content(line, birth_info, death_info)
+        birth_info, death_info = self._life_info(line.person)
+        if self.geojson is not None and self.geojson.people is not None:
+            popup_content = self._create_popup_reference(line, birth_info, death_info)
+        else:
+            popup_content = self._create_popup_content(line, birth_info, death_info)
+        marker_popup = popup_content
+        if isinstance(popup_content, dict) and self.svc_config.get("ClusterMarkers"):
+            # Clustered markers are drawn from their own popup HTML
+            marker_popup = self._create_popup_content(line, birth_info, death_info)
 
         fg, new_fg = self._get_feature_group_for_line(line, SortByLast, SortByPerson, group_name)
-        start_point = self._add_start_marker(line, fg, marker_options, popup_content)
-        end_point = self._add_end_marker(line, fg, marker_options, popup_content)
-        fm_line = self._add_midpoint_markers(line, fg, marker_options, popup_content, start_point, end_point)
+        start_point = self._add_start_marker(line, fg, marker_options, marker_popup)
+        end_point = self._add_end_marker(line, fg, marker_options, marker_popup)
+        fm_line = self._add_midpoint_markers(line, fg, marker_options, marker_popup, start_point, end_point)
         self._add_polyline(line, fg, fm_line, marker_options, popup_content)
         self._finalize_feature_group(fg, new_fg, fm, fm_line, line)
 
@@ -471,19 +589,19 @@ class foliumExporter:
             line (Line): The line object.
             fg (FeatureGroup): The feature group to add the marker to.
             marker_options (dict): Marker styling options.
-            popup_content (str): Popup HTML content.
+            popup_content (str | dict): Popup HTML content, or reference to the people table (SharedPopups).
         Returns:
             list[float] | None: The start point coordinates, or None if not present.
         """
         if line.fromlocation and line.fromlocation.hasLocation():
-            start_point = [Drift(line.fromlocation.lat), Drift(line.fromlocation.lon)]
+            start_point = self._drift_point(line.fromlocation.lat, line.fromlocation.lon, line.person.xref_id, "from")
             if self.svc_config.get("MarksOn") and self.svc_config.get("BornMark"):
                 add_point_marker(
                     fg,
                     start_point,
                     marker_options,
                     f"Life of {line.name}".replace("`", "‛").replace("'", "‛"),
-                    popup_content + "\nbirth",
+                    self._marked_popup(popup_content, "birth"),
                     marker_options["start_icon"],
                     marker_options["start_color"],
                     exporter=self,
@@ -500,19 +618,19 @@ class foliumExporter:
             line (Line): The line object.
             fg (FeatureGroup): The feature group to add the marker to.
             marker_options (dict): Marker styling options.
-            popup_content (str): Popup HTML content.
+            popup_content (str | dict): Popup HTML content, or reference to the people table (SharedPopups).
         Returns:
             list[float] | None: The end point coordinates, or None if not present.
         """
         if line.tolocation and line.tolocation.hasLocation():
-            end_point = [Drift(line.tolocation.lat), Drift(line.tolocation.lon)]
+            end_point = self._drift_point(line.tolocation.lat, line.tolocation.lon, line.person.xref_id, "to")
             if self.svc_config.get("MarksOn") and self.svc_config.get("DieMark"):
                 add_point_marker(
                     fg,
                     end_point,
                     marker_options,
                     f"Life of {line.name}".replace("`", "‛").replace("'", "‛"),
-                    popup_content + "\ndeath",
+                    self._marked_popup(popup_content, "death"),
                     marker_options["end_icon"],
                     marker_options["end_color"],
                     exporter=self,
@@ -535,7 +653,7 @@ class foliumExporter:
             line (Line): The line object.
             fg (FeatureGroup): The feature group to add markers to.
             marker_options (dict): Marker styling options.
-            popup_content (str): Popup HTML content.
+            popup_content (str | dict): Popup HTML content, or reference to the people table (SharedPopups).
             start_point (list[float] | None): The start point coordinates.
             end_point (list[float] | None): The end point coordinates.
         Returns:
@@ -545,8 +663,10 @@ class foliumExporter:
         if start_point:
             fm_line.append(tuple(start_point))
         if line.midpoints:
-            for mids in line.midpoints:
-                mid_point = [Drift(mids.location.latlon.lat), Drift(mids.location.latlon.lon)]
+            for index, mids in enumerate(line.midpoints):
+                mid_point = self._drift_point(
+                    mids.location.latlon.lat, mids.location.latlon.lon, line.person.xref_id, mids.what, index
+                )
                 fm_line.append(tuple(mid_point))
                 if self.svc_config.get("HomeMarker") and self.svc_config.get("MarksOn"):
                     point_type = mids.what if mids.what in MidPointMarker else "Other"
@@ -560,8 +680,31 @@ class foliumExporter:
             fm_line.append(tuple(end_point))
         return fm_line
 
+    def _drift_point(self, lat: float, lon: float, *key) -> list[float]:
+        """
+        A marker or line vertex: the location with the jitter of key (xref_id, event type, index),
+        rounded to the coordinate precision
+        """
+        dlat, dlon = jitter(*key)
+        return round_point([float(lat) + dlat, float(lon) + dlon], self.coordinate_precision)
+
+    def _simplify(self, fm_line: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        """
+        Simplify a polyline path for the simplify zoom level.
+        A pixel is smaller in degrees of latitude than of longitude away from the equator,
+        so the tolerance is scaled for the line's highest latitude.
+        """
+        if not self.simplify_zoom or len(fm_line) < 3:
+            return fm_line
+        max_lat = min(max(abs(lat) for lat, _ in fm_line), 85.0)
+        return simplify_line(fm_line, zoom_tolerance(self.simplify_zoom) * math.cos(math.radians(max_lat)))
+
     # Polyline utility now in polyline_utils.py
     def _add_polyline(self, line, fg, fm_line, marker_options, popup_content):
+        fm_line = self._simplify(fm_line)
+        if isinstance(popup_content, dict) and self.svc_config.get("UseAntPath"):
+            # Ant paths are drawn as objects, which need the popup HTML
+            popup_content = self._create_popup_content(line, *self._life_info(line.person))
         add_polyline(
             line,
             fg,
@@ -571,6 +714,7 @@ class foliumExporter:
             self.max_line_weight,
             self.svc_config.get("UseAntPath"),
             self.svc_config,
+            self.geojson,
         )
 
     def _finalize_feature_group(
@@ -599,13 +743,13 @@ class foliumExporter:
     def _add_marker_cluster(self, fm):
         show_control = True if self.svc_config.get("showLayerControl") else False
         if self.locations:
-            marker_cluster = MarkerCluster(
-                locations=self.locations,
-                popups=self.popups,
+            marker_cluster = ZoomClusterLayer(
+                self.locations,
+                self.popups,
                 name="-markers clustered-",
                 overlay=True,
                 control=True,
-                icon_create_function=icon_create_function,
+                folder=self.geojson.folder if isinstance(self.geojson, LazyGeoJsonLayers) else None,
             )
             marker_cluster.add_to(fm)
         folium.map.LayerControl("topleft", collapsed=not show_control).add_to(fm)
@@ -617,11 +761,11 @@ class foliumExporter:
             lat = birth_latlon.lat
             lon = birth_latlon.lon
             if not birth_latlon.isNone():
-                folium.Marker(
-                    [Drift(lat), Drift(lon)],
+                self.icons.marker(
+                    self._drift_point(lat, lon, getattr(main, "xref_id", main.name), "star"),
+                    self.icons.icon("lightred", "star", prefix="fa", iconSize=["50%", "50%"]),
                     tooltip=main.name,
                     opacity=0.5,
-                    icon=folium.Icon(color="lightred", icon="star", prefix="fa", iconSize=["50%", "50%"]),
                 ).add_to(fm)
         else:
             _log.warning("No GPS locations to generate a Star on the map.")
@@ -0,0 +1,359 @@
+"""
+GeoJSON rendering backend for the folium exporter.
+
+Drawing every marker and line as its own folium.Marker, folium.Icon, PolyLine
+and Popup makes folium render each one through Jinja into several JS
+variables, which is what makes the HTML of large trees so big and slow.  With
+the UseGeoJson option the exporter hands markers and lines to GeoJsonLayers
+instead: they are collected as GeoJSON features per feature group, and each
+group gets a single folium.GeoJson FeatureCollection when the map is finished.
+The features only carry their own values (icon, colour, line weight, dash,
+tooltip, popup) as properties; the style, marker and popup functions below are
+written once per layer and build the same Leaflet markers, polylines, tooltips
+and popups from them.
+
+Ant paths cannot be drawn from GeoJSON, so with UseAntPath the lines are still
+added as AntPath objects.
+
+With the LazyLayers option LazyGeoJsonLayers goes one step further and keeps the
+features out of the page: each feature group's FeatureCollection is written,
+gzip compressed, to its own sidecar script next to the HTML file, and the page
+only holds an empty GeoJSON layer per group that loads its sidecar the first
+time the group is shown (toggled on in the LayerControl).  The page then stays
+the same size however big the tree is.  The sidecars are scripts rather than
+.json.gz files so that they load from a map opened straight from disk, where
+the browser does not allow fetch(); the script hands the base64 of the gzip
+data to GedcomLazyLayers, which inflates it with DecompressionStream.
+
+With the SharedPopups option the popup of a marker or line is not written into
+each feature: a person's name, years and photo are stored once in a table keyed
+by xref_id, the features only carry a reference (the person, the line style,
+the person it relates to and the birth/death mark), and the popup HTML is built
+from the table when it is opened.  The table goes in the page, or with
+LazyLayers the people of each group go in its sidecar.
+"""
+
+__all__ = ["GeoJsonLayers", "LAZY_LOADER", "LazyGeoJsonLayers", "write_sidecar"]
+
+import base64
+import glob
+import gzip
+import json
+import os
+
+import folium
+from branca.element import Element, MacroElement, Template
+from folium.utilities import JsCode
+
+# Polyline style from the feature properties, matching folium.PolyLine(opacity=1, lineJoin="arcs")
+STYLE_FUNCTION = JsCode(
+    """function(feature) {
+    var p = feature.properties;
+    return {color: p.color, weight: p.weight, opacity: 1, dashArray: p.dash, lineJoin: "arcs"};
+}"""
+)
+
+# Marker from the feature properties, matching add_point_marker's folium.Marker and folium.Icon
+POINT_TO_LAYER = JsCode(
+    """function(feature, latlng) {
+    var p = feature.properties;
+    var icon = L.AwesomeMarkers.icon({
+        markerColor: p.color, iconColor: "white", icon: p.icon || undefined, prefix: "fa", extraClasses: "fas"
+    });
+    return L.marker(latlng, {opacity: 0.5, icon: icon});
+}"""
+)
+
+# Tooltip and popup of every feature, the popup built from GedcomPopups when the feature has a reference
+ON_EACH_FEATURE = JsCode(
+    """function(feature, layer) {
+    var p = feature.properties;
+    if (p.tooltip) {
+        layer.bindTooltip(p.tooltip, {sticky: true});
+    }
+    if (p.ref) {
+        layer.bindPopup(function() { return GedcomPopups.html(p.ref); }, {maxWidth: "100%"});
+    } else if (p.popup) {
+        layer.bindPopup(p.popup, {maxWidth: "100%"});
+    }
+}"""
+)
+
+# The people table and the popup of a reference, as foliumExporter._create_popup_content() writes it
+POPUP_TABLE = """<script>
+var GedcomPopups = {
+    people: %s,
+    html: function(ref) {
+        var who = this.people[ref.pid];
+        var name = ref.rel == "Life" ? "Life of " + who[0] : who[0] + " " + ref.rel + " of " + (ref.of ? this.people[ref.of][0] : "");
+        if (who[1]) {
+            name += "<br>" + who[1];
+        }
+        var html = "<div style='min-width: 150px'>" + name + "</div>";
+        if (who[2]) {
+            html += "<img src='" + who[2] + "' width='150'>";
+        }
+        return ref.mark ? html + "\\n" + ref.mark : html;
+    }
+};
+</script>"""
+
+
+# Loads the sidecar of a layer once, and adds its features when the script calls loaded()
+LAZY_LOADER = """<script>
+var GedcomLazyLayers = {
+    layers: {},
+    load: function(id, src, layer) {
+        if (id in this.layers) {
+            return;
+        }
+        this.layers[id] = layer;
+        var script = document.createElement("script");
+        script.src = src;
+        document.head.appendChild(script);
+    },
+    loaded: function(id, data) {
+        var layer = this.layers[id];
+        var bytes = Uint8Array.from(atob(data), function(c) { return c.charCodeAt(0); });
+        var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+        new Response(stream).json().then(function(collection) {
+            if (collection.people) {
+                Object.assign(GedcomPopups.people, collection.people);
+            }
+            layer.addData(collection);
+        });
+    }
+};
+</script>"""
+
+
+def write_sidecar(path: str, name: str, payload) -> None:
+    """
+    Write payload, gzip compressed, to a sidecar script that hands it to GedcomLazyLayers.loaded(name, ...).
+    Args:
+        path (str): Path of the sidecar script.
+        name (str): Id the payload was requested under with GedcomLazyLayers.load().
+        payload: JSON serializable data.
+    """
+    collection = json.dumps(payload, separators=(",", ":"))
+    data = base64.b64encode(gzip.compress(collection.encode("utf-8"), mtime=0)).decode("ascii")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"GedcomLazyLayers.loaded({json.dumps(name)}, {json.dumps(data)});\n")
+
+
+class PopupTable(MacroElement):
+    """
+    Adds GedcomPopups, with the given people, to the page header.
+
+    Args:
+        people (dict): [name, years, photo] of each person, by xref_id.
+    """
+
+    def __init__(self, people: dict) -> None:
+        super().__init__()
+        self._name = "PopupTable"
+        self.people = people
+
+    def render(self, **kwargs) -> None:
+        script = POPUP_TABLE % json.dumps(self.people, separators=(",", ":")).replace("</", "<\\/")
+        self.get_root().header.add_child(Element(script), name="gedcom_popups")
+        super().render(**kwargs)
+
+
+class GeoJsonLayers:
+    """
+    Collects markers and lines as GeoJSON features per feature group.
+
+    Attributes:
+        features (dict): Features collected for each feature group, by group.
+        people (dict | None): Popup data of each person, by xref_id, when popups are shared; else None.
+    """
+
+    def __init__(self, shared_popups: bool = False) -> None:
+        """
+        Args:
+            shared_popups (bool): Popups are references to a table of people rather than HTML.
+        """
+        self.features: dict[folium.FeatureGroup, list[dict]] = dict()
+        self.people: dict[str, list] | None = dict() if shared_popups else None
+
+    def add_person(self, xref_id: str, name: str, years: str, photo: str | None) -> None:
+        """
+        Add or replace a person in the popup table.
+        Args:
+            xref_id (str): The person's xref_id.
+            name (str): Name shown in the popup.
+            years (str): Birth and death years shown under the name (may be empty).
+            photo (str): URL of the photo, or None.
+        """
+        self.people[xref_id] = [name, years, photo]
+
+    @staticmethod
+    def _popup(popup: str | dict) -> dict:
+        """The popup properties of a feature: the HTML, or the reference to the people table."""
+        return {"ref": popup} if isinstance(popup, dict) else {"popup": popup}
+
+    def add_point(
+        self, fg: folium.FeatureGroup, point: list, tooltip: str, popup: str | dict, icon_name: str, color: str
+    ) -> None:
+        """
+        Add a marker to a feature group.
+        Args:
+            fg (FeatureGroup): The feature group.
+            point (list): [lat, lon] of the marker.
+            tooltip (str): Tooltip text.
+            popup (str | dict): Popup HTML, or reference to the people table.
+            icon_name (str): Font Awesome icon name (None for the default icon).
+            color (str): Marker color.
+        """
+        self.features.setdefault(fg, []).append(
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [point[1], point[0]]},
+                "properties": {"icon": icon_name, "color": color, "tooltip": tooltip, **self._popup(popup)},
+            }
+        )
+
+    def add_line(
+        self,
+        fg: folium.FeatureGroup,
+        points: list,
+        color: str,
+        weight: int,
+        dash_array: list,
+        tooltip: str,
+        popup: str | dict,
+    ) -> None:
+        """
+        Add a polyline to a feature group.
+        Args:
+            fg (FeatureGroup): The feature group.
+            points (list): (lat, lon) of each point of the line.
+            color (str): Line color.
+            weight (int): Line width.
+            dash_array (list): Dash pattern (empty for a solid line).
+            tooltip (str): Tooltip text.
+            popup (str | dict): Popup HTML, or reference to the people table.
+        """
+        self.features.setdefault(fg, []).append(
+            {
+                "type": "Feature",
+                "geometry": {"type": "LineString", "coordinates": [[lon, lat] for lat, lon in points]},
+                "properties": {
+                    "color": color,
+                    "weight": weight,
+                    "dash": " ".join(str(dash) for dash in dash_array) if dash_array else None,
+                    "tooltip": tooltip,
+                    **self._popup(popup),
+                },
+            }
+        )
+
+    def flush(self) -> int:
+        """
+        Add one GeoJson FeatureCollection to each feature group that has features.
+        Returns:
+            int: The number of features written.
+        """
+        count = 0
+        if self.people is not None and self.features:
+            next(iter(self.features)).add_child(PopupTable(self.people))
+        for fg, features in self.features.items():
+            folium.GeoJson(
+                {"type": "FeatureCollection", "features": features},
+                control=False,
+                style=STYLE_FUNCTION,
+                point_to_layer=POINT_TO_LAYER,
+                on_each_feature=ON_EACH_FEATURE,
+            ).add_to(fg)
+            count += len(features)
+        self.features.clear()
+        return count
+
+
+class LazyGeoJson(MacroElement):
+    """
+    Empty GeoJSON layer of a feature group that loads its features from a sidecar script when the group is shown.
+
+    Args:
+        src (str): URL of the sidecar script, relative to the HTML file.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.geoJson(null, {
+                style: {{ this.style }},
+                pointToLayer: {{ this.point_to_layer }},
+                onEachFeature: {{ this.on_each_feature }},
+            }).addTo({{ this._parent.get_name() }});
+            function {{ this.get_name() }}_load() {
+                GedcomLazyLayers.load({{ this.get_name()|tojson }}, {{ this.src|tojson }}, {{ this.get_name() }});
+            }
+            {{ this._parent.get_name() }}.on("add", {{ this.get_name() }}_load);
+            if ({{ this._parent.get_name() }}._map) {
+                {{ this.get_name() }}_load();
+            }
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, src: str) -> None:
+        super().__init__()
+        self._name = "LazyGeoJson"
+        self.src = src
+        self.style = STYLE_FUNCTION
+        self.point_to_layer = POINT_TO_LAYER
+        self.on_each_feature = ON_EACH_FEATURE
+
+    def render(self, **kwargs) -> None:
+        figure = self.get_root()
+        figure.header.add_child(Element(LAZY_LOADER), name="gedcom_lazy_layers")
+        super().render(**kwargs)
+
+
+class LazyGeoJsonLayers(GeoJsonLayers):
+    """
+    GeoJsonLayers that writes each feature group's features to a compressed sidecar script,
+    loaded by the page only when the group is shown.
+
+    Attributes:
+        folder (str): Folder the sidecars are written to.
+        url (str): URL of the folder, relative to the HTML file.
+    """
+
+    def __init__(self, html_file: str, shared_popups: bool = False) -> None:
+        """
+        Args:
+            html_file (str): Path of the HTML map; the sidecars go in the "<name>_layers" folder next to it.
+            shared_popups (bool): Popups are references to a table of people rather than HTML.
+        """
+        super().__init__(shared_popups)
+        self.folder = os.path.splitext(html_file)[0] + "_layers"
+        self.url = os.path.basename(self.folder)
+
+    def flush(self) -> int:
+        """
+        Write one sidecar per feature group that has features, and add its LazyGeoJson layer to the group.
+        Sidecars left by an earlier export to the same folder are removed first.
+        Returns:
+            int: The number of features written.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        for stale in glob.glob(os.path.join(self.folder, "layer_*.js")):
+            os.remove(stale)
+        count = 0
+        if self.people is not None and self.features:
+            next(iter(self.features)).add_child(PopupTable({}))
+        for n, (fg, features) in enumerate(self.features.items()):
+            collection = {"type": "FeatureCollection", "features": features}
+            if self.people is not None:
+                refs = [feature["properties"]["ref"] for feature in features if "ref" in feature["properties"]]
+                xref_ids = {ref["pid"] for ref in refs} | {ref["of"] for ref in refs if ref.get("of")}
+                collection["people"] = {xref_id: self.people[xref_id] for xref_id in sorted(xref_ids)}
+            layer = LazyGeoJson(f"{self.url}/layer_{n}.js")
+            write_sidecar(os.path.join(self.folder, f"layer_{n}.js"), layer.get_name(), collection)
+            fg.add_child(layer)
+            count += len(features)
+        self.features.clear()
+        return count
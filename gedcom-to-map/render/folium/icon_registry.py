@@ -0,0 +1,66 @@
+"""
+Shared marker icons for the folium exporter.
+
+folium.Marker(icon=folium.Icon(...)) writes a new L.AwesomeMarkers.icon object
+and a setIcon() call into the page for every marker, although the markers of a
+map only use a handful of icons (the birth, death and parent icons of
+_create_marker_options(), the MidPointMarker icons and the main star).
+IconRegistry creates each distinct icon once, as a child of the map, and the
+markers it makes refer to that icon's variable in their options.
+
+An icon is added to the map the first time it is asked for, which is before
+the feature group of the marker that uses it is added to the map, so the icon
+is defined before the marker in the page script.
+"""
+
+__all__ = ["IconRegistry"]
+
+import json
+
+import folium
+from folium.utilities import JsCode
+
+
+class IconRegistry:
+    """
+    Creates each distinct marker icon of a map once.
+
+    Attributes:
+        mymap (folium.Map): The map the icons are defined in.
+        icons (dict): The icons created, by their options.
+    """
+
+    def __init__(self, mymap: folium.Map) -> None:
+        self.mymap: folium.Map = mymap
+        self.icons: dict[str, folium.Icon] = dict()
+
+    def icon(self, color: str, icon_name: str | None, **options) -> folium.Icon:
+        """
+        The icon with the given options, created on first use.
+        Args:
+            color (str): Marker color.
+            icon_name (str): Icon name (None for the default icon).
+            **options: Other folium.Icon options (prefix, extraClasses, iconSize, ...).
+        Returns:
+            folium.Icon: The shared icon.
+        """
+        key = json.dumps([color, icon_name, options], sort_keys=True)
+        icon = self.icons.get(key)
+        if icon is None:
+            icon = self.icons[key] = folium.Icon(color=color, icon=icon_name, **options)
+            self.mymap.add_child(icon)
+        return icon
+
+    def marker(self, location: list, icon: folium.Icon, **kwargs) -> folium.Marker:
+        """
+        A marker that uses a shared icon.
+        Args:
+            location (list): [lat, lon] of the marker.
+            icon (folium.Icon): The shared icon, from icon().
+            **kwargs: Other folium.Marker arguments (tooltip, popup, opacity, ...).
+        Returns:
+            folium.Marker: The marker, not yet added to a parent.
+        """
+        marker = folium.Marker(location, **kwargs)
+        marker.options["icon"] = JsCode(icon.get_name())
+        return marker
@@ -0,0 +1,220 @@
+"""
+Timeline heatmap that ships year intervals instead of one point list per time step.
+
+HeatMapWithTime writes the points of every time step into the page, so a person
+who lived 80 years in one place is written into every step of those 80 years.
+IntervalHeatMapWithTime writes each stay once, as (location, from year, to year,
+weight), and a small script builds a time step's points when the slider reaches
+it: the count of a location in the step starting at year s is the sum over its
+intervals of weight * (years of [from, to) inside [s, s + step)), divided by the
+largest such count, which is exactly what HeatMapWithTime is given.  The page
+then grows with the number of stays rather than with person-years.
+
+The script groups the intervals by length (shorter than 2^c years) when the
+layer is made.  A step only scans, in each group, the intervals that start less
+than the group's longest length before it, found by binary search, so building
+a late step does not walk the intervals that ended long before it.
+
+The intervals come from MyMarkClusters.timeline_intervals().
+"""
+
+__all__ = ["IntervalHeatMapWithTime"]
+
+import json
+
+from branca.element import Template
+from folium.plugins import HeatMapWithTime
+
+
+class IntervalHeatMapWithTime(HeatMapWithTime):
+    """
+    HeatMapWithTime whose time steps are built in the browser from year intervals.
+
+    Args:
+        intervals (dict): Columns "lat", "lng" (per location), "loc", "from", "to", "weight"
+            (per interval, ordered by "from") and "max", as made by MyMarkClusters.timeline_intervals().
+        index (list[int]): First year of each time step.
+        step (int): Years per time step.
+        **kwargs: HeatMapWithTime options (name, radius, max_opacity, gradient, speeds, ...).
+    """
+
+    _template = Template(
+        """
+        {% macro header(this, kwargs) %}
+            <script>
+            var TDIntervalHeatmap = L.TimeDimension.Layer.extend({
+                initialize: function(intervals, starts, step, options) {
+                    var heatmapCfg = {
+                        radius: 15,
+                        blur: 0.8,
+                        maxOpacity: 1.,
+                        scaleRadius: false,
+                        useLocalExtrema: false,
+                        latField: 'lat',
+                        lngField: 'lng',
+                        valueField: 'count',
+                    };
+                    heatmapCfg = $.extend({}, heatmapCfg, options.heatmapOptions || {});
+                    var layer = new HeatmapOverlay(heatmapCfg);
+                    L.TimeDimension.Layer.prototype.initialize.call(this, layer, options);
+                    this._currentLoadedTime = 0;
+                    this._currentTimeData = {data: []};
+                    this._frames = {};
+                    this.intervals = intervals;
+                    this.starts = starts;
+                    this.step = step;
+                    this.groups = this._groupByLength(intervals);
+                },
+                _groupByLength: function(iv) {
+                    // Interval ids by length class c (shorter than 2^c years), each still ordered by from
+                    var groups = {};
+                    for (var i = 0; i < iv.from.length; i++) {
+                        var c = Math.ceil(Math.log2(iv.to[i] - iv.from[i] + 1));
+                        (groups[c] = groups[c] || []).push(i);
+                    }
+                    return Object.keys(groups).map(function(c) {
+                        return {longest: Math.pow(2, c), ids: groups[c]};
+                    });
+                },
+                onAdd: function(map) {
+                    L.TimeDimension.Layer.prototype.onAdd.call(this, map);
+                    map.addLayer(this._baseLayer);
+                    if (this._timeDimension) {
+                        this._getDataForTime(this._timeDimension.getCurrentTime());
+                    }
+                },
+                _onNewTimeLoading: function(ev) {
+                    this._getDataForTime(ev.time);
+                },
+                isReady: function(time) {
+                    return (this._currentLoadedTime == time);
+                },
+                _update: function() {
+                    this._baseLayer.setData(this._currentTimeData);
+                    return true;
+                },
+                _buildFrame: function(start) {
+                    var iv = this.intervals, end = start + this.step;
+                    var counts = {}, locs = [];
+                    this.groups.forEach(function(group) {
+                        // Only intervals of the group that start after start - longest can reach start
+                        var ids = group.ids, lo = 0, hi = ids.length, after = start - group.longest;
+                        while (lo < hi) {
+                            var mid = (lo + hi) >> 1;
+                            if (iv.from[ids[mid]] <= after) {
+                                lo = mid + 1;
+                            } else {
+                                hi = mid;
+                            }
+                        }
+                        for (var k = lo; k < ids.length && iv.from[ids[k]] < end; k++) {
+                            var i = ids[k];
+                            if (iv.to[i] <= start) {
+                                continue;
+                            }
+                            var loc = iv.loc[i];
+                            var years = Math.min(iv.to[i], end) - Math.max(iv.from[i], start);
+                            if (!(loc in counts)) {
+                                counts[loc] = 0;
+                                locs.push(loc);
+                            }
+                            counts[loc] += years * iv.weight[i];
+                        }
+                    });
+                    return locs.map(function(loc) {
+                        return {lat: iv.lat[loc], lng: iv.lng[loc], count: counts[loc] / iv.max};
+                    });
+                },
+                _getDataForTime: function(time) {
+                    if (!(time in this._frames)) {
+                        this._frames[time] = this._buildFrame(this.starts[time - 1]);
+                    }
+                    this._currentTimeData = {data: this._frames[time]};
+                    this._currentLoadedTime = time;
+                    if (this._timeDimension && time == this._timeDimension.getCurrentTime() && !this._timeDimension.isLoading()) {
+                        this._update();
+                    }
+                    this.fire('timeload', {
+                        time: time
+                    });
+                }
+            });
+
+            L.Control.TimeDimensionCustom = L.Control.TimeDimension.extend({
+                initialize: function(index, options) {
+                    var playerOptions = {
+                        buffer: 1,
+                        minBufferReady: -1
+                        };
+                    options.playerOptions = $.extend({}, playerOptions, options.playerOptions || {});
+                    L.Control.TimeDimension.prototype.initialize.call(this, options);
+                    this.index = index;
+                },
+                _getDisplayDateFormat: function(date) {
+                    return this.index[date.getTime()-1];
+                }
+            });
+            </script>
+        {% endmacro %}
+
+        {% macro script(this, kwargs) %}
+
+            var times = {{this.times}};
+
+            {{this._parent.get_name()}}.timeDimension = L.timeDimension(
+                {times : times, currentTime: new Date(1)}
+            );
+
+            var {{this._control_name}} = new L.Control.TimeDimensionCustom({{this.index}}, {
+                autoPlay: {{this.auto_play}},
+                backwardButton: {{this.backward_button}},
+                displayDate: {{this.display_index}},
+                forwardButton: {{this.forward_button}},
+                limitMinimumRange: {{this.limit_minimum_range}},
+                limitSliders: {{this.limit_sliders}},
+                loopButton: {{this.loop_button}},
+                maxSpeed: {{this.max_speed}},
+                minSpeed: {{this.min_speed}},
+                playButton: {{this.play_button}},
+                playReverseButton: {{this.play_reverse_button}},
+                position: "{{this.position}}",
+                speedSlider: {{this.speed_slider}},
+                speedStep: {{this.speed_step}},
+                styleNS: "{{this.style_NS}}",
+                timeSlider: {{this.time_slider}},
+                timeSliderDragUpdate: {{this.time_slider_drag_update}},
+                timeSteps: {{this.index_steps}}
+                })
+                .addTo({{this._parent.get_name()}});
+
+                var {{this.get_name()}} = new TDIntervalHeatmap({{this.intervals_json}}, {{this.index}}, {{this.step}},
+                {heatmapOptions: {
+                        radius: {{this.radius}},
+                        blur: {{this.blur}},
+                        minOpacity: {{this.min_opacity}},
+                        maxOpacity: {{this.max_opacity}},
+                        scaleRadius: {{this.scale_radius}},
+                        useLocalExtrema: {{this.use_local_extrema}},
+                        {% if this.gradient %}gradient: {{ this.gradient }}{% endif %}
+                    }
+                });
+
+        {% endmacro %}
+        """
+    )
+
+    def __init__(self, intervals: dict, index: list, step: int, **kwargs) -> None:
+        super().__init__([[] for _ in index], index=index, **kwargs)
+        self.intervals = intervals
+        self.intervals_json = json.dumps(intervals, separators=(",", ":"))
+        self.step = step
+        self.data = None
+
+    def _get_self_bounds(self):
+        """
+        Bounds of the interval locations, in the form [[lat_min, lon_min], [lat_max, lon_max]].
+        """
+        lats, lngs = self.intervals["lat"], self.intervals["lng"]
+        if not lats:
+            return [[None, None], [None, None]]
+        return [[min(lats), min(lngs)], [max(lats), max(lngs)]]
@@ -1,11 +1,43 @@
 """
 Marker cluster management for Folium maps.
+
+Locations are keyed by grid cell: latitude and longitude are rounded to
+``precision`` decimal places and kept as a pair of integers, so points a few
+metres apart (closer than the cell size, about 11 m at the default of 4
+places) are counted together and each cell gets a dense id on first use.
+
+Both heatmaps aggregate the same way.  Every mark is appended to flat lists of
+cell ids (and, for the timeline, spans of years), and ``_group()`` sums them per
+key with NumPy in one pass, keeping keys in the order they were first marked:
+
+- ``heat()``: the static heatmap, one [lat, lon, count] per cell,
+- ``timeline()``: the timeline heatmap, where ``mark_years()`` records a cell
+  held from one year up to another and the spans are binned into
+  HeatMapWithTime steps before grouping by (cell, step),
+- ``timeline_intervals()``: the spans as weighted intervals, for
+  IntervalHeatMapWithTime.
 """
 
 import folium
+import numpy as np
 from folium.plugins import MarkerCluster
 from geo_gedcom.lat_lon import LatLon
 
+HEAT_PRECISION = 4  # Decimal places of the heatmap grid (about 11 m)
+
+
+def _group(keys: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sum weights per key.
+    Returns:
+        tuple: The index of the first entry of each key, and the sum of each key's weights,
+        both in the order the keys first appear.
+    """
+    _, first_entry, group = np.unique(keys, return_index=True, return_inverse=True)
+    sums = np.bincount(group.ravel(), weights=weights, minlength=len(first_entry)).astype(np.int64)
+    order = np.argsort(first_entry, kind="stable")
+    return first_entry[order], sums[order]
+
 
 class MyMarkClusters:
     """
@@ -14,38 +46,182 @@ class MyMarkClusters:
     Attributes:
         mymap (folium.Map): The Folium map instance.
         step (int): The time step for clustering.
+        precision (int): Decimal places of the grid cells locations are counted in.
     """
 
-    def __init__(self, mymap: folium.Map, step: int) -> None:
+    def __init__(self, mymap: folium.Map, step: int, precision: int = HEAT_PRECISION) -> None:
         """
         Initialize the marker cluster manager.
         Args:
             mymap (folium.Map): The Folium map instance.
             step (int): The time step for clustering.
+            precision (int): Decimal places of the grid cells locations are counted in.
         """
-        self.pmarker: dict = dict()
         self.cmarker: dict = dict()
         self.markercluster: dict = dict()
         self.mymap: folium.Map = mymap
         self.step: int = step
+        self.precision: int = precision
+        self._scale: float = 10.0**precision
+        # Grid cells: id of each (lat, lon) cell key, and the cell keys in id order
+        self._cells: dict = dict()
+        self._keys: list = []
+        # Static marks (cell id of each) and timeline spans (cell id, first year, end year)
+        self._marks: list = []
+        self._span_cells: list = []
+        self._span_firsts: list = []
+        self._span_stops: list = []
+
+    def cell_key(self, lat: float, lon: float) -> tuple[int, int]:
+        """
+        The integer grid cell of a location.
+        Args:
+            lat (float): Latitude.
+            lon (float): Longitude.
+        Returns:
+            tuple: Latitude and longitude rounded to the grid, in units of 10^-precision degrees.
+        """
+        return round(float(lat) * self._scale), round(float(lon) * self._scale)
+
+    def cell(self, spot: LatLon) -> int | None:
+        """
+        The id of a location's grid cell (made on first use).
+        Args:
+            spot (LatLon): The location.
+        Returns:
+            int or None: The cell id, or None when the spot has no location.
+        """
+        if not (spot and spot.hasLocation()):
+            return None
+        key = self.cell_key(spot.lat, spot.lon)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = len(self._keys)
+            self._keys.append(key)
+        return cell
+
+    def _latlon(self, cell: int) -> list[float]:
+        lat, lon = self._keys[cell]
+        return [lat / self._scale, lon / self._scale]
 
     def mark(self, spot: LatLon, when: int | None = None) -> None:
         """
         Add a marker to the cluster for a given spot and optional time.
         Args:
             spot (LatLon): The location to mark.
-            when (int, optional): The time value for clustering.
+            when (int, optional): The year, for the timeline heatmap.
         """
-        if spot and spot.hasLocation():
-            cnt = 1
-            if when is not None:
-                when = int(when) - (int(when) % self.step)
-                markname = f"{spot.lat}{spot.lon}{when}"
-            else:
-                markname = f"{spot.lat},{spot.lon}"
-            if markname in self.pmarker:
-                cnt = self.pmarker[markname][2] + 1
-            self.pmarker[markname] = (spot.lat, spot.lon, cnt, when)
+        if when is not None:
+            self.mark_years(spot, int(when), int(when) + 1)
+            return
+        cell = self.cell(spot)
+        if cell is not None:
+            self._marks.append(cell)
+
+    def mark_years(self, spot: LatLon, first: int, stop: int) -> None:
+        """
+        Mark a spot once for every year from first up to (not including) stop.
+        Args:
+            spot (LatLon): The location to mark.
+            first (int): First year at the location.
+            stop (int): Year the location was left.
+        """
+        if stop > first:
+            cell = self.cell(spot)
+            if cell is not None:
+                self._span_cells.append(cell)
+                self._span_firsts.append(first)
+                self._span_stops.append(stop)
+
+    def heat(self) -> list[list]:
+        """
+        Count the untimed marks per grid cell.
+        Returns:
+            list: The [lat, lon, count] of each marked cell, in the order the cells were first marked.
+        """
+        if not self._marks:
+            return []
+        marks = np.array(self._marks, dtype=np.int64)
+        first_entry, counts = _group(marks, np.ones(len(marks)))
+        return [[*self._latlon(cell), count] for cell, count in zip(marks[first_entry].tolist(), counts.tolist())]
+
+    def _spans(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The cell id, first year and end year of every marked span, as arrays."""
+        return (
+            np.array(self._span_cells, dtype=np.int64),
+            np.array(self._span_firsts, dtype=np.int64),
+            np.array(self._span_stops, dtype=np.int64),
+        )
+
+    def _step_counts(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Count the marked years per (cell, time step).
+        Returns:
+            tuple: Arrays of the step, cell id and year count of every group, ordered by step
+            and, within a step, by when the group was first marked.
+        """
+        cells, firsts, stops = self._spans()
+
+        # One entry per (span, step) the span overlaps, in marking order
+        first_steps = firsts // self.step
+        steps_per_span = (stops - 1) // self.step - first_steps + 1
+        span = np.repeat(np.arange(len(cells)), steps_per_span)
+        offsets = np.cumsum(steps_per_span) - steps_per_span
+        steps = first_steps[span] + np.arange(len(span)) - offsets[span]
+        years = np.minimum(stops[span], (steps + 1) * self.step) - np.maximum(firsts[span], steps * self.step)
+
+        low = steps.min()
+        first_entry, counts = _group(cells[span] * (steps.max() - low + 1) + (steps - low), years)
+        group_steps = steps[first_entry]
+        order = np.argsort(group_steps, kind="stable")
+        return group_steps[order], cells[span][first_entry][order], counts[order]
+
+    def timeline(self) -> tuple[list[int], list[list[list]]]:
+        """
+        Count the marked years per grid cell and time step.
+        Returns:
+            tuple: The steps that have marks (first year of each, ascending), and for each step
+            the [lat, lon, count] of its cells, in the order they were first marked.
+        """
+        if not self._span_cells:
+            return [], []
+        steps, cells, counts = self._step_counts()
+        cells = cells.tolist()
+        counts = counts.tolist()
+        index, starts = np.unique(steps, return_index=True)
+        ends = [*starts[1:].tolist(), len(cells)]
+        heat_data = [
+            [[*self._latlon(cell), count] for cell, count in zip(cells[start:end], counts[start:end])]
+            for start, end in zip(starts.tolist(), ends)
+        ]
+        return (index * self.step).tolist(), heat_data
+
+    def timeline_intervals(self) -> tuple[list[int], dict]:
+        """
+        The marked spans as weighted intervals, for a heatmap that builds its time steps in the browser.
+        Returns:
+            tuple: The steps that have marks (as for timeline()), and a dict of columns: "lat" and "lng"
+            of each cell, and "loc", "from", "to" and "weight" of each interval (the cell id, first
+            year, end year and the number of spans merged into it, ordered by first year), plus
+            "max", the largest year count of a cell in one step.
+        """
+        if not self._span_cells:
+            return [], {"lat": [], "lng": [], "loc": [], "from": [], "to": [], "weight": [], "max": 1}
+        steps, _, counts = self._step_counts()
+        spans, weights = np.unique(np.stack(self._spans(), axis=1), axis=0, return_counts=True)
+        order = np.lexsort((spans[:, 0], spans[:, 1]))
+        spans, weights = spans[order], weights[order]
+        lats, lngs = zip(*(self._latlon(cell) for cell in range(len(self._keys))))
+        intervals = {
+            "lat": list(lats),
+            "lng": list(lngs),
+            "loc": spans[:, 0].tolist(),
+            "from": spans[:, 1].tolist(),
+            "to": spans[:, 2].tolist(),
+            "weight": weights.tolist(),
+            "max": int(counts.max()),
+        }
+        return (np.unique(steps) * self.step).tolist(), intervals
 
     def checkmarker(self, lat: float, long: float, name: str) -> MarkerCluster | None:
         """
@@ -58,7 +234,7 @@ class MyMarkClusters:
             MarkerCluster or None: The marker cluster instance or None if not created.
         """
         if lat is not None and long is not None:
-            markname = f"{lat},{long}"
+            markname = self.cell_key(lat, long)
             if self.cmarker.get(markname) == 1:
                 return None
             if markname in self.markercluster:
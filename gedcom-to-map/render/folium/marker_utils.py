@@ -2,19 +2,10 @@
 Marker utility functions for Folium-based genealogical map exporter.
 """
 
-import random
 import folium
 from .constants import MidPointMarker
 
 
-def Drift(l: float) -> float:
-    """
-    Apply a small random drift to a coordinate value to avoid marker overlap.
-    """
-    d = (random.random() * 0.001) - 0.0005
-    return float(l) + d if l is not None else None
-
-
 def add_point_marker(
     fg: folium.FeatureGroup,
     point: list,
@@ -26,19 +17,31 @@ def add_point_marker(
     exporter=None,
 ) -> None:
     """
-    Add a marker to the feature group or collect for clustering if exporter is provided and MarksOn is False.
+    Add a marker to the feature group, or collect it for clustering if exporter is provided and
+    MarksOn is False or ClusterMarkers is on.
+    With the exporter's GeoJSON backend on, the marker is collected as a GeoJSON feature instead.
+    The exporter's IconRegistry, when it has one, provides the marker's icon.
     """
-    if exporter is not None and not exporter.svc_config.get("MarksOn"):
+    if exporter is not None and (not exporter.svc_config.get("MarksOn") or exporter.svc_config.get("ClusterMarkers")):
         # Collect for clustering
         if hasattr(exporter, "locations") and hasattr(exporter, "popups"):
             exporter.locations.append(point)
             exporter.popups.append(popup)
         return
-    marker = folium.Marker(
-        point,
-        tooltip=tooltip,
-        popup=popup,
-        opacity=0.5,
-        icon=folium.Icon(color=color, icon=icon_name, prefix="fa", extraClasses="fas"),
-    )
+    layers = getattr(exporter, "geojson", None)
+    if layers is not None:
+        layers.add_point(fg, point, tooltip, popup, icon_name, color)
+        return
+    icons = getattr(exporter, "icons", None)
+    if icons is not None:
+        icon = icons.icon(color, icon_name, prefix="fa", extraClasses="fas")
+        marker = icons.marker(point, icon, tooltip=tooltip, popup=popup, opacity=0.5)
+    else:
+        marker = folium.Marker(
+            point,
+            tooltip=tooltip,
+            popup=popup,
+            opacity=0.5,
+            icon=folium.Icon(color=color, icon=icon_name, prefix="fa", extraClasses="fas"),
+        )
     fg.add_child(marker)
@@ -6,9 +6,10 @@ import math
 import folium
 
 
-def add_polyline(line, fg, fm_line, marker_options, popup_content, max_line_weight, use_ant_path, gOp):
+def add_polyline(line, fg, fm_line, marker_options, popup_content, max_line_weight, use_ant_path, gOp, layers=None):
     """
     Add a polyline to the feature group if there are enough points.
+    Unless it is an ant path, it is collected as a GeoJSON feature when layers (GeoJsonLayers) is given.
     """
     if len(fm_line) > 1:
         line_color = marker_options["line_color"]
@@ -17,6 +18,9 @@ def add_polyline(line, fg, fm_line, marker_options, popup_content, max_line_weig
             if getattr(line, "prof", None)
             else 1
         )
+        if layers is not None and not use_ant_path:
+            layers.add_line(fg, fm_line, line_color, line_width, marker_options["dash_array"], line.name, popup_content)
+            return
         if use_ant_path:
             polyline = folium.plugins.AntPath(
                 fm_line,
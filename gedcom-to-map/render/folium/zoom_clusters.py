@@ -0,0 +1,230 @@
+"""
+Marker clusters worked out for every zoom level during export.
+
+folium's MarkerCluster hands every point to Leaflet.markercluster, which builds
+its clusters in the browser when the page opens, and that stalls on tens of
+thousands of markers.  ZoomClusterLayer does the clustering in Python instead,
+in the spirit of supercluster: the points are projected to Web Mercator and,
+from the deepest zoom level out, the clusters of the level below are merged
+per grid cell of ``radius`` pixels at the level's scale (each cluster at the
+weighted mean of what it merged).  This gives a hierarchy of clusters, one
+level per zoom, built with NumPy group-bys.
+
+A small layer draws the clusters of the current zoom level inside the view,
+redrawing when the map is zoomed or moved.  A level that merges nothing is
+written as the number of the level it repeats.  Clicking a cluster zooms to the
+level where it splits; a single point is drawn as a marker with its popup.
+
+The levels and popups are written into the page, unless the layer is given a
+folder (the LazyLayers option): then each level goes, gzip compressed, to its
+own sidecar script with the popups of the points it draws on their own, and the
+page only loads a level's sidecar when the map is first zoomed to it.
+"""
+
+__all__ = ["ZoomClusterLayer", "cluster_levels", "mercator", "mercator_latitude"]
+
+import glob
+import os
+
+import numpy as np
+from branca.element import Element, Template
+from folium.elements import JSCSSMixin
+from folium.map import Layer
+from folium.plugins import MarkerCluster
+
+from .geojson_layers import LAZY_LOADER, write_sidecar
+
+TILE_SIZE = 256  # Pixels across a web map tile
+MAX_LATITUDE = 85.0511287798  # Latitude limit of Web Mercator
+
+
+def mercator(lats: np.ndarray, lons: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Web Mercator coordinates of points, in [0, 1] across the world."""
+    phi = np.radians(np.clip(lats, -MAX_LATITUDE, MAX_LATITUDE))
+    return lons / 360.0 + 0.5, 0.5 - np.log(np.tan(np.pi / 4 + phi / 2)) / (2 * np.pi)
+
+
+def mercator_latitude(y: np.ndarray) -> np.ndarray:
+    """Latitude of Web Mercator y coordinates."""
+    return np.degrees(2 * np.arctan(np.exp((0.5 - y) * 2 * np.pi)) - np.pi / 2)
+
+
+def cluster_levels(points: list, radius: int = 40, min_zoom: int = 0, max_zoom: int = 16) -> dict:
+    """
+    Cluster points for each zoom level.
+    Args:
+        points (list): [lat, lon] of each point.
+        radius (int): Pixels across the grid cells points are clustered in.
+        min_zoom (int): Lowest zoom level clustered.
+        max_zoom (int): Highest zoom level clustered; further in every point is drawn.
+    Returns:
+        dict: For each zoom level from min_zoom to max_zoom + 1, either the number of a higher level it is
+        the same as, or columns "lat", "lng", "n" (points in the cluster), "z" (zoom level where the cluster
+        splits) and "p" (index of the point, for a cluster of one point, else -1).
+    """
+    lats = np.array([p[0] for p in points], dtype=float)
+    lons = np.array([p[1] for p in points], dtype=float)
+    x, y = mercator(lats, lons)
+    count = np.ones(len(points), dtype=np.int64)
+    split = np.full(len(points), max_zoom + 1)
+    point = np.arange(len(points))
+    levels = {max_zoom + 1: {"lat": lats, "lng": lons, "n": count, "z": split, "p": point}}
+    same = max_zoom + 1
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        cell = radius / (TILE_SIZE * 2**zoom)
+        columns = int(np.ceil(1 / cell)) + 1
+        keys = np.floor(x / cell).astype(np.int64) * columns + np.floor(y / cell).astype(np.int64)
+        _, first, group = np.unique(keys, return_index=True, return_inverse=True)
+        group = group.ravel()
+        if len(first) == len(x):
+            levels[zoom] = same
+            continue
+        merged = np.bincount(group, minlength=len(first)) > 1
+        weight = np.bincount(group, weights=count)
+        x = np.bincount(group, weights=x * count) / weight
+        y = np.bincount(group, weights=y * count) / weight
+        split = np.where(merged, zoom + 1, split[first])
+        point = np.where(merged, -1, point[first])
+        count = weight.astype(np.int64)
+        # Cluster centres to about a metre, single points where they are
+        lat = np.where(merged, np.round(mercator_latitude(y), 5), lats[np.maximum(point, 0)])
+        lng = np.where(merged, np.round((x - 0.5) * 360.0, 5), lons[np.maximum(point, 0)])
+        levels[zoom] = {"lat": lat, "lng": lng, "n": count, "z": split, "p": point}
+        same = zoom
+    return {
+        zoom: level if isinstance(level, int) else {key: column.tolist() for key, column in level.items()}
+        for zoom, level in sorted(levels.items())
+    }
+
+
+class ZoomClusterLayer(JSCSSMixin, Layer):
+    """
+    Layer of markers clustered per zoom level in Python.
+
+    Args:
+        locations (list): [lat, lon] of each marker.
+        popups (list): Popup HTML of each marker.
+        name (str): Name of the layer in the LayerControl.
+        radius (int): Pixels across the grid cells markers are clustered in.
+        min_zoom (int): Lowest zoom level clustered.
+        max_zoom (int): Highest zoom level clustered; further in every marker is drawn.
+        overlay (bool): The layer is an overlay in the LayerControl.
+        control (bool): The layer is in the LayerControl.
+        show (bool): The layer is shown when the map opens.
+        folder (str): Folder to write the levels to as sidecar scripts, loaded by the page
+            as the map is zoomed to them; its name is their URL relative to the HTML file.
+            None writes the levels into the page.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.layerGroup();
+            (function(layer, data, map) {
+                function level(zoom) {
+                    var found = Math.max(data.minZoom, Math.min(Math.floor(zoom), data.maxZoom + 1));
+                    return typeof data.levels[found] === "number" ? data.levels[found] : found;
+                }
+                function draw() {
+                    layer.clearLayers();
+                    var zoom = level(map.getZoom()), clusters = data.levels[zoom];
+                    if (clusters === null) {
+                        // The level is in a sidecar: load it, and draw once it is in
+                        GedcomLazyLayers.load(data.name + "_" + zoom, data.src + "/clusters_" + zoom + ".js", {
+                            addData: function(found) {
+                                data.levels[zoom] = found;
+                                if (map.hasLayer(layer)) {
+                                    draw();
+                                }
+                            }
+                        });
+                        return;
+                    }
+                    var popups = clusters.popups || data.popups, bounds = map.getBounds().pad(0.25);
+                    for (var i = 0; i < clusters.n.length; i++) {
+                        var latlng = L.latLng(clusters.lat[i], clusters.lng[i]);
+                        if (!bounds.contains(latlng)) {
+                            continue;
+                        }
+                        if (clusters.p[i] >= 0) {
+                            L.marker(latlng).bindPopup(popups[clusters.p[i]], {maxWidth: "100%"}).addTo(layer);
+                            continue;
+                        }
+                        var marker = L.marker(latlng, {icon: L.divIcon({
+                            html: "<b>" + clusters.n[i] + "</b>",
+                            className: "marker-cluster marker-cluster-large",
+                            iconSize: new L.Point(20, 20)
+                        })});
+                        marker.on("click", (function(latlng, zoom) {
+                            return function() { map.setView(latlng, zoom); };
+                        })(latlng, clusters.z[i]));
+                        marker.addTo(layer);
+                    }
+                }
+                map.on("zoomend moveend", function() {
+                    if (map.hasLayer(layer)) {
+                        draw();
+                    }
+                });
+                layer.on("add", draw);
+            })({{ this.get_name() }}, {{ this.data|tojson }}, {{ this._parent.get_name() }});
+        {% endmacro %}
+        """
+    )
+
+    default_css = MarkerCluster.default_css
+
+    def __init__(
+        self,
+        locations: list,
+        popups: list,
+        name: str | None = None,
+        radius: int = 40,
+        min_zoom: int = 0,
+        max_zoom: int = 16,
+        overlay: bool = True,
+        control: bool = True,
+        show: bool = True,
+        folder: str | None = None,
+    ) -> None:
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "ZoomClusterLayer"
+        self.locations = locations
+        self.folder = folder
+        levels = cluster_levels(locations, radius, min_zoom, max_zoom)
+        self.data = {"minZoom": min_zoom, "maxZoom": max_zoom}
+        if folder is None:
+            self.data.update(levels=levels, popups=popups)
+        else:
+            self.data.update(levels=self._write_levels(levels, popups), name=self.get_name())
+            self.data["src"] = os.path.basename(folder)
+
+    def _write_levels(self, levels: dict, popups: list) -> dict:
+        """
+        Write each level, with the popups of its single points, to a sidecar script in self.folder.
+        Sidecars left by an earlier export to the same folder are removed first.
+        Returns:
+            dict: The levels for the page, None for each one in a sidecar.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        for stale in glob.glob(os.path.join(self.folder, "clusters_*.js")):
+            os.remove(stale)
+        for zoom, level in levels.items():
+            if isinstance(level, dict):
+                level = dict(level, popups={p: popups[p] for p in level["p"] if p >= 0})
+                write_sidecar(os.path.join(self.folder, f"clusters_{zoom}.js"), f"{self.get_name()}_{zoom}", level)
+        return {zoom: level if isinstance(level, int) else None for zoom, level in levels.items()}
+
+    def render(self, **kwargs) -> None:
+        if self.folder is not None:
+            self.get_root().header.add_child(Element(LAZY_LOADER), name="gedcom_lazy_layers")
+        super().render(**kwargs)
+
+    def _get_self_bounds(self):
+        """
+        Bounds of the markers, in the form [[lat_min, lon_min], [lat_max, lon_max]].
+        """
+        if not self.locations:
+            return [[None, None], [None, None]]
+        lats, lons = zip(*self.locations)
+        return [[min(lats), min(lons)], [max(lats), max(lons)]]
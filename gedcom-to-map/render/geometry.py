@@ -0,0 +1,143 @@
+"""
+Geometry output helpers shared by the exporters.
+
+The exporters write a coordinate pair for every marker and line vertex.  Two
+output options make that geometry smaller without a visible change:
+
+- CoordinatePrecision: the number of decimal places coordinates are rounded to
+  (0 keeps them as they are).  5 places is about a metre, far below the drift
+  added to markers.
+- SimplifyZoom: lines are simplified with Douglas-Peucker so that they stay
+  within a pixel of the original at this zoom level, and so at every zoom level
+  further out (0 keeps every vertex).  Only the folium polylines have vertices
+  between their ends (the midpoints); KML lines are single segments.
+
+Markers at the same place are spread over a small square (JITTER degrees
+across) so they can be told apart.  The offset of a point is derived from a
+stable hash of what it marks (the person's xref_id, the event type and an
+index), not drawn at random, so the same input always gives the same output:
+jitter() hashes the key with CRC-32, and the offset is the two halves of the
+hash after a 32-bit integer mix.
+"""
+
+__all__ = ["jitter", "round_point", "simplify_line", "zoom_tolerance"]
+
+import math
+import zlib
+from typing import Sequence
+
+import numpy as np
+
+TILE_SIZE = 256  # Pixels across a web map tile
+VECTOR_SPAN = 128  # Inner points from which a span's distances are computed with NumPy
+JITTER = 0.001  # Degrees across the square a marker is moved within
+_MASK32 = 0xFFFFFFFF
+
+
+def _mix32(h: int) -> int:
+    """The 32-bit finalizer of MurmurHash3."""
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & _MASK32
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & _MASK32
+    h ^= h >> 16
+    return h
+
+
+def jitter(*key, width: float = JITTER) -> tuple[float, float]:
+    """
+    The jitter of a point.
+    Args:
+        *key: What the point marks, such as (xref_id, event type, index).
+        width (float): Degrees across the square the point is moved within.
+    Returns:
+        tuple[float, float]: Offsets, each in [-width / 2, width / 2), to add to the latitude and longitude.
+    """
+    h = _mix32(zlib.crc32("\x1f".join(map(str, key)).encode("utf-8")))
+    return ((h & 0xFFFF) / 65536 - 0.5) * width, ((h >> 16) / 65536 - 0.5) * width
+
+
+def zoom_tolerance(zoom: int) -> float:
+    """
+    The size of a pixel at a web map zoom level.
+    Args:
+        zoom (int): The zoom level (0 shows the world on one tile).
+    Returns:
+        float: Degrees of longitude per pixel.
+    """
+    return 360.0 / (TILE_SIZE * 2**zoom)
+
+
+def round_point(point: Sequence[float], precision: int) -> list[float]:
+    """
+    Round the coordinates of a point.
+    Args:
+        point (Sequence[float]): The coordinates.
+        precision (int): Decimal places (0 leaves the point as it is).
+    Returns:
+        list[float]: The rounded coordinates.
+    """
+    if not precision:
+        return list(point)
+    return [round(float(c), precision) for c in point]
+
+
+def _segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distance of each point from the segment a-b."""
+    ab = b - a
+    length2 = float(ab @ ab)
+    if length2 == 0.0:
+        return np.hypot(*(points - a).T)
+    t = np.clip((points - a) @ ab / length2, 0.0, 1.0)
+    return np.hypot(*(points - a - t[:, None] * ab).T)
+
+
+def _farthest(points: Sequence[Sequence[float]], first: int, last: int) -> tuple[int, float]:
+    """The inner point of a span farthest from its chord, and its distance."""
+    (ax, ay), (bx, by) = points[first], points[last]
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    farthest, distance = first, -1.0
+    for i in range(first + 1, last):
+        px, py = points[i]
+        t = min(max(((px - ax) * dx + (py - ay) * dy) / length2, 0.0), 1.0) if length2 else 0.0
+        d = math.hypot(px - ax - t * dx, py - ay - t * dy)
+        if d > distance:
+            farthest, distance = i, d
+    return farthest, distance
+
+
+def simplify_line(points: Sequence[Sequence[float]], tolerance: float) -> list:
+    """
+    Simplify a line with the Douglas-Peucker algorithm.
+
+    The farthest point of a span from its chord splits the span when it is more than tolerance away.
+    The distances of a long span's inner points are computed together with NumPy; the spans of
+    most lines (and the short spans that splitting leaves) are quicker in a plain loop.
+    Args:
+        points (Sequence): The vertices, as coordinate pairs.
+        tolerance (float): Largest distance, in coordinate units, a dropped vertex may be from the line.
+    Returns:
+        list: The vertices kept, in order (the ends are always kept).
+    """
+    if tolerance <= 0 or len(points) < 3:
+        return list(points)
+    xy = np.asarray(points, dtype=float) if len(points) > VECTOR_SPAN else None
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    spans = [(0, len(points) - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        if last - first > VECTOR_SPAN:
+            distances = _segment_distances(xy[first + 1 : last], xy[first], xy[last])
+            farthest = int(np.argmax(distances))
+            split, distance = first + 1 + farthest, float(distances[farthest])
+        else:
+            split, distance = _farthest(points, first, last)
+        if distance > tolerance:
+            keep[split] = True
+            spans.append((first, split))
+            spans.append((split, last))
+    return [point for point, kept in zip(points, keep) if kept]
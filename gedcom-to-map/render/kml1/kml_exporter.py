@@ -3,16 +3,16 @@ __all__ = ["KmlExporter"]
 import logging
 import math
 import os.path
-import random
 import re
 
 import simplekml
 from models.line import Line
 from geo_gedcom.lat_lon import LatLon
+from render.geometry import jitter, round_point
 from render.referenced import Referenced
 from services.interfaces import IConfig, IState, IProgressTracker
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 _log = logging.getLogger(__name__.lower())
 
@@ -33,27 +33,35 @@ class KmlExporter:
         self.svc_progress = svc_progress
         self.file_name = os.path.join(svc_config.get("resultpath"), svc_config.get("ResultFile"))
         self.max_line_weight = svc_config.get("MaxLineWeight")
+        self.coordinate_precision: int = svc_config.get("CoordinatePrecision") or 0
         self.kml = None
         self.svc_state.Referenced = Referenced()
-        random.seed()
         self.driftOn = False
         self.svc_state.totalpeople = 0
         self.styleA = None
         self.styleB = None
         self.styles = []
 
-    def driftLatLon(self, l: LatLon) -> tuple[float | None, float | None]:
+    def driftLatLon(self, l: LatLon, *key) -> tuple[float | None, float | None]:
         """
-        Optionally add a small random drift to a LatLon for privacy or visual separation.
+        Optionally add a small drift to a LatLon for privacy or visual separation.
+        The drift is the jitter of key, so the same point always moves the same way.
 
         Args:
             l (LatLon): The original LatLon.
+            *key: What the point marks: (xref_id, event type, index).
         Returns:
-            tuple[float | None, float | None]: Drifted (lon, lat) or (None, None) if input is None.
+            tuple[float | None, float | None]: Drifted (lon, lat), rounded to the coordinate precision,
+            or (None, None) if input is None.
         """
         if not l or not self.driftOn:
-            return (l.lon, l.lat) if l else (None, None)
-        return ((float(l.lon) + (random.random() * 0.001) - 0.0005), float(l.lat) + (random.random() * 0.001) - 0.0005)
+            coords = (l.lon, l.lat) if l else (None, None)
+        else:
+            dlat, dlon = jitter(*key)
+            coords = (float(l.lon) + dlon, float(l.lat) + dlat)
+        if None in coords:
+            return coords
+        return tuple(round_point(coords, self.coordinate_precision))
 
     def Done(self) -> None:
         """
@@ -89,13 +97,17 @@ class KmlExporter:
         self.kml.save(self.file_name)
         # self.kml = None
 
-    def export(self, main: LatLon, lines: list[Line], ntag: str = "", mark: str = "native") -> None:
+    def export(self, main: LatLon, lines: Iterable[Line], ntag: str = "", mark: str = "native") -> None:
         """
         Export the main person and lines to KML, creating placemarks and lines for each.
 
+        A list of lines is written in generation (prof) order. Any other iterable, such
+        as a creator's iter_create() stream, is written in the order it arrives, one
+        line at a time, so the lines never have to be held in memory together.
+
         Args:
             main (LatLon): Main person's location.
-            lines (list[Line]): List of Line objects to export.
+            lines (Iterable[Line]): Line objects to export (a list, or a stream of lines).
             ntag (str, optional): Tag to append to names. Defaults to "".
             mark (str, optional): Marker type. Defaults to "native".
         """
@@ -107,23 +119,30 @@ class KmlExporter:
 
         if main and (not main.lon or not main.lat):
             _log.error(f"No GPS locations to generate a map for main person for {ntag}.")
-        if not lines or len(lines) == 0:
-            _log.error(f"No GPS locations to generate any person for {ntag}.")
 
         self.svc_progress.step("Generating KML")
-        sorted_lines = sorted(lines, key=lambda x: x.prof)
-        total_lines = len(sorted_lines)
+        if isinstance(lines, Sequence):
+            lines = sorted(lines, key=lambda x: x.prof)
+            total_lines = len(lines)
+        else:
+            total_lines = None
+        marker_type = "birth data" if mark == "birth" else "death data" if mark == "death" else "data"
 
-        for idx, line in enumerate(sorted_lines, 1):
+        idx = 0
+        for idx, line in enumerate(lines, 1):
             self.svc_progress.step()
             self._process_line(line, ntag, mark, foldermode, kml, styleA, styleB)
 
             # Update GUI progress every 100 lines
-            if idx % 100 == 0 or idx == total_lines:
-                marker_type = "birth data" if mark == "birth" else "death data" if mark == "death" else "data"
+            if total_lines is None:
+                if idx % 100 == 0:
+                    self.svc_progress.state = f"KML generation ({marker_type}): {idx} people"
+            elif idx % 100 == 0 or idx == total_lines:
                 self.svc_progress.state = (
                     f"KML generation ({marker_type}): {idx}/{total_lines} people ({idx*100//total_lines}%)"
                 )
+        if idx == 0:
+            _log.error(f"No GPS locations to generate any person for {ntag}.")
 
     def _get_mark_type(self, mark: str) -> str:
         """
@@ -300,7 +319,7 @@ class KmlExporter:
         connectWhere = self.folderBirth if foldermode else kml
         pnt = connectWhere.newpoint(
             name=line.name.split("\t")[1] + ntag,
-            coords=[self.driftLatLon(line.fromlocation)],
+            coords=[self.driftLatLon(line.fromlocation, line.person.xref_id, "from")],
             description="<![CDATA[ " + event + linage + familyLinage + " ]]>",
         )
         self.svc_state.Referenced.add(line.person.xref_id, "kml-a", tag=pnt.id)
@@ -328,7 +347,7 @@ class KmlExporter:
         connectWhere = self.folderDeath if foldermode else kml
         pnt = connectWhere.newpoint(
             name=line.name.split("\t")[1] + ntag,
-            coords=[self.driftLatLon(line.tolocation)],
+            coords=[self.driftLatLon(line.tolocation, line.person.xref_id, "to")],
             description="<![CDATA[ " + event + linage + familyLinage + " ]]>",
         )
         self.svc_state.Referenced.add(line.person.xref_id, "kml-b")
@@ -354,7 +373,10 @@ class KmlExporter:
         kml_line = connectWhere.newlinestring(
             name=line.name.split("\t")[1],
             description="<![CDATA[ " + event_desc + linage + familyLinage + " ]]>",
-            coords=[self.driftLatLon(line.fromlocation), self.driftLatLon(line.tolocation)],
+            coords=[
+                self.driftLatLon(line.fromlocation, line.person.xref_id, "from"),
+                self.driftLatLon(line.tolocation, line.person.xref_id, "to"),
+            ],
         )
         kml_line.linestyle.color = line.color.to_hexa()
         kml_line.linestyle.width = max(int(self.max_line_weight / math.exp(0.5 * min(line.prof, 100))), 0.1)
@@ -393,7 +415,7 @@ class KmlExporter:
         Add midpoint placemarks for events along a line.
         """
         connectWhere = self.folderLife if foldermode else kml
-        for mid in line.midpoints:
+        for index, mid in enumerate(line.midpoints):
             event_location = getattr(mid, "location", None)
             event_date = getattr(mid, "date", None)
             event_latlon = getattr(event_location, "latlon", None) if event_location else None
@@ -402,7 +424,7 @@ class KmlExporter:
                 event = "<br>{}: {}</br>".format(whatevent, event_date if event_date else "Unknown")
                 pnt = connectWhere.newpoint(
                     name=f"{name} ({whatevent})",
-                    coords=[self.driftLatLon(event_latlon)],
+                    coords=[self.driftLatLon(event_latlon, line.person.xref_id, mid.what, index)],
                     description="<![CDATA[ " + event + " ]]>",
                 )
                 pnt.style = simplekml.Style()
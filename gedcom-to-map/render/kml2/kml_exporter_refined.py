@@ -11,6 +11,7 @@ import logging
 import simplekml
 
 from geo_gedcom.lat_lon import LatLon
+from render.geometry import round_point
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +28,12 @@ class KmlExporterRefined:
         kml_file (str): Path to output KML file.
         kml (simplekml.Kml): KML document object.
         kml_folders (Dict[str, simplekml.Folder]): Folders for event types.
+        coordinate_precision (int): Decimal places of the coordinates written (0 = unrounded).
         marker_style (Dict[str, dict]): Marker style configuration.
         line_types (List[str]): Types of lines to draw (e.g., parent links).
     """
 
-    __slots__ = ["kml_file", "kml", "kml_folders"]
+    __slots__ = ["kml_file", "kml", "kml_folders", "coordinate_precision"]
     line_width = 2
     timespan_default_start_year = 1950
     timespan_default_range_years = 100
@@ -46,14 +48,16 @@ class KmlExporterRefined:
     }
     line_types = ["Parents"]
 
-    def __init__(self, kml_file: str) -> None:
+    def __init__(self, kml_file: str, coordinate_precision: int = 0) -> None:
         """
         Initialize the KML exporter and create folders/styles for each marker type.
 
         Args:
             kml_file (str): Path to output KML file.
+            coordinate_precision (int): Decimal places of the coordinates written (0 = unrounded).
         """
         self.kml_file = kml_file
+        self.coordinate_precision = coordinate_precision
         self.kml = simplekml.Kml()
         self.kml_folders = dict()
 
@@ -75,6 +79,10 @@ class KmlExporterRefined:
             logger.info(f"Saving KML file: {self.kml_file}")
             self.kml.save(self.kml_file)
 
+    def _coords(self, latlon: LatLon) -> Tuple[float, float]:
+        """(lon, lat) of a location, rounded to the coordinate precision."""
+        return tuple(round_point((latlon.lon, latlon.lat), self.coordinate_precision))
+
     def add_point(
         self, marker_type: str, name: str, latlon: LatLon, timestamp: Optional[str], description: str
     ) -> Tuple[Optional[str], Optional[str]]:
@@ -95,7 +103,7 @@ class KmlExporterRefined:
         point_id: Optional[str] = None
         if latlon and latlon.is_valid():
             pnt = self.kml_folders[marker_type].newpoint(
-                name=name, coords=[(latlon.lon, latlon.lat)], description=description
+                name=name, coords=[self._coords(latlon)], description=description
             )
             if timestamp:
                 pnt.timestamp.when = timestamp
@@ -133,7 +141,7 @@ class KmlExporterRefined:
         kml_line = None
         if begin_lat_lon and begin_lat_lon.is_valid() and end_lat_lon and end_lat_lon.is_valid():
             kml_line = self.kml_folders[line_type].newlinestring(
-                name=name, coords=[(begin_lat_lon.lon, begin_lat_lon.lat), (end_lat_lon.lon, end_lat_lon.lat)]
+                name=name, coords=[self._coords(begin_lat_lon), self._coords(end_lat_lon)]
             )
             kml_line.timespan.begin = begin_date
             kml_line.timespan.end = end_date
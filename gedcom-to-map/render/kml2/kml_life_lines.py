@@ -10,6 +10,7 @@ from typing import Optional
 import logging
 
 from geo_gedcom.geolocated_gedcom import GeolocatedGedcom
+from models.person_index import PersonIndex
 from .kml_life_lines_creator import KML_Life_Lines_Creator
 from .kml_exporter_refined import KmlExporterRefined
 from services.interfaces import IProgressTracker
@@ -44,6 +45,8 @@ class KML_Life_Lines:
         connect_parents: bool = True,
         save: bool = True,
         svc_progress: Optional[IProgressTracker] = None,
+        person_index: Optional[PersonIndex] = None,
+        coordinate_precision: int = 0,
     ):
         """
         Initialize the KML_Life_Lines wrapper.
@@ -57,10 +60,17 @@ class KML_Life_Lines:
             connect_parents (bool, optional): Whether to draw parent-child lines. Defaults to True.
             save (bool, optional): Whether to save the KML file immediately. Defaults to True.
             svc_progress (Optional[IProgressTracker], optional): Progress tracker for GUI updates. Defaults to None.
+            person_index (Optional[PersonIndex], optional): Index of the people's event locations and years.
+                Defaults to None (read them from the events).
+            coordinate_precision (int, optional): Decimal places of the coordinates written. Defaults to 0 (unrounded).
         """
 
         self.kml_life_lines_creator = KML_Life_Lines_Creator(
-            gedcom=gedcom, kml_file=kml_file, svc_progress=svc_progress
+            gedcom=gedcom,
+            kml_file=kml_file,
+            svc_progress=svc_progress,
+            person_index=person_index,
+            coordinate_precision=coordinate_precision,
         )
         self.kml_life_lines_creator.add_people()
 
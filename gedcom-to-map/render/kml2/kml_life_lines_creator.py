@@ -8,9 +8,11 @@ Author: @colin0brass
 
 from typing import Dict, Optional
 import logging
+import numpy as np
 import simplekml
 from geo_gedcom.person import Person
 from geo_gedcom.geolocated_gedcom import GeolocatedGedcom
+from models.person_index import PersonIndex
 from .kml_exporter_refined import KmlExporterRefined
 from services.interfaces import IProgressTracker
 
@@ -31,6 +33,7 @@ class KML_Life_Lines_Creator:
         kml_person_to_placemark_lookup (Dict[str, Optional[str]]): Maps person IDs to placemark IDs.
         use_hyperlinks (bool): Whether to use hyperlinks in descriptions.
         main_person_id (Optional[str]): Main person to focus on.
+        person_index (PersonIndex): Event locations and years of the people.
     """
 
     __slots__ = [
@@ -42,6 +45,7 @@ class KML_Life_Lines_Creator:
         "use_hyperlinks",
         "main_person_id",
         "svc_progress",
+        "person_index",
     ]
     place_type_list = ["Birth", "Marriage", "Death"]
 
@@ -52,6 +56,8 @@ class KML_Life_Lines_Creator:
         use_hyperlinks: bool = True,
         main_person_id: Optional[str] = None,
         svc_progress: Optional[IProgressTracker] = None,
+        person_index: Optional[PersonIndex] = None,
+        coordinate_precision: int = 0,
     ) -> None:
         """
         Initialize the KML life lines creator.
@@ -62,8 +68,11 @@ class KML_Life_Lines_Creator:
             use_hyperlinks (bool): Use hyperlinks in descriptions.
             main_person_id (Optional[str]): Main person to focus on.
             svc_progress (Optional[IProgressTracker]): Progress tracker for GUI updates.
+            person_index (Optional[PersonIndex]): Index of the people's event locations and years
+                (None = read them from the events).
+            coordinate_precision (int): Decimal places of the coordinates written (0 = unrounded).
         """
-        self.kml_instance: KmlExporterRefined = KmlExporterRefined(kml_file)
+        self.kml_instance: KmlExporterRefined = KmlExporterRefined(kml_file, coordinate_precision)
         self.gedcom: GeolocatedGedcom = gedcom
         self.kml_point_to_person_lookup: Dict[Optional[str], str] = dict()
         self.kml_person_to_point_lookup: Dict[str, Optional[str]] = dict()
@@ -71,6 +80,7 @@ class KML_Life_Lines_Creator:
         self.use_hyperlinks: bool = use_hyperlinks
         self.main_person_id: Optional[str] = main_person_id
         self.svc_progress: Optional[IProgressTracker] = svc_progress
+        self.person_index: PersonIndex = person_index if person_index is not None else PersonIndex()
 
     def _add_point(self, current: Person, event: object, event_type: str) -> None:
         """
@@ -103,10 +113,9 @@ class KML_Life_Lines_Creator:
         Args:
             current (Person): The person.
         """
-        birth_event = current.get_event("birth") if current else None
-        current_birth_latlon = birth_event.getattr("latlon") if birth_event else None
-        if birth_event and current_birth_latlon and current_birth_latlon.is_valid():
-            self._add_point(current, birth_event, "Birth")
+        index = self.person_index
+        if index.has_location(current, "birth"):
+            self._add_point(current, index.event(current, "birth"), "Birth")
 
         marriages = current.get_events("marriage") if current else []
         for marriage in marriages:
@@ -115,10 +124,8 @@ class KML_Life_Lines_Creator:
             if marriage_event and marriage_latlon and marriage_latlon.is_valid():
                 self._add_point(current, marriage_event, "Marriage")
 
-        death_event = current.get_event("death") if current else None
-        current_death_latlon = death_event.getattr("latlon") if death_event else None
-        if death_event and current_death_latlon and current_death_latlon.is_valid():
-            self._add_point(current, death_event, "Death")
+        if index.has_location(current, "death"):
+            self._add_point(current, index.event(current, "death"), "Death")
 
     def update_person_description(self, point: simplekml.featgeom.Point, current: Person) -> None:
         """
@@ -129,13 +136,7 @@ class KML_Life_Lines_Creator:
             current (Person): The person.
         """
         description = point.description
-        birth_event = current.get_event("birth") if current else None
-        if (
-            birth_event
-            and getattr(birth_event, "location", None)
-            and getattr(birth_event.location, "latlon", None)
-            and birth_event.location.latlon.is_valid()
-        ):
+        if self.person_index.has_location(current, "birth"):
             if current.father and (current.father in self.kml_person_to_point_lookup):
                 father_id = self.kml_person_to_placemark_lookup.get(current.father)
                 if father_id and current.father in self.gedcom.people:
@@ -203,64 +204,43 @@ class KML_Life_Lines_Creator:
     def connect_parents(self) -> None:
         """
         Draw lines connecting each person to their parents.
+
+        The child-parent links come from the family graph of the person index, and
+        only those where both ends have a valid best location are visited.
         """
         line_type = "Parents"
-        total_people = len(self.gedcom.people)
-
-        for idx, (_, person) in enumerate(self.gedcom.people.items(), 1):
-            logger.debug(f"person: {person}")
-            person_latlon = person.bestLatLon() if person else None
-            if person_latlon and person_latlon.is_valid():
-                birth_event = person.get_event("birth") if person else None
-                begin_date = birth_event.date.year_num if birth_event and birth_event.date else None
-
-                if person.father:
-                    father = self.gedcom.people[person.father]
-                    line_name = f"Father: {father.name}"
-                    father_latlon = father.bestLatLon() if father else None
-                    if father_latlon and father_latlon.is_valid():
-                        father_birth_event = father.get_event("birth") if father else None
-                        end_date = (
-                            father_birth_event.date.year_num if father_birth_event and father_birth_event.date else None
-                        )
-                        self.kml_instance.draw_line(
-                            line_type,
-                            line_name,
-                            person_latlon,
-                            father_latlon,
-                            begin_date,
-                            end_date,
-                            simplekml.Color.blue,
-                        )
-
-                if person.mother:
-                    mother = self.gedcom.people[person.mother]
-                    line_name = f"Mother: {mother.name}"
-                    mother_latlon = mother.bestLatLon() if mother else None
-                    if mother_latlon and mother_latlon.is_valid():
-                        mother_birth_event = mother.get_event("birth") if mother else None
-                        end_date = (
-                            mother_birth_event.date.year_num if mother_birth_event and mother_birth_event.date else None
-                        )
-                        self.kml_instance.draw_line(
-                            line_type,
-                            line_name,
-                            person_latlon,
-                            mother_latlon,
-                            begin_date,
-                            end_date,
-                            simplekml.Color.red,
-                        )
+        index = self.person_index
+        if not len(index):
+            index = PersonIndex(self.gedcom.people)
+        graph = index.graph
+
+        children, parents, is_father = graph.parent_links()
+        located = np.isfinite(index.lats["best"])
+        drawable = located[children] & located[parents]
+        links = list(zip(children[drawable].tolist(), parents[drawable].tolist(), is_father[drawable].tolist()))
+        total_links = len(links)
+
+        for idx, (child, parent, father) in enumerate(links, 1):
+            relation = "Father" if father else "Mother"
+            self.kml_instance.draw_line(
+                line_type,
+                f"{relation}: {graph.person(parent).name}",
+                index.latlon_at("best", child),
+                index.latlon_at("best", parent),
+                index.year_at("birth", child),
+                index.year_at("birth", parent),
+                simplekml.Color.blue if father else simplekml.Color.red,
+            )
 
-            # Update progress every 100 people
-            if idx % 100 == 0 or idx == total_people:
+            # Update progress every 100 lines
+            if idx % 100 == 0 or idx == total_links:
                 if self.svc_progress:
                     self.svc_progress.state = (
-                        f"KML2 generation (connecting parents): {idx}/{total_people} people ({idx*100//total_people}%)"
+                        f"KML2 generation (connecting parents): {idx}/{total_links} lines ({idx*100//total_links}%)"
                     )
                 else:
                     logger.info(
-                        f"KML2 generation (connecting parents): {idx}/{total_people} people processed ({idx*100//total_people}%)"
+                        f"KML2 generation (connecting parents): {idx}/{total_links} lines drawn ({idx*100//total_links}%)"
                     )
 
     def lookat_person(self, person_id: str) -> None:
@@ -271,12 +251,11 @@ class KML_Life_Lines_Creator:
             person_id (str): Person's xref ID.
         """
         person = self.gedcom.people.get(person_id)
-        if person and person.bestLatLon() and person.bestLatLon().is_valid():
-            birth_event = person.get_event("birth") if person else None
-            death_event = person.get_event("death") if person else None
-            begin_year = birth_event.date.year_num if birth_event and birth_event.date else None
-            end_year = death_event.date.year_num if death_event and death_event.date else None
-            self.kml_instance.lookat(latlon=person.bestLatLon(), begin_year=begin_year, end_year=end_year)
+        index = self.person_index
+        if person and index.has_location(person, "best"):
+            begin_year = index.year(person, "birth")
+            end_year = index.year(person, "death")
+            self.kml_instance.lookat(latlon=index.latlon(person, "best"), begin_year=begin_year, end_year=end_year)
 
     def save_kml(self) -> None:
         """
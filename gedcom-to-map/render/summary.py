@@ -21,6 +21,7 @@ import matplotlib.pyplot as plt
 
 from geo_gedcom.addressbook import AddressBook
 from geo_gedcom.geolocated_gedcom import GeolocatedGedcom
+from models.person_index import PersonIndex
 
 logger = logging.getLogger(__name__)
 # Avoid using any interactive backends
@@ -130,6 +131,7 @@ def generate_summary_reports(
     output_folder: Path,
     bg: Optional[Any] = None,
     file_loader: Optional[Any] = None,
+    person_index: Optional[PersonIndex] = None,
 ) -> None:
     """Generate selected summary reports based on configuration.
 
@@ -140,6 +142,7 @@ def generate_summary_reports(
         output_folder: Directory for output files
         bg: Optional background process for status messages
         file_loader: Optional object with LoadFile method for opening files
+        person_index: Optional PersonIndex of my_gedcom.people for the people and countries reports
 
     Side Effects:
         - Creates CSV/YAML/HTML/PNG files in output_folder
@@ -168,7 +171,7 @@ def generate_summary_reports(
         _generate_report(
             people_file,
             write_people_summary,
-            (my_gedcom.people, str(people_file)),
+            (my_gedcom.people, str(people_file), person_index),
             "People Summary",
             "csv",
             bg,
@@ -181,7 +184,7 @@ def generate_summary_reports(
         img_file = _generate_report(
             countries_file,
             write_birth_death_countries_summary,
-            (my_gedcom.people, str(countries_file), base_file_name),
+            (my_gedcom.people, str(countries_file), base_file_name, person_index),
             "Countries summary",
             "csv",
             bg,
@@ -318,7 +321,7 @@ def write_places_summary(address_book: AddressBook, output_file: str) -> None:
         logger.error(f"Failed to write places summary to {output_file}: {e}")
 
 
-def write_people_summary(people: Dict[str, Any], output_file: str) -> None:
+def write_people_summary(people: Dict[str, Any], output_file: str, person_index: Optional[PersonIndex] = None) -> None:
     """
     Write a summary of all people to a CSV file.
 
@@ -328,11 +331,13 @@ def write_people_summary(people: Dict[str, Any], output_file: str) -> None:
         args (Namespace): Parsed CLI arguments.
         people (dict): Dictionary of people.
         output_file (str): Output CSV file path.
+        person_index (PersonIndex, optional): Index of people's events and years.
     """
+    index = person_index if person_index is not None else PersonIndex()
     people_summary = []
     for person_id, person in people.items():
-        birth_event = person.get_event("birth") if person else None
-        death_event = person.get_event("death") if person else None
+        birth_event = index.event(person, "birth")
+        death_event = index.event(person, "death")
 
         birth_place = birth_event.place if birth_event else ""
         birth_continent = getattr(getattr(birth_event, "location", None), "continent", "") if birth_event else ""
@@ -348,7 +353,7 @@ def write_people_summary(people: Dict[str, Any], output_file: str) -> None:
                 "birth_alt_addr": (
                     getattr(getattr(birth_event, "location", None), "alt_addr", "") if birth_event else ""
                 ),
-                "birth_date": birth_event.date.year_num if birth_event else "",
+                "birth_date": index.year(person, "birth") if birth_event else "",
                 "birth_country": (
                     getattr(getattr(birth_event, "location", None), "country_name", "") if birth_event else ""
                 ),
@@ -357,7 +362,7 @@ def write_people_summary(people: Dict[str, Any], output_file: str) -> None:
                 "death_alt_addr": (
                     getattr(getattr(death_event, "location", None), "alt_addr", "") if death_event else ""
                 ),
-                "death_date": death_event.date.year_num if death_event else "",
+                "death_date": index.year(person, "death") if death_event else "",
                 "death_country": (
                     getattr(getattr(death_event, "location", None), "country_name", "") if death_event else ""
                 ),
@@ -668,7 +673,9 @@ def save_birth_death_heatmap_matrix(
     plt.close()
 
 
-def write_birth_death_countries_summary(people: Dict[str, Any], output_file: str, gedcom_file_name: str) -> None:
+def write_birth_death_countries_summary(
+    people: Dict[str, Any], output_file: str, gedcom_file_name: str, person_index: Optional[PersonIndex] = None
+) -> None:
     """
     Write a summary of birth and death countries to a CSV file.
 
@@ -679,12 +686,14 @@ def write_birth_death_countries_summary(people: Dict[str, Any], output_file: str
         people (dict): Dictionary of people.
         output_file (str): Output CSV file path.
         gedcom_file_name (str): GEDCOM file name for labeling.
+        person_index (PersonIndex, optional): Index of people's events.
     """
+    index = person_index if person_index is not None else PersonIndex()
     birth_death_countries_summary = {}
 
     for person_id, person in people.items():
-        birth_event = person.get_event("birth") if person else None
-        death_event = person.get_event("death") if person else None
+        birth_event = index.event(person, "birth")
+        death_event = index.event(person, "death")
         birth_location = getattr(birth_event, "location", None) if birth_event else None
         death_location = getattr(death_event, "location", None) if death_event else None
 
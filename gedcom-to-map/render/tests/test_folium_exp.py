@@ -1,8 +1,19 @@
+import base64
+import gzip
+import json
+
+import numpy as np
 import pytest
+from render.folium.density_overlay import DensityOverlay, density_bands
 from render.folium.folium_exporter import foliumExporter
+from render.folium.geojson_layers import GeoJsonLayers, LazyGeoJsonLayers
+from render.folium.icon_registry import IconRegistry
+from render.folium.interval_heatmap import IntervalHeatMapWithTime
 from render.folium.mark_clusters import MyMarkClusters
+from render.folium.zoom_clusters import ZoomClusterLayer, cluster_levels
 from render.folium.legend import Legend
 import folium
+from geo_gedcom.lat_lon import LatLon
 
 
 # DummyConfig implements IConfig
@@ -85,3 +96,217 @@ def test_my_mark_clusters_init():
 def test_legend_init():
     legend = Legend()
     assert legend is not None
+
+
+def test_my_mark_clusters_timeline_counts_years_per_step():
+    clusters = MyMarkClusters(None, step=10)
+    here, there = LatLon(51.5, -0.1), LatLon(48.9, 2.4)
+    clusters.mark(here, 1903)
+    clusters.mark_years(here, 1903, 1925)
+    clusters.mark_years(there, 1925, 1931)
+    clusters.mark_years(LatLon(None, None), 1900, 1950)
+    clusters.mark(there, 1931)
+    clusters.mark(here, None)
+    years, heat_data = clusters.timeline()
+    assert years == [1900, 1910, 1920, 1930]
+    assert heat_data == [
+        [[51.5, -0.1, 8]],
+        [[51.5, -0.1, 10]],
+        [[51.5, -0.1, 5], [48.9, 2.4, 5]],
+        [[48.9, 2.4, 2]],
+    ]
+    assert clusters.heat() == [[51.5, -0.1, 1]]
+    assert MyMarkClusters(None, step=5).timeline() == ([], [])
+
+
+def test_my_mark_clusters_timeline_intervals():
+    clusters = MyMarkClusters(None, step=10)
+    here, there = LatLon(51.5, -0.1), LatLon(48.9, 2.4)
+    clusters.mark_years(there, 1925, 1931)
+    clusters.mark_years(here, 1903, 1925)
+    clusters.mark_years(here, 1903, 1925)
+    years, intervals = clusters.timeline_intervals()
+    assert years == [1900, 1910, 1920, 1930]
+    assert intervals == {
+        "lat": [48.9, 51.5],
+        "lng": [2.4, -0.1],
+        "loc": [1, 0],
+        "from": [1903, 1925],
+        "to": [1925, 1931],
+        "weight": [2, 1],
+        "max": 20,
+    }
+    assert MyMarkClusters(None, step=5).timeline_intervals()[0] == []
+
+
+def test_interval_heatmap_with_time_renders_intervals():
+    clusters = MyMarkClusters(None, step=10)
+    clusters.mark_years(LatLon(51.5, -0.1), 1903, 1925)
+    years, intervals = clusters.timeline_intervals()
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    IntervalHeatMapWithTime(intervals, index=years, step=10, name="Heatmap").add_to(mymap)
+    html = mymap.get_root().render()
+    assert "new TDIntervalHeatmap(" in html
+    assert '"from":[1903],"to":[1925]' in html
+    assert "[1900, 1910, 1920]" in html
+
+
+def test_my_mark_clusters_merge_marks_in_a_grid_cell():
+    clusters = MyMarkClusters(None, step=10, precision=2)
+    for spot in (LatLon(1.2301, 34.5), LatLon(1.2299, 34.5002), LatLon(12.3, 4.5), LatLon(None, None), None):
+        clusters.mark(spot)
+    clusters.mark(LatLon(1.23, 34.5), 1900)
+    assert clusters.cell_key(1.2301, 34.5) == (123, 3450)
+    assert clusters.heat() == [[1.23, 34.5, 2], [12.3, 4.5, 1]]
+    assert clusters.timeline() == ([1900], [[[1.23, 34.5, 1]]])
+
+
+def test_geojson_layers_one_layer_per_feature_group():
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    fg = folium.FeatureGroup(name="Family").add_to(mymap)
+    layers = GeoJsonLayers()
+    layers.add_point(fg, [51.5, -0.1], "Jane", "<b>Jane</b>", "child", "red")
+    layers.add_line(fg, [(51.5, -0.1), (48.9, 2.3)], "blue", 3, [5, 5], "Jane", None)
+    layers.add_line(fg, [(48.9, 2.3), (40.4, -3.7)], "green", 1, [], "John", None)
+    assert layers.flush() == 3
+    assert layers.features == {}
+    html = mymap.get_root().render()
+    assert html.count("L.geoJson(") == 1
+    assert '"coordinates": [-0.1, 51.5]' in html
+    assert '"dash": "5 5"' in html and '"dash": null' in html
+    assert "L.AwesomeMarkers.icon(" in html and "L.polyline(" not in html
+
+
+def test_lazy_geojson_layers_write_sidecars(tmp_path):
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    fg = folium.FeatureGroup(name="Family", show=False).add_to(mymap)
+    (tmp_path / "map_layers").mkdir()
+    (tmp_path / "map_layers" / "layer_7.js").write_text("stale")
+    layers = LazyGeoJsonLayers(str(tmp_path / "map.html"))
+    layers.add_point(fg, [51.5, -0.1], "Jane", "<b>Jane</b>", "child", "red")
+    assert layers.flush() == 1
+    assert sorted(p.name for p in (tmp_path / "map_layers").iterdir()) == ["layer_0.js"]
+    sidecar = (tmp_path / "map_layers" / "layer_0.js").read_text()
+    data = json.loads(sidecar[sidecar.index(", ") + 2 : sidecar.rindex(")")])
+    collection = json.loads(gzip.decompress(base64.b64decode(data)))
+    assert collection["features"][0]["geometry"]["coordinates"] == [-0.1, 51.5]
+    html = mymap.get_root().render()
+    assert html.count("var GedcomLazyLayers") == 1
+    assert '"map_layers/layer_0.js"' in html and "51.5" not in html
+
+
+def test_geojson_layers_share_popups_by_xref_id(tmp_path):
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    fg = folium.FeatureGroup(name="Family").add_to(mymap)
+    layers = GeoJsonLayers(shared_popups=True)
+    layers.add_person("@I1@", "Jane", "1900 (Born) ", "photos/jane.jpg")
+    layers.add_point(fg, [51.5, -0.1], "Jane", {"pid": "@I1@", "rel": "Life", "mark": "birth"}, "child", "red")
+    layers.add_line(fg, [(51.5, -0.1), (48.9, 2.3)], "blue", 3, [], "Jane", {"pid": "@I1@", "rel": "Life"})
+    layers.flush()
+    html = mymap.get_root().render()
+    assert html.count('"@I1@":["Jane","1900 (Born) ","photos/jane.jpg"]') == 1
+    assert html.count("jane.jpg") == 1 and '"ref": {"pid": "@I1@"' in html
+
+    lazy = LazyGeoJsonLayers(str(tmp_path / "map.html"), shared_popups=True)
+    lazy.add_person("@I1@", "Jane", "", None)
+    lazy.add_person("@I2@", "John", "", None)
+    lazy.add_point(fg, [51.5, -0.1], "Jane", {"pid": "@I1@", "rel": "mother", "of": "@I2@"}, None, "pink")
+    lazy.flush()
+    sidecar = (tmp_path / "map_layers" / "layer_0.js").read_text()
+    data = json.loads(sidecar[sidecar.index(", ") + 2 : sidecar.rindex(")")])
+    people = json.loads(gzip.decompress(base64.b64decode(data)))["people"]
+    assert people == {"@I1@": ["Jane", "", None], "@I2@": ["John", "", None]}
+
+
+def test_icon_registry_defines_each_icon_once():
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    fg = folium.FeatureGroup(name="Family")
+    icons = IconRegistry(mymap)
+    child = icons.icon("orange", "child", prefix="fa", extraClasses="fas")
+    assert icons.icon("orange", "child", prefix="fa", extraClasses="fas") is child
+    assert icons.icon("gray", "cross", prefix="fa", extraClasses="fas") is not child
+    for lat in range(5):
+        fg.add_child(icons.marker([lat, 0], child, tooltip="Jane", opacity=0.5))
+    fg.add_to(mymap)
+    html = mymap.get_root().render()
+    assert html.count("L.AwesomeMarkers.icon(") == 2
+    assert html.count(f'"icon": {child.get_name()},') == 5
+    # folium before 0.19.5 also wrote {parent}.setIcon(icon), which fails on the map
+    assert ".setIcon(" not in html
+    assert html.index(f"var {child.get_name()} =") < html.index("L.marker(")
+
+
+def test_cluster_levels_merge_points_as_zoom_decreases():
+    points = [[51.5, -0.1], [51.5001, -0.1001], [48.9, 2.3], [-33.9, 151.2]]
+    levels = cluster_levels(points, radius=40, min_zoom=0, max_zoom=16)
+    assert levels[17]["p"] == [0, 1, 2, 3]
+    top = levels[0] if isinstance(levels[0], dict) else levels[levels[0]]
+    assert sum(top["n"]) == 4 and len(top["n"]) < 4
+    # The London pair splits only deep in; the other points stay single
+    deepest = max(zoom for zoom, level in levels.items() if isinstance(level, dict) and zoom <= 16)
+    assert sorted(levels[deepest]["n"]) == [1, 1, 2]
+    assert all(levels[zoom] == 17 for zoom in range(deepest + 1, 17))
+    assert 2 in levels[deepest]["p"] and -1 in levels[deepest]["p"]
+
+
+def test_zoom_cluster_layer_renders_levels():
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    ZoomClusterLayer([[51.5, -0.1], [48.9, 2.3]], ["<b>Jane</b>", "<b>John</b>"], name="clusters").add_to(mymap)
+    html = mymap.get_root().render()
+    assert "L.layerGroup()" in html and "MarkerCluster.Default.css" in html
+    assert '"popups": ["\\u003cb\\u003eJane\\u003c/b\\u003e",' in html
+
+
+def test_zoom_cluster_layer_writes_levels_to_sidecars(tmp_path):
+    folder = tmp_path / "map_layers"
+    folder.mkdir()
+    (folder / "clusters_99.js").write_text("stale")
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    layer = ZoomClusterLayer(
+        [[51.5, -0.1], [48.9, 2.3]], ["<b>Jane</b>", "<b>John</b>"], name="clusters", folder=str(folder)
+    )
+    layer.add_to(mymap)
+    html = mymap.get_root().render()
+    assert "Jane" not in html and html.count("var GedcomLazyLayers") == 1
+    assert '"src": "map_layers"' in html
+    levels = cluster_levels([[51.5, -0.1], [48.9, 2.3]])
+    sidecars = sorted(path.name for path in folder.iterdir())
+    assert sidecars == sorted(f"clusters_{zoom}.js" for zoom, level in levels.items() if isinstance(level, dict))
+    # Each sidecar holds its level and the popups of the points it draws on their own
+    sidecar = (folder / "clusters_17.js").read_text()
+    assert json.loads(sidecar[sidecar.index("(") + 1 : sidecar.index(", ")]) == f"{layer.get_name()}_17"
+    data = json.loads(sidecar[sidecar.index(", ") + 2 : sidecar.rindex(")")])
+    level = json.loads(gzip.decompress(base64.b64decode(data)))
+    assert level["p"] == [0, 1] and level["popups"] == {"0": "<b>Jane</b>", "1": "<b>John</b>"}
+
+
+def test_density_bands_render_a_zoom_pyramid():
+    points = [[51.5, -0.1, 3], [48.9, 2.3, 1], [40.7, -74.0, 10]]
+    bands = density_bands(points, radius=10, max_size=512, bands=3)
+    assert [band["zoom"] for band in bands] == [3, 1]
+    assert [(band["min_zoom"], band["max_zoom"]) for band in bands] == [(2, None), (None, 1)]
+    deepest = bands[0]
+    assert deepest["image"].dtype == np.uint8 and deepest["image"].shape[2] == 4
+    assert deepest["image"].shape[1] <= 512 + 2 * 15 + 1
+    (south, west), (north, east) = deepest["bounds"]
+    assert south < 40.7 and north > 51.5 and west < -74.0 and east > 2.3
+    # Opaque at the points, clear away from them
+    assert deepest["image"][..., 3].max() == round(0.8 * 255)
+    assert deepest["image"][0, 0, 3] == 0
+    assert density_bands([]) == []
+
+
+def test_density_overlay_switches_bands_with_zoom():
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    points = [[51.5, -0.1, 3], [40.7, -74.0, 10]]
+    DensityOverlay(points, name="single").add_to(mymap)
+    html = mymap.get_root().render()
+    assert html.count("L.imageOverlay(") == 1 and "data:image/png;base64," in html
+    assert "group.addLayer(band.layer)" not in html
+
+    mymap = folium.Map(location=[0, 0], zoom_start=2)
+    overlay = DensityOverlay(points, name="pyramid", bands=2).add_to(mymap)
+    html = mymap.get_root().render()
+    assert html.count("L.imageOverlay(") == 2
+    assert f"}})({overlay.get_name()}, [" in html
+    assert f"{{layer: {overlay.bands[1]['layer'].get_name()}, min: null, max: " in html
@@ -0,0 +1,42 @@
+import math
+
+import pytest
+from render.geometry import jitter, round_point, simplify_line, zoom_tolerance
+
+
+def test_round_point():
+    assert round_point([51.123456789, -0.987654321], 4) == [51.1235, -0.9877]
+    assert round_point((51.123456789, -0.987654321), 0) == [51.123456789, -0.987654321]
+
+
+def test_zoom_tolerance_halves_each_zoom_level():
+    assert zoom_tolerance(0) == pytest.approx(360 / 256)
+    assert zoom_tolerance(5) == pytest.approx(zoom_tolerance(4) / 2)
+
+
+def test_simplify_line_drops_vertices_within_tolerance():
+    line = [(0.0, 0.0), (1.0, 0.05), (2.0, -0.05), (3.0, 2.0), (4.0, 4.0), (5.0, 4.01)]
+    assert simplify_line(line, 0.1) == [(0.0, 0.0), (2.0, -0.05), (4.0, 4.0), (5.0, 4.01)]
+    assert simplify_line(line, 0) == line
+    assert simplify_line(line, 100) == [line[0], line[-1]]
+    assert simplify_line(line[:2], 100) == line[:2]
+
+
+def test_simplify_line_keeps_vertices_within_tolerance_of_the_result():
+    line = [(math.sin(i / 7) * 3, i / 10) for i in range(200)]
+    kept = simplify_line(line, 0.05)
+    assert len(kept) < len(line) / 2
+    for x, y in line:
+        distances = []
+        for (ax, ay), (bx, by) in zip(kept, kept[1:]):
+            t = max(0.0, min(1.0, ((x - ax) * (bx - ax) + (y - ay) * (by - ay)) / ((bx - ax) ** 2 + (by - ay) ** 2)))
+            distances.append(math.hypot(x - ax - t * (bx - ax), y - ay - t * (by - ay)))
+        assert min(distances) <= 0.05 + 1e-12
+
+
+def test_jitter_is_stable():
+    keys = [("@I1@", "from", 0), ("@I1@", "to", 0), ("@I2@", "Residence", 3)]
+    offsets = [jitter(*key) for key in keys]
+    assert jitter("@I1@", "from", 0) == offsets[0] != offsets[1]
+    assert all(-0.0005 <= d < 0.0005 for offset in offsets for d in offset)
+    assert jitter("@I1@", "from", 0, width=0.01) == pytest.approx(tuple(d * 10 for d in offsets[0]))
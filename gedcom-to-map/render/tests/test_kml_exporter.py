@@ -81,9 +81,11 @@ def test_kml_exporter_drift_latlon():
     # driftOn is False, should return original
     assert exporter.driftLatLon(latlon) == (20.0, 10.0)
     exporter.driftOn = True
-    lon, lat = exporter.driftLatLon(latlon)
+    lon, lat = exporter.driftLatLon(latlon, "@I1@", "from")
     assert abs(lon - 20.0) < 0.01
     assert abs(lat - 10.0) < 0.01
+    assert exporter.driftLatLon(latlon, "@I1@", "from") == (lon, lat)
+    assert exporter.driftLatLon(latlon, "@I1@", "to") != (lon, lat)
 
 
 def test_kml_exporter_done(tmp_path):
@@ -112,3 +114,20 @@ def test_kml_exporter_export_empty(tmp_path):
     exporter = KmlExporter(config, state, progress)
     # Should log errors but not raise
     exporter.export(main=None, lines=[], ntag="", mark="native")
+
+
+def test_kml_exporter_export_stream(tmp_path):
+    config = DummyConfig(tmp_path, "test_export_stream.kml")
+    state = DummyState()
+    progress = DummyProgress()
+    exporter = KmlExporter(config, state, progress)
+    # Any iterable is accepted and read once, in arrival order
+    exporter.export(main=None, lines=(line for line in []), ntag="", mark="native")
+
+
+def test_kml_exporter_drift_latlon_precision():
+    config = DummyConfig("/tmp", "test.kml")
+    config._config["CoordinatePrecision"] = 3
+    exporter = KmlExporter(config, DummyState(), DummyProgress())
+    assert exporter.driftLatLon(LatLon(10.123456, 20.987654)) == (20.988, 10.123)
+    assert exporter.driftLatLon(None) == (None, None)
@@ -171,6 +171,12 @@ class IState(Protocol):
     people: Optional[Dict[str, Person]]
     """Dictionary of parsed Person objects keyed by ID."""
 
+    person_index: Any
+    """PersonIndex of people (event coordinates, years and family rows), or None."""
+
+    line_cache: Any
+    """LineCache of creator output for the loaded people, or None."""
+
     lookup: Optional[GeolocatedGedcom]
     """Geolocated GEDCOM lookup service."""
 
@@ -391,6 +397,8 @@ class RuntimeState:
     """
 
     _people: Optional[Dict[str, Person]] = None
+    _person_index: Any = None  # models.PersonIndex
+    _line_cache: Any = None  # models.LineCache
     _lookup: Optional[GeolocatedGedcom] = None
     _referenced: Any = None  # Referenced type to avoid circular import
     _main_person: Optional[Person] = None
@@ -421,6 +429,22 @@ class RuntimeState:
     def people(self, value: Optional[Dict[str, Person]]) -> None:
         self._people = value
 
+    @property
+    def person_index(self) -> Any:
+        return self._person_index
+
+    @person_index.setter
+    def person_index(self, value: Any) -> None:
+        self._person_index = value
+
+    @property
+    def line_cache(self) -> Any:
+        return self._line_cache
+
+    @line_cache.setter
+    def line_cache(self, value: Any) -> None:
+        self._line_cache = value
+
     @property
     def lookup(self) -> Optional[GeolocatedGedcom]:
         return self._lookup
@@ -530,6 +554,8 @@ class RuntimeState:
         from render.referenced import Referenced
 
         self._people = None
+        self._person_index = None
+        self._line_cache = None
         self._lookup = None
         self._referenced = Referenced()
         self._main_person = None
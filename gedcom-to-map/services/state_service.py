@@ -20,6 +20,8 @@ class GVState(IState):
 
     Attributes:
         people: Dictionary of Person objects keyed by xref ID
+        person_index: PersonIndex of people (event coordinates, years and family rows)
+        line_cache: LineCache of creator output for these people (dropped on reload)
         lookup: GeolocatedGedcom instance for geocoding operations
         mainPerson: Currently selected main/root person
         Name: Name of the main person (or "<not selected>")
@@ -39,6 +41,8 @@ class GVState(IState):
     def __init__(self) -> None:
         """Initialize runtime state with default values."""
         self.people: Optional[Dict[str, Person]] = None
+        self.person_index: Any = None  # models.PersonIndex, built once people are parsed and geocoded
+        self.line_cache: Any = None  # models.LineCache, made by the first map generated
         self.lookup: Any = None  # GeolocatedGedcom instance
         self.mainPerson: Optional[Person] = None
         self.Name: Optional[str] = None
@@ -0,0 +1,221 @@
+"""
+Deterministic synthetic family trees for performance tests.
+
+The GEDCOM samples used by the other performance tests live in the
+gedcom-samples submodule and only come in a few fixed sizes.  generate_pedigree()
+builds an in-memory people dict of any size instead, with the same seed always
+giving the same tree:
+
+- ``size``: number of people,
+- ``depth``: generations of ancestors above the root person (None = as many as
+  ``size`` allows),
+- ``branching``: children per couple; the extra children are siblings of the
+  ancestors, which only AllEntities (createothers) draws,
+- ``collapse``: chance that a parent is someone already in that generation
+  rather than a new person (pedigree collapse; cousins marrying),
+- ``residences``: residence events per person,
+- ``missing``: chance that an event has no location.
+
+Once the ancestor generations are full, the remaining people are added as
+unrelated families so every size can be reached.  The people are light
+stand-ins for geo_gedcom Person objects: they have the attributes and event
+accessors the line creators read, and real LatLon locations.
+"""
+
+import random
+from typing import Dict, List, Optional
+
+from geo_gedcom.lat_lon import LatLon
+
+ROOT_ID = "I0"
+BASE_YEAR = 1990  # Birth year of the root person
+GENERATION_YEARS = 28  # Years between a person's birth and their parents'
+CENTRES = [  # Towns the families live around
+    (51.5, -0.1),
+    (48.9, 2.4),
+    (52.5, 13.4),
+    (41.9, 12.5),
+    (40.4, -3.7),
+    (59.3, 18.1),
+    (53.3, -6.3),
+    (42.4, -71.1),
+    (-33.9, 151.2),
+    (45.5, -73.6),
+]
+
+
+class SyntheticDate:
+    __slots__ = ("year_num",)
+
+    def __init__(self, year_num: Optional[int]) -> None:
+        self.year_num = year_num
+
+
+class SyntheticLocation:
+    __slots__ = ("latlon",)
+
+    def __init__(self, latlon: LatLon) -> None:
+        self.latlon = latlon
+
+
+class SyntheticEvent:
+    """A birth, death or residence with a year and (usually) a location."""
+
+    __slots__ = ("what", "place", "date", "location")
+
+    def __init__(self, what: str, year: int, latlon: Optional[LatLon]) -> None:
+        self.what = what
+        self.place = f"{what} {year}"
+        self.date = SyntheticDate(year)
+        self.location = SyntheticLocation(latlon) if latlon else None
+
+    @property
+    def latlon(self) -> Optional[LatLon]:
+        return self.location.latlon if self.location else None
+
+    def getattr(self, attr: str):
+        if attr == "latlon":
+            return self.latlon
+        if attr == "when_year_num":
+            return self.date.year_num
+        return getattr(self, attr, None)
+
+
+class SyntheticPerson:
+    """The parts of geo_gedcom's Person the line creators use."""
+
+    __slots__ = ("xref_id", "name", "surname", "father", "mother", "children", "partners", "events")
+
+    def __init__(self, xref_id: str, surname: str) -> None:
+        self.xref_id = xref_id
+        self.surname = surname
+        self.name = f"{xref_id} {surname}"
+        self.father: Optional[str] = None
+        self.mother: Optional[str] = None
+        self.children: List[str] = []
+        self.partners: List[str] = []
+        self.events: Dict[str, List[SyntheticEvent]] = {}
+
+    def get_event(self, what: str) -> Optional[SyntheticEvent]:
+        events = self.events.get(what)
+        return events[0] if events else None
+
+    def get_events(self, what: str) -> List[SyntheticEvent]:
+        return self.events.get(what, [])
+
+    def bestLatLon(self) -> LatLon:
+        for what in ("birth", "death"):
+            event = self.get_event(what)
+            if event and event.latlon:
+                return event.latlon
+        return LatLon(None, None)
+
+
+class _Builder:
+    def __init__(self, size: int, residences: int, missing: float, seed: int) -> None:
+        self.size = size
+        self.residences = residences
+        self.missing = missing
+        self.random = random.Random(seed)
+        self.people: Dict[str, SyntheticPerson] = {}
+
+    def full(self) -> bool:
+        return len(self.people) >= self.size
+
+    def latlon(self, centre) -> Optional[LatLon]:
+        if self.random.random() < self.missing:
+            return None
+        lat, lon = centre
+        return LatLon(round(lat + self.random.gauss(0, 1.5), 4), round(lon + self.random.gauss(0, 1.5), 4))
+
+    def person(self, generation: int, surname: str, centre) -> SyntheticPerson:
+        person = SyntheticPerson(f"I{len(self.people)}", surname)
+        born = BASE_YEAR - generation * GENERATION_YEARS + self.random.randint(-5, 5)
+        died = born + self.random.randint(20, 90)
+        person.events["birth"] = [SyntheticEvent("birth", born, self.latlon(centre))]
+        person.events["death"] = [SyntheticEvent("death", died, self.latlon(centre))]
+        if self.residences:
+            person.events["residence"] = [
+                SyntheticEvent(
+                    "residence", born + (died - born) * (n + 1) // (self.residences + 1), self.latlon(centre)
+                )
+                for n in range(self.residences)
+            ]
+        self.people[person.xref_id] = person
+        return person
+
+    def marry(self, father: SyntheticPerson, mother: SyntheticPerson) -> None:
+        if mother.xref_id not in father.partners:
+            father.partners.append(mother.xref_id)
+            mother.partners.append(father.xref_id)
+
+    def adopt(self, child: SyntheticPerson, father: SyntheticPerson, mother: SyntheticPerson) -> None:
+        child.father, child.mother = father.xref_id, mother.xref_id
+        father.children.append(child.xref_id)
+        mother.children.append(child.xref_id)
+
+
+def generate_pedigree(
+    size: int,
+    depth: Optional[int] = None,
+    branching: int = 2,
+    collapse: float = 0.05,
+    residences: int = 1,
+    missing: float = 0.1,
+    seed: int = 0,
+) -> Dict[str, SyntheticPerson]:
+    """Build a people dict of size people whose root person is ROOT_ID (see the module docstring)."""
+    build = _Builder(size, residences, missing, seed)
+    rnd = build.random
+    if size < 1:
+        return build.people
+    root = build.person(0, "Root", rnd.choice(CENTRES))
+    centres = {root.xref_id: rnd.choice(CENTRES)}
+
+    # Ancestors, a generation at a time so every branch grows to the same depth
+    frontier = [root]
+    generation = 0
+    while frontier and not build.full() and (depth is None or generation < depth):
+        generation += 1
+        fathers: List[SyntheticPerson] = []
+        mothers: List[SyntheticPerson] = []
+        next_frontier = []
+        for child in frontier:
+            centre = centres[child.xref_id]
+            parents = []
+            for pool, surname in ((fathers, child.surname), (mothers, f"G{generation}M{len(mothers)}")):
+                if pool and rnd.random() < collapse:
+                    parents.append(rnd.choice(pool))
+                elif not build.full():
+                    parent = build.person(generation, surname, centre)
+                    centres[parent.xref_id] = centre if rnd.random() < 0.8 else rnd.choice(CENTRES)
+                    pool.append(parent)
+                    next_frontier.append(parent)
+                    parents.append(parent)
+            if len(parents) < 2:
+                break
+            father, mother = parents
+            build.marry(father, mother)
+            build.adopt(child, father, mother)
+            for _ in range(branching - 1):
+                if build.full():
+                    break
+                build.adopt(build.person(generation - 1, child.surname, centre), father, mother)
+        frontier = next_frontier
+
+    # Unrelated families for the rest
+    family = 0
+    while not build.full():
+        family += 1
+        centre = rnd.choice(CENTRES)
+        generation = rnd.randint(0, max(generation, 1))
+        father = build.person(generation + 1, f"F{family}", centre)
+        if build.full():
+            break
+        mother = build.person(generation + 1, f"M{family}", centre)
+        build.marry(father, mother)
+        for _ in range(max(branching, 1)):
+            if build.full():
+                break
+            build.adopt(build.person(generation, father.surname, centre), father, mother)
+    return build.people
@@ -0,0 +1,174 @@
+"""
+Performance tests for the line creators (Creator, CreatorTrace and LifetimeCreator)
+on synthetic family trees of 1k to 1M people. Times create() and createothers(),
+measures their peak memory, prints results as a markdown table and writes YAML output.
+"""
+
+import gc
+import os
+import timeit
+import tracemalloc
+import pytest
+import yaml
+from typing import Any, Callable, Dict, List, Tuple
+
+import models.creator
+from models import Creator, CreatorTrace, LifetimeCreator
+from synthetic_pedigree import ROOT_ID, generate_pedigree
+
+CREATORS = {"Creator": Creator, "CreatorTrace": CreatorTrace, "LifetimeCreator": LifetimeCreator}
+LARGE = pytest.mark.skip(reason="Large performance test - disabled by default")
+
+_trees: Dict[Tuple, Tuple[Dict[str, Any], float]] = {}
+
+
+def synthetic_tree(size: int, collapse: float) -> Tuple[Dict[str, Any], float]:
+    """Generate (once per session) the tree of size people, and the time it took."""
+    key = (size, collapse)
+    if key not in _trees:
+        _trees.clear()
+        t0 = timeit.default_timer()
+        people = generate_pedigree(size, collapse=collapse)
+        _trees[key] = people, timeit.default_timer() - t0
+    return _trees[key]
+
+
+def run_creator(creator_class: Callable, people: Dict[str, Any]) -> Tuple[int, int, float, float]:
+    """Run create() then createothers(); returns (lines, others lines, create time, createothers time)."""
+    creator = creator_class(people)
+    t0 = timeit.default_timer()
+    lines = creator.create(ROOT_ID)
+    t1 = timeit.default_timer()
+    created = len(lines)
+    creator.createothers(lines)
+    t2 = timeit.default_timer()
+    return created, len(lines) - created, t1 - t0, t2 - t1
+
+
+def peak_memory(creator_class: Callable, people: Dict[str, Any]) -> int:
+    """Peak bytes allocated by a create() and createothers() run."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run_creator(creator_class, people)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(scope="session")
+def creator_performance_results():
+    """
+    Session-scoped fixture to collect creator performance results and output markdown/YAML after all tests.
+    """
+    results: List[Dict[str, Any]] = []
+    yield results
+    if not results:
+        return
+    header = [
+        "People",
+        "Collapse",
+        "Creator",
+        "Lines",
+        "Others Lines",
+        "Generate Time (s)",
+        "Create Time (s)",
+        "Createothers Time (s)",
+        "Total Time (s)",
+        "Peak Memory (MB)",
+    ]
+    print("\n### Creator Performance Results")
+    print("| " + " | ".join(header) + " |")
+    print("|" + "---|" * len(header))
+    for res in results:
+        row = [
+            f"{res['People']:,}",
+            str(res["Collapse"]),
+            res["Creator"],
+            f"{res['Lines']:,}",
+            f"{res['Others Lines']:,}",
+            f"{res['Generate Time (s)']:.5f}",
+            f"{res['Create Time (s)']:.5f}",
+            f"{res['Createothers Time (s)']:.5f}",
+            f"{res['Total Time (s)']:.5f}",
+            f"{res['Peak Memory (MB)']:.1f}",
+        ]
+        print("| " + " | ".join(row) + " |")
+    results_path = os.path.join(os.path.dirname(__file__), "creator_performance_results.yaml")
+    with open(results_path, "w", encoding="utf-8") as f:
+        yaml.dump({"results": results}, f, default_flow_style=False)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("creator_name", list(CREATORS))
+@pytest.mark.parametrize("collapse", [0.05])
+@pytest.mark.parametrize(
+    "size",
+    [
+        1_000,
+        10_000,
+        pytest.param(100_000, marks=LARGE),
+        pytest.param(1_000_000, marks=LARGE),
+    ],
+)
+def test_creator_performance(size: int, collapse: float, creator_name: str, creator_performance_results):
+    """
+    Runs a creator over a synthetic tree and appends the ordered result dict to the session-scoped results list.
+    """
+    print(f"People: {size:,}, Collapse: {collapse}, Creator: {creator_name}")
+    people, t_generate = synthetic_tree(size, collapse)
+    assert len(people) == size
+
+    lines, others, t_create, t_others = run_creator(CREATORS[creator_name], people)
+    peak = peak_memory(CREATORS[creator_name], people)
+    assert lines > 0 and lines + others >= size
+
+    creator_performance_results.append(
+        {
+            "People": size,
+            "Collapse": collapse,
+            "Creator": creator_name,
+            "Lines": lines,
+            "Others Lines": others,
+            "Generate Time (s)": float(f"{t_generate:.5f}"),
+            "Create Time (s)": float(f"{t_create:.5f}"),
+            "Createothers Time (s)": float(f"{t_others:.5f}"),
+            "Total Time (s)": float(f"{t_create + t_others:.5f}"),
+            "Peak Memory (MB)": float(f"{peak / 2**20:.1f}"),
+        }
+    )
+
+
+def test_synthetic_pedigree_is_deterministic():
+    def shape(people):
+        return [
+            (p.xref_id, p.father, p.mother, tuple(p.children), p.bestLatLon().lat, p.get_event("birth").date.year_num)
+            for p in people.values()
+        ]
+
+    people = generate_pedigree(500, depth=4, branching=3, collapse=0.2, residences=2, seed=7)
+    assert len(people) == 500
+    assert shape(people) == shape(generate_pedigree(500, depth=4, branching=3, collapse=0.2, residences=2, seed=7))
+    assert shape(people) != shape(generate_pedigree(500, depth=4, branching=3, collapse=0.2, residences=2, seed=8))
+    root = people[ROOT_ID]
+    assert root.father and root.mother and len(people[root.father].children) == 3
+    assert all(len(p.get_events("residence")) == 2 for p in people.values())
+    assert len(CreatorTrace(people).create(ROOT_ID)) < 2**5
+
+
+@pytest.mark.parametrize("max_generations", [2, 3])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_parallel_createothers_matches_serial(monkeypatch, seed: int, max_generations: int):
+    monkeypatch.setattr(models.creator, "PARALLEL_MIN_PEOPLE", 0)
+    people = generate_pedigree(400, collapse=0.2, missing=0.3, seed=seed)
+
+    def lines(workers: int) -> List[Tuple]:
+        creator = Creator(people, max_missing=1, max_generations=max_generations)
+        result = creator.create(ROOT_ID)
+        creator.createothers(result, workers=workers)
+        return [
+            (line.person.xref_id, line.path, line.branch, line.prof, getattr(line.fromlocation, "lat", None))
+            for line in result
+        ]
+
+    assert lines(2) == lines(0)
@@ -17,7 +17,7 @@ setup(
         "ged4py>=0.4.4",
         "simplekml>=1.3.6",
         "geopy>=2.3.0",
-        "folium>=0.16.0",
+        "folium>=0.19.5",
         "branca>=0.7.0",
         "wxPython>=4.1.0",
         "selenium>=4.0.0",
@@ -27,6 +27,7 @@ setup(
         "pycountry>=22.3.5",
         "pycountry-convert>=0.7.2",
         "pandas>=2.0.0",
+        "numpy>=1.24.0",
         "seaborn>=0.12.0",
         "matplotlib>=3.7.0",
         "pytest>=7.0.0",